@@ -0,0 +1,83 @@
+"""
+감정 - 키워드 연관 분석 (pandas 없이 DB GROUP BY + NumPy 정수 배열)
+- (감정 id, 키워드 id) 별 일기 수를 DB 에서 GROUP BY 로 받고, 감정별 상위 키워드는 NumPy 로 정렬해서 뽑음
+- 사용자 여러 명 / 임의 기간도 지원 (관리자 대시보드 등)
+"""
+import numpy as np
+from django.db.models import Count
+
+from .models import Diary, Emotion, Keyword
+from .report_builder import TOP_EMOTION_KEYWORDS, emotion_label, month_range
+
+
+def emotion_keyword_counts(user_ids=None, start=None, end=None):
+    """
+    (감정 id, 키워드 id, 일기 수) 정수 배열 3개
+    user_ids: None 이면 전체 사용자 / start, end: [start, end) 기간 (None 이면 제한 없음)
+    """
+    diaries = Diary.objects.filter(emotion__isnull=False, interpretation__keyword_links__isnull=False)
+    if user_ids is not None:
+        diaries = diaries.filter(user_id__in=list(user_ids))
+    if start is not None:
+        diaries = diaries.filter(date__gte=start)
+    if end is not None:
+        diaries = diaries.filter(date__lt=end)
+
+    rows = (
+        diaries.order_by()
+        .values_list('emotion_id', 'interpretation__keyword_links__keyword_id')
+        .annotate(count=Count('pk'))
+    )
+    table = np.array(list(rows), dtype=np.int64).reshape(-1, 3)
+    return table[:, 0], table[:, 1], table[:, 2]
+
+
+def top_keywords(emotion_ids, keyword_ids, counts, keyword_names, top=TOP_EMOTION_KEYWORDS):
+    """
+    감정 id 별 상위 키워드 id {감정 id: [키워드 id, ...]}
+    일기 수가 많은 순, 같으면 키워드 이름 순 (report_builder 와 같은 순서)
+    """
+    if not counts.size:
+        return {}
+
+    # 키워드 id -> 이름 순위 (동점 정렬용)
+    unique_ids = np.unique(keyword_ids)
+    name_order = np.argsort([keyword_names[keyword_id] for keyword_id in unique_ids.tolist()], kind='stable')
+    name_rank = np.empty_like(name_order)
+    name_rank[name_order] = np.arange(len(name_order))
+    row_name_rank = name_rank[np.searchsorted(unique_ids, keyword_ids)]
+
+    # 감정 id → 개수 내림차순 → 이름 순으로 정렬한 뒤 감정별 앞쪽 top 개
+    order = np.lexsort((row_name_rank, -counts, emotion_ids))
+    sorted_emotions = emotion_ids[order]
+    sorted_keywords = keyword_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_emotions[1:] != sorted_emotions[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    return {
+        int(sorted_emotions[begin]): sorted_keywords[begin:min(begin + top, end)].tolist()
+        for begin, end in zip(starts, ends)
+    }
+
+
+def top_keywords_by_emotion(user_ids=None, start=None, end=None, top=TOP_EMOTION_KEYWORDS):
+    """감정별 상위 키워드 {'😊 기쁨': ['뱀', '돈', '물'], ...} (감정 이름 순)"""
+    emotion_ids, keyword_ids, counts = emotion_keyword_counts(user_ids, start, end)
+    if not counts.size:
+        return {}
+
+    keyword_names = dict(Keyword.objects.filter(pk__in=np.unique(keyword_ids).tolist()).values_list('pk', 'name'))
+    labels = {
+        pk: emotion_label(name, icon)
+        for pk, name, icon in Emotion.objects.filter(pk__in=np.unique(emotion_ids).tolist()).values_list('pk', 'name', 'icon')
+    }
+    result = top_keywords(emotion_ids, keyword_ids, counts, keyword_names, top)
+    return {
+        label: [keyword_names[keyword_id] for keyword_id in ids]
+        for label, ids in sorted((labels[emotion_id], ids) for emotion_id, ids in result.items())
+    }
+
+
+def analyze_emotion_keywords(user, year, month):
+    """특정 사용자의 한 달(KST) 감정별 상위 3개 키워드 (예전 views.analyze_emotion_keywords 와 같은 형태)"""
+    start, end = month_range(year, month)
+    return top_keywords_by_emotion([user.pk], start, end)
@@ -3,3 +3,16 @@ from django.apps import AppConfig
 class DreamlensCoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dreamlens_core"
+
+    def ready(self):
+        # 모델 변경 시 캐시를 지우는 signal 등록
+        from . import signals
+
+        # 웹 서버 프로세스에서만 RETRIEVAL_WARMUP 을 켜서 해몽 검색 파일을 미리 로드
+        # (background: 요청을 받으면서 로드 / blocking: 로드가 끝난 뒤 시작, gunicorn --preload 와 함께 쓰면 워커가 공유)
+        from django.conf import settings
+
+        mode = getattr(settings, 'RETRIEVAL_WARMUP', 'off')
+        if mode in ('background', 'blocking'):
+            from . import retrieval
+            retrieval.warmup(background=(mode == 'background'))
@@ -0,0 +1,139 @@
+"""
+일기장 달력 데이터
+- (사용자, 연월) 별로 달력 칸, 날짜별 색상 정보, 모달용 일기 목록을 한 번에 만들어 Django 캐시에 저장
+- Diary 가 저장/삭제되면 signals.py 가 해당 달의 캐시를 지움
+- 오늘 날짜 표시는 캐시하지 않고 요청마다 계산
+"""
+import calendar
+from collections import defaultdict
+from datetime import MAXYEAR, MINYEAR, date, datetime
+
+import pytz
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Substr
+from django.utils import timezone
+
+from .models import Diary
+
+# 달력 모달에 보여줄 일기 제목 길이 (해몽 요청 원문 앞부분)
+DIARY_TITLE_LENGTH = 20
+
+# 변경 시 signal 로 지우므로 길게 둠
+CACHE_TIMEOUT = getattr(settings, 'DIARY_CALENDAR_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def split_yyyymm(yyyymm):
+    """
+    202507 -> (2025, 7), 잘못된 달이면 ValueError
+    이전/다음 달 링크와 KST <-> UTC 변환이 date 범위를 넘지 않도록 첫 해(1년)와 마지막 해(9999년)는 제외
+    """
+    year, month = divmod(yyyymm, 100)
+    if not (1 <= month <= 12 and MINYEAR < year < MAXYEAR):
+        raise ValueError(f"잘못된 연월입니다: {yyyymm}")
+    return year, month
+
+
+def cache_key(user_id, yyyymm):
+    return f"diary_month:{user_id}:{yyyymm}"
+
+
+def local_yyyymm(value):
+    """aware datetime -> 현재 시간대(KST) 기준 연월"""
+    local = timezone.localtime(value)
+    return local.year * 100 + local.month
+
+
+def invalidate(user_id, *datetimes):
+    """해당 날짜들이 속한 달의 캐시 삭제"""
+    keys = {cache_key(user_id, local_yyyymm(value)) for value in datetimes if value is not None}
+    if keys:
+        cache.delete_many(list(keys))
+
+
+def build_month(user_id, year, month):
+    """한 달 치 달력 데이터 (DB 조회 1회)"""
+    # 이전/다음 달 계산
+    first_of_month = date(year, month, 1)
+    prev_dt = first_of_month - relativedelta(months=1)
+    next_dt = first_of_month + relativedelta(months=1)
+
+    # KST 기준 월초/다음월초를 UTC-aware로 계산
+    tz = timezone.get_current_timezone()
+    start_utc = timezone.make_aware(datetime(year, month, 1, 0, 0), tz).astimezone(pytz.UTC)
+    end_utc = timezone.make_aware(datetime(next_dt.year, next_dt.month, 1, 0, 0), tz).astimezone(pytz.UTC)
+
+    # 해당 기간의 일기 조회 (pk 오름차순)
+    # 해몽 원문 전체 대신 앞 21자만 DB 에서 잘라 JOIN 한 번으로 가져옴 (21자면 20자 + … 로 표시)
+    qs = Diary.objects.filter(
+        user_id=user_id,
+        date__gte=start_utc,
+        date__lt=end_utc,
+    ).order_by('pk').annotate(
+        snippet=Substr('interpretation__input_text', 1, DIARY_TITLE_LENGTH + 1),
+    ).values('pk', 'date', 'dream_type_id', 'snippet')
+
+    # 날짜별 색상용 정보(day_info)와 모달용 엔트리(entries_by_day) 수집
+    day_info = {}
+    entries_by_day = defaultdict(list)
+    for entry in qs:
+        d = timezone.localtime(entry['date']).day
+
+        # 첫 번째(=가장 작은 pk) 일기로만 색상 정보 등록
+        if d not in day_info:
+            day_info[d] = {
+                'pk': entry['pk'],
+                'dream_type': entry['dream_type_id'],
+            }
+
+        # 모달용: interpretation.input_text 앞 20자를 title로 사용
+        raw = entry['snippet'] or ''
+        snippet = raw[:DIARY_TITLE_LENGTH] + '…' if len(raw) > DIARY_TITLE_LENGTH else raw
+
+        entries_by_day[d].append({
+            'pk': entry['pk'],
+            'title': snippet,
+        })
+
+    # 달력용 2D 배열 생성 (일요일 시작)
+    month_days = []
+    for week in calendar.Calendar(firstweekday=6).monthdayscalendar(year, month):
+        row = []
+        for day in week:
+            info = day_info.get(day) if day else None
+            dream_type = info['dream_type'] if info else None
+            row.append({
+                'day': day or None,  # 0 이면 빈 칸
+                'pk': info['pk'] if info else None,
+                'is_good': dream_type == 1,
+                'is_bad': dream_type == 2,
+                'is_normal': info is not None and dream_type not in (1, 2),
+            })
+        month_days.append(row)
+
+    return {
+        'year': year,
+        'month': month,
+        'month_days': month_days,
+        'prev_yyyymm': prev_dt.year * 100 + prev_dt.month,
+        'next_yyyymm': next_dt.year * 100 + next_dt.month,
+        'entries_by_day': dict(entries_by_day),
+    }
+
+
+def get_month(user_id, yyyymm):
+    """캐시된 한 달 치 달력 데이터 (없으면 만들어서 저장), 잘못된 달이면 ValueError"""
+    year, month = split_yyyymm(yyyymm)
+    key = cache_key(user_id, yyyymm)
+    data = cache.get(key)
+    if data is None:
+        data = build_month(user_id, year, month)
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def today_day(year, month):
+    """오늘이 해당 달이면 오늘 날짜(일), 아니면 None"""
+    today = timezone.localdate()
+    return today.day if (today.year == year and today.month == month) else None
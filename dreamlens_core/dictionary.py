@@ -0,0 +1,258 @@
+"""
+꿈 사전 서비스
+- meta_dream.json 을 한 번만 읽어 정리된 항목 목록, 대분류 → 소분류 트리, (대분류, 소분류) → 항목 id 목록 색인을 만들어 둠
+- 파일의 mtime 이 바뀌면 내용 해시를 비교해, 실제로 바뀐 경우에만 다시 만듦
+- 요청마다는 dict 조회와 슬라이스만 수행
+- 꿈/해몽 텍스트 검색용 글자 n-gram 역색인도 사전을 읽을 때 함께 준비 (같은 버전으로 저장된 파일이 있으면 읽고, 없으면 만들어 저장)
+- 자동완성용 접두어 색인(꿈 제목, 소분류, 제목에서 뽑은 키워드)은 첫 자동완성 요청 때 메모리에 만듦
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import Counter
+from datetime import datetime, timezone as py_timezone
+
+import numpy as np
+from django.conf import settings
+
+from utils.ngram_index import NgramIndex, find_highlights, tokenize
+from utils.prefix_index import PrefixIndex
+
+DICTIONARY_PATH = os.path.join(settings.BASE_DIR, 'data', 'meta_dream.json')
+SEARCH_INDEX_PATH = getattr(
+    settings, 'DICTIONARY_SEARCH_INDEX_PATH', os.path.join(settings.BASE_DIR, 'data', 'meta_dream.ngram.npz')
+)
+
+# 검색 점수에서 꿈 제목이 해몽 본문보다 중요
+SEARCH_FIELD_WEIGHTS = {'꿈': 2.0, '해몽': 1.0}
+
+# 자동완성 종류: 꿈 제목 / 소분류 이름 / 꿈 제목에서 뽑은 키워드
+AUTOCOMPLETE_KINDS = ('subcategory', 'keyword', 'dream')
+
+# 키워드 추출 시 떼어낼 조사 (긴 것부터) 와 제외할 단어
+PARTICLES = ('에게서', '으로', '에게', '에서', '이랑', '랑', '은', '는', '이', '가', '을', '를', '의', '에', '로', '와', '과', '도')
+STOPWORDS = {'꿈', '꾸는', '꾼', '보는', '하는', '되는', '나는', '내가', '나를', '것'}
+
+# 파일 변경 여부(os.stat)는 이 간격(초)마다 한 번만 확인
+CHECK_INTERVAL = 2
+
+_lock = threading.Lock()
+_dictionary = None
+_checked_at = 0.0
+
+
+def clean(value):
+    return (value or '').strip().strip('"').strip()
+
+
+def extract_keywords(title, vocabulary):
+    """
+    꿈 제목에서 키워드 후보
+    - 조사를 뗀 형태가 vocabulary(소분류 이름, 제목에 단독으로 나온 토큰)에 있으면 뗀 형태 (뱀이 → 뱀, 호랑이 는 그대로)
+    - 그 외에 '~는' 으로 끝나는 관형형(나오는, 쫓기는)과 흔한 단어는 제외
+    """
+    keywords = set()
+    for token in tokenize(title):
+        stems = [token[:-len(particle)] for particle in PARTICLES if token.endswith(particle) and len(token) > len(particle)]
+        stem = next((stem for stem in stems if stem in vocabulary), None)
+        if stem is None and token.endswith('는'):
+            continue
+        keyword = stem or token
+        if keyword not in STOPWORDS:
+            keywords.add(keyword)
+    return keywords
+
+
+class DreamDictionary:
+    """한 시점의 사전 데이터 (만든 뒤에는 바뀌지 않으므로 여러 스레드에서 그대로 읽어도 안전)"""
+
+    def __init__(self, raw_items, version, mtime):
+        self.version = version  # 파일 내용 해시 (ETag 등에 사용)
+        self.last_modified = datetime.fromtimestamp(mtime, tz=py_timezone.utc)
+        self.mtime_ns = None
+        self.size = None
+
+        self.items = []
+        self.tree = {}  # 대분류 -> [소분류, ...] (처음 등장한 순서)
+        self.pair_index = {}  # (대분류, 소분류) -> [항목 id, ...]
+        for raw in raw_items:
+            item = {
+                **raw,
+                'id': len(self.items),
+                '대분류': clean(raw.get('대분류')),
+                '소분류': clean(raw.get('소분류')),
+            }
+            self.items.append(item)
+
+            pair = (item['대분류'], item['소분류'])
+            if pair not in self.pair_index:
+                self.pair_index[pair] = []
+                self.tree.setdefault(item['대분류'], []).append(item['소분류'])
+            self.pair_index[pair].append(item['id'])
+
+        self.categories = sorted(self.tree)
+        self._search_index = None
+        self._search_lock = threading.Lock()
+        self._autocomplete = None
+        self._autocomplete_lock = threading.Lock()
+
+    def subcategories(self, category):
+        return self.tree.get(category, [])
+
+    def count(self, category, subcategory):
+        return len(self.pair_index.get((category, subcategory), ()))
+
+    def entries(self, category, subcategory, offset=0, limit=None):
+        """(대분류, 소분류) 에 속한 항목들 (offset/limit 로 잘라서)"""
+        ids = self.pair_index.get((category, subcategory), [])
+        ids = ids[offset:] if limit is None else ids[offset:offset + limit]
+        return [self.items[i] for i in ids]
+
+    @property
+    def search_index(self):
+        """n-gram 검색 색인 (보통 _build 에서 미리 준비됨)"""
+        if self._search_index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    self._search_index = load_or_build_search_index(self)
+        return self._search_index
+
+    def search(self, query, offset=0, limit=20):
+        """
+        꿈/해몽 텍스트 검색: (일치하는 전체 항목 수, 항목 목록)
+        각 항목에는 점수와 필드별 하이라이트 위치([시작, 끝) 목록)가 붙음
+        """
+        scores = self.search_index.scores(query)
+        if scores is None:
+            return 0, []
+        # 순위는 요청한 페이지 끝까지만 정렬
+        results = self.search_index.top(scores, offset + limit)
+        page = []
+        for doc_id, score in results[offset:offset + limit]:
+            item = self.items[doc_id]
+            page.append({
+                **item,
+                'score': round(score, 3),
+                'highlights': {field: find_highlights(item.get(field, ''), query) for field in SEARCH_FIELD_WEIGHTS},
+            })
+        return int(np.count_nonzero(scores)), page
+
+    def title_keywords(self):
+        """항목별로 꿈 제목에서 뽑은 키워드 집합 목록 (항목 id 순)"""
+        titles = [clean(item.get('꿈')) for item in self.items]
+        vocabulary = {sub for _, sub in self.pair_index}
+        for title in titles:
+            vocabulary.update(tokenize(title))
+        return [extract_keywords(title, vocabulary) for title in titles]
+
+    @property
+    def autocomplete_indexes(self):
+        """종류별 접두어 색인 {종류: PrefixIndex}, 빈도는 해당 용어가 나오는 항목 수"""
+        if self._autocomplete is None:
+            with self._autocomplete_lock:
+                if self._autocomplete is None:
+                    started = time.monotonic()
+                    subcategories = Counter()
+                    for (_, sub), ids in self.pair_index.items():
+                        subcategories[sub] += len(ids)
+
+                    dreams = Counter(clean(item.get('꿈')) for item in self.items)
+                    keywords = Counter()
+                    for title_keywords in self.title_keywords():
+                        keywords.update(title_keywords)
+                    self._autocomplete = {
+                        'subcategory': PrefixIndex(subcategories),
+                        'keyword': PrefixIndex(keywords),
+                        'dream': PrefixIndex(dreams),
+                    }
+                    print(f"🔤 자동완성 색인 생성 완료 ({time.monotonic() - started:.2f}s)")
+        return self._autocomplete
+
+    def autocomplete(self, prefix, kinds=AUTOCOMPLETE_KINDS, limit=10):
+        """
+        접두어 자동완성: 빈도 순 [{'term', 'kind', 'count'}, ...]
+        여러 종류에 같은 용어가 있으면 kinds 에서 앞선 종류 하나만 남김
+        """
+        candidates = []
+        for order, kind in enumerate(kinds):
+            for term, count in self.autocomplete_indexes[kind].complete(prefix, limit):
+                candidates.append((-count, order, term, kind))
+
+        results, seen = [], set()
+        for negative_count, _, term, kind in sorted(candidates):
+            if term in seen:
+                continue
+            seen.add(term)
+            results.append({'term': term, 'kind': kind, 'count': -negative_count})
+            if len(results) == limit:
+                break
+        return results
+
+
+def load_or_build_search_index(dictionary, path=None, save=True):
+    path = path or SEARCH_INDEX_PATH
+    if os.path.exists(path):
+        try:
+            index = NgramIndex.load(path)
+            if index.version == dictionary.version:
+                return index
+        except Exception as e:
+            print(f"⚠️ 검색 색인 파일을 읽지 못했습니다 ({e}). 새로 만듭니다.")
+
+    started = time.monotonic()
+    index = NgramIndex.build(dictionary.items, SEARCH_FIELD_WEIGHTS, dictionary.version)
+    print(f"🔎 검색 색인 생성 완료: n-gram {len(index.vocab)}개 ({time.monotonic() - started:.1f}s)")
+    if save:
+        try:
+            # 다른 프로세스가 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체
+            temp_path = f"{path}.{os.getpid()}.tmp.npz"
+            index.save(temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ 검색 색인 파일을 저장하지 못했습니다 ({e}).")
+    return index
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _build(path, stat):
+    version = _file_hash(path)
+    if _dictionary is not None and _dictionary.version == version:
+        return _dictionary  # 내용은 그대로이고 mtime 만 바뀐 경우 (touch, 재배포 등)
+
+    started = time.monotonic()
+    with open(path, 'r', encoding='utf-8') as f:
+        dictionary = DreamDictionary(json.load(f), version, stat.st_mtime)
+    print(f"📚 꿈 사전 로드 완료: {len(dictionary.items)}개 ({time.monotonic() - started:.2f}s, 버전 {version})")
+    # 검색 색인도 지금 준비 (첫 검색 요청이 색인 생성을 기다리지 않도록)
+    dictionary._search_index = load_or_build_search_index(dictionary)
+    return dictionary
+
+
+def get_dictionary():
+    """현재 사전 (파일이 바뀌었으면 다시 만들어서)"""
+    global _dictionary, _checked_at
+
+    now = time.monotonic()
+    if _dictionary is not None and now - _checked_at < CHECK_INTERVAL:
+        return _dictionary
+
+    with _lock:
+        if _dictionary is not None and now - _checked_at < CHECK_INTERVAL:
+            return _dictionary
+
+        stat = os.stat(DICTIONARY_PATH)
+        if _dictionary is None or (_dictionary.mtime_ns, _dictionary.size) != (stat.st_mtime_ns, stat.st_size):
+            dictionary = _build(DICTIONARY_PATH, stat)
+            dictionary.mtime_ns, dictionary.size = stat.st_mtime_ns, stat.st_size
+            _dictionary = dictionary
+        _checked_at = time.monotonic()
+        return _dictionary
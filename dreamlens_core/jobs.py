@@ -0,0 +1,141 @@
+"""
+DB 기반 해몽 작업 큐
+- 별도 브로커 없이 InterpretJob 테이블을 큐로 사용
+- 워커는 SELECT ... FOR UPDATE SKIP LOCKED 로 서로 겹치지 않게 작업을 가져감
+"""
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models import InterpretJob
+
+JOB_SETTINGS = getattr(settings, 'INTERPRET_JOBS', {})
+MAX_ATTEMPTS = JOB_SETTINGS.get('MAX_ATTEMPTS', 3)
+BACKOFF_SECONDS = JOB_SETTINGS.get('BACKOFF_SECONDS', 5)
+LEASE_SECONDS = JOB_SETTINGS.get('LEASE_SECONDS', 300)  # 이 시간 넘게 running 이면 워커가 죽은 것으로 간주
+
+
+def worker_name(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def enqueue(dream, user=None):
+    """해몽 작업을 큐에 등록"""
+    return InterpretJob.objects.create(user=user, input_text=dream)
+
+
+def claim(worker, max_attempts=MAX_ATTEMPTS):
+    """
+    실행할 작업 하나를 가져와 running 상태로 바꿈 (없으면 None)
+    대기 중이면서 실행 시각이 된 작업, 또는 lease 가 만료된 running 작업이 대상
+    lease 가 만료된 작업이 이미 max_attempts 번 시도됐으면 (워커가 매번 죽는 작업) 다시 주지 않고 failed 처리
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=LEASE_SECONDS)
+    with transaction.atomic():
+        while True:
+            job = (
+                InterpretJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=InterpretJob.STATUS_PENDING, run_after__lte=now)
+                    | Q(status=InterpretJob.STATUS_RUNNING, locked_at__lt=expired)
+                )
+                .order_by('run_after', 'pk')
+                .first()
+            )
+            if job is None:
+                return None
+            if job.status == InterpretJob.STATUS_PENDING or job.attempts < max_attempts:
+                break
+
+            job.status = InterpretJob.STATUS_FAILED
+            job.error = f"lease 만료 {job.attempts}회 (워커가 작업 중 종료됨, 마지막 워커 {job.locked_by})"
+            job.save(update_fields=['status', 'error', 'updated_at'])
+
+        job.status = InterpretJob.STATUS_RUNNING
+        job.attempts += 1
+        job.locked_by = worker
+        job.locked_at = now
+        job.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at', 'updated_at'])
+    return job
+
+
+def owned(job):
+    """
+    이 워커가 아직 가지고 있는 작업만 (lease 가 만료되어 다른 워커가 다시 가져가면 locked_by/attempts 가 바뀜)
+    """
+    return InterpretJob.objects.filter(
+        pk=job.pk,
+        status=InterpretJob.STATUS_RUNNING,
+        locked_by=job.locked_by,
+        attempts=job.attempts,
+    )
+
+
+def complete(job, parsed, served_from_cache=False, interpretation=None):
+    """
+    완료 처리, 이미 다른 워커가 가져간 작업이면 아무것도 바꾸지 않고 False
+    (호출한 쪽은 결과를 버리고 같은 트랜잭션의 해몽 저장도 롤백해야 함)
+    """
+    job.status = InterpretJob.STATUS_DONE
+    job.result = parsed
+    job.served_from_cache = served_from_cache
+    job.interpretation = interpretation
+    job.error = ''
+    return bool(owned(job).update(
+        status=job.status,
+        result=parsed,
+        served_from_cache=served_from_cache,
+        interpretation=interpretation,
+        error='',
+        updated_at=timezone.now(),
+    ))
+
+
+def fail(job, error, max_attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS):
+    """
+    실패 처리: 시도 횟수가 남았으면 지수 backoff 후 재시도, 아니면 failed
+    이미 다른 워커가 가져간 작업이면 새 워커의 상태를 덮어쓰지 않고 False
+    """
+    job.error = str(error)
+    if job.attempts < max_attempts:
+        job.status = InterpretJob.STATUS_PENDING
+        job.run_after = timezone.now() + timedelta(seconds=backoff * 2 ** (job.attempts - 1))
+    else:
+        job.status = InterpretJob.STATUS_FAILED
+    return bool(owned(job).update(
+        status=job.status,
+        run_after=job.run_after,
+        error=job.error,
+        updated_at=timezone.now(),
+    ))
+
+
+def queue_position(job):
+    """이 작업 앞에 대기 중인 작업 수"""
+    return InterpretJob.objects.filter(
+        status=InterpretJob.STATUS_PENDING,
+        run_after__lte=job.run_after,
+        pk__lt=job.pk,
+    ).count()
+
+
+def queue_stats():
+    """상태별 작업 수와 가장 오래 기다린 대기 작업의 대기 시간(초)"""
+    counts = dict(
+        InterpretJob.objects.values_list('status').annotate(n=Count('id')).order_by()
+    )
+    oldest = InterpretJob.objects.filter(status=InterpretJob.STATUS_PENDING).aggregate(t=Min('created_at'))['t']
+    return {
+        'pending': counts.get(InterpretJob.STATUS_PENDING, 0),
+        'running': counts.get(InterpretJob.STATUS_RUNNING, 0),
+        'done': counts.get(InterpretJob.STATUS_DONE, 0),
+        'failed': counts.get(InterpretJob.STATUS_FAILED, 0),
+        'oldest_pending_seconds': (timezone.now() - oldest).total_seconds() if oldest else 0,
+    }
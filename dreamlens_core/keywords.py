@@ -0,0 +1,60 @@
+"""
+해몽 키워드 정규화 / 저장
+- Interpretation.keywords ('뱀, 돈 ,물') 를 나눠 공백/대소문자를 정리하고 중복을 뺀 뒤
+  Keyword + InterpretationKeyword 로 연결 → 키워드 집계를 DB 의 GROUP BY 로 처리
+- 마이그레이션 0007(기존 해몽 백필), 0008(빠진 연결 복구)에도 같은 규칙이 복사되어 있음 (바꾸면 함께 수정)
+- MySQL 에서는 Keyword.name 을 utf8mb4_bin 으로 비교 (0008) → 파이썬에서 다른 이름은 DB 에서도 다른 행
+"""
+from django.db.models import Count
+
+from .models import InterpretationKeyword, Keyword
+
+MAX_KEYWORD_LENGTH = Keyword._meta.get_field('name').max_length
+
+
+def normalize_keyword(keyword):
+    """'  Big   뱀 ' -> 'big 뱀' (연속 공백 하나로, 소문자, 최대 길이로 자름)"""
+    return " ".join(keyword.casefold().split())[:MAX_KEYWORD_LENGTH]
+
+
+def split_keywords(raw):
+    """'뱀, 돈 ,뱀,, 물' -> ['뱀', '돈', '물'] (정규화, 빈 값/중복 제외, 순서 유지)"""
+    keywords = (normalize_keyword(keyword) for keyword in (raw or '').split(','))
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+
+def link_keywords(interpretation):
+    """해몽의 keywords 문자열을 Keyword 로 연결 (이미 연결된 키워드는 그대로 둠)"""
+    names = split_keywords(interpretation.keywords)
+    if not names:
+        return []
+    Keyword.objects.bulk_create([Keyword(name=name) for name in names], ignore_conflicts=True)
+    ids = dict(Keyword.objects.filter(name__in=names).values_list('name', 'pk'))
+    unmatched = [name for name in names if name not in ids]
+    if unmatched:
+        # DB 가 이름을 파이썬과 다르게 비교하면 (binary 가 아닌 collation) 다른 이름으로 저장된 행과 같을 수 있음
+        print(f"⚠️ 해몽 {interpretation.pk} 의 키워드를 Keyword 에서 찾지 못해 연결하지 않았습니다: {unmatched}")
+    InterpretationKeyword.objects.bulk_create(
+        [
+            InterpretationKeyword(interpretation=interpretation, keyword_id=ids[name], position=position)
+            for position, name in enumerate(names)
+            if name in ids
+        ],
+        ignore_conflicts=True,
+    )
+    return names
+
+
+def most_common_keywords(limit=20, **interpretation_filters):
+    """
+    가장 많이 나온 키워드 [(키워드, 해몽 수), ...]
+    예: most_common_keywords(10, user_id=3, created_at__gte=since)
+    """
+    filters = {f'interpretation__{lookup}': value for lookup, value in interpretation_filters.items()}
+    return list(
+        InterpretationKeyword.objects
+        .filter(**filters)
+        .values_list('keyword__name')
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'keyword__name')[:limit]
+    )
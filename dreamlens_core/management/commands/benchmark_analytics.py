@@ -0,0 +1,153 @@
+import sys
+import importlib.util
+import time
+import random
+import warnings
+import statistics
+import subprocess
+from collections import Counter
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from .benchmark_queries import scratch_database, seed_diaries
+
+USERNAME_PREFIX = 'analytics_bench_'
+
+
+def legacy_analyze_emotion_keywords(user, year, month):
+    """예전 views.analyze_emotion_keywords (pandas DataFrame groupby) 비교용 사본"""
+    import calendar
+    import pandas as pd
+
+    _, last_day = calendar.monthrange(year, month)
+    start_date = timezone.datetime(year, month, 1)
+    end_date = timezone.datetime(year, month, last_day, 23, 59, 59)
+
+    from dreamlens_core.models import Diary
+    diaries = Diary.objects.filter(
+        user=user,
+        date__range=(start_date, end_date)
+    ).values('emotion__icon', 'emotion__name', 'interpretation__keywords')
+
+    if not diaries.exists():
+        return {}
+
+    df = pd.DataFrame(list(diaries))
+    df['emotion_label'] = df['emotion__icon'] + ' ' + df['emotion__name']
+    emotion_groups = df.groupby('emotion_label')
+
+    analysis_result = {}
+    for emotion, group_df in emotion_groups:
+        all_keywords = []
+        for keywords in group_df['interpretation__keywords']:
+            keyword_list = [keyword.strip() for keyword in keywords.split(',')]
+            all_keywords.extend(keyword_list)
+        if not all_keywords:
+            continue
+        keyword_counts = Counter(all_keywords)
+        top_3_keywords = keyword_counts.most_common(3)
+        analysis_result[emotion] = [keyword for keyword, count in top_3_keywords]
+    return analysis_result
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def import_seconds(module):
+    """새 파이썬 프로세스에서 module 을 import 하는 데 걸린 시간 (인터프리터 시작 시간 제외)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    try:
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        return float(output)
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ("감정별 키워드 분석을 예전 pandas 구현과 analytics 모듈(DB GROUP BY + NumPy)로 "
+            "일기 수별(기본 10 / 1천 / 10만)로 실행해 시간과 결과를 비교합니다. "
+            "가짜 데이터는 벤치마크용 DB(test_<DB 이름>)에만 넣습니다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1_000, 100_000], help="한 달 일기 수")
+        parser.add_argument('--repeat', type=int, default=5, help="구현별 반복 실행 횟수 (중앙값 사용)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="끝난 뒤 벤치마크용 DB 를 지우지 않음 (다음 실행 때 재사용)")
+
+    def handle(self, *args, **options):
+        with scratch_database(keep=options['keep'], log=self.stdout.write):
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        from dreamlens_core import analytics
+        from dreamlens_core.models import User
+        from dreamlens_core.report_builder import month_range
+
+        has_pandas = importlib.util.find_spec('pandas') is not None
+        if not has_pandas:
+            self.stdout.write("⚠️ pandas 가 설치되어 있지 않아 예전 구현은 건너뜁니다.")
+
+        for module in ('pandas', 'numpy'):
+            seconds = import_seconds(module)
+            self.stdout.write(f"📦 import {module}: " + (f"{seconds * 1000:.0f}ms" if seconds is not None else "실패"))
+
+        # 지난달 한 달 안에 일기를 몰아 넣음
+        last_month = timezone.localdate().replace(day=1) - relativedelta(months=1)
+        start, end = month_range(last_month.year, last_month.month)
+        rng = random.Random(options['seed'])
+        repeat = max(options['repeat'], 1)
+
+        rows = []
+        for size in options['sizes']:
+            user, _ = User.objects.get_or_create(username=f"{USERNAME_PREFIX}{size}", defaults={'nickname': 'bench'})
+            existing = user.diaries.filter(date__gte=start, date__lt=end).count()
+            if existing < size:
+                self.stdout.write(f"🌱 {user.username}: 일기 {size - existing}개 생성 중...")
+                seed_diaries(rng, [user], size - existing, start, (end - start) * 0.999)
+
+            args = (user, last_month.year, last_month.month)
+            new_result = analytics.analyze_emotion_keywords(*args)
+            new_ms = median_ms(lambda: analytics.analyze_emotion_keywords(*args), repeat)
+            legacy_ms = matches = None
+            if has_pandas:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)  # 예전 구현의 naive datetime 경고
+                    legacy_result = legacy_analyze_emotion_keywords(*args)
+                    legacy_ms = median_ms(lambda: legacy_analyze_emotion_keywords(*args), repeat)
+                matches = self.same_ranking(legacy_result, new_result, user, start, end)
+            rows.append((size, legacy_ms, new_ms, matches))
+
+        self.stdout.write(f"\n📊 중앙값 (ms, {repeat}회)")
+        self.stdout.write(f"{'diaries':>10}{'pandas':>12}{'analytics':>12}{'speedup':>10}  결과")
+        for size, legacy_ms, new_ms, matches in rows:
+            legacy = f"{legacy_ms:>12.2f}" if legacy_ms is not None else f"{'-':>12}"
+            speedup = f"{legacy_ms / new_ms:>9.1f}x" if legacy_ms is not None and new_ms else f"{'-':>10}"
+            verdict = '-' if matches is None else ('같음' if matches else '다름')
+            self.stdout.write(f"{size:>10}{legacy}{new_ms:>12.2f}{speedup}  {verdict}")
+
+    def same_ranking(self, legacy, new, user, start, end):
+        """
+        두 결과가 같은 순위인지 (동점 키워드는 구현마다 고르는 순서가 다르므로 뽑힌 키워드의 일기 수로 비교)
+        """
+        if set(legacy) != set(new):
+            return False
+        from dreamlens_core.analytics import emotion_keyword_counts
+        from dreamlens_core.models import Emotion, Keyword
+        from dreamlens_core.report_builder import emotion_label
+
+        emotion_ids, keyword_ids, counts = emotion_keyword_counts([user.pk], start, end)
+        names = dict(Keyword.objects.values_list('pk', 'name'))
+        labels = {pk: emotion_label(name, icon) for pk, name, icon in Emotion.objects.values_list('pk', 'name', 'icon')}
+        full = {(labels[e], names[k]): c for e, k, c in zip(emotion_ids.tolist(), keyword_ids.tolist(), counts.tolist())}
+        return all(
+            [full.get((label, keyword), 0) for keyword in legacy[label]] == [full[(label, keyword)] for keyword in new[label]]
+            for label in new
+        )
@@ -0,0 +1,245 @@
+import time
+import random
+import statistics
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Substr
+from django.utils import timezone
+
+USERNAME_PREFIX = 'bench_'
+BATCH_SIZE = 5_000
+KEYWORDS = ['뱀', '돈', '물', '불', '호랑이', '이빨', '시험', '비행', '추락', '조상', '아기', '집', '바다', '꽃', '똥']
+DEFAULT_EMOTIONS = [('😊', '기쁨'), ('😢', '슬픔'), ('😱', '두려움'), ('😡', '분노'), ('😌', '평온')]
+
+
+@contextmanager
+def scratch_database(keep=False, log=None):
+    """
+    Django 테스트 러너처럼 설정된 DB 옆에 벤치마크용 DB(test_<이름>)를 새로 만들어 그 안에서 실행
+    (가짜 데이터 생성과 인덱스 삭제가 운영 DB 에 닿지 않도록)
+    keep=True 면 끝난 뒤에도 지우지 않고 다음 실행 때 그대로 재사용 (keepdb)
+    """
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keep)
+    if log:
+        log(f"🧪 벤치마크용 DB: {test_name} ({'유지' if keep else '끝나면 삭제'})")
+    try:
+        yield test_name
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keep)
+
+
+def month_range(year, month):
+    """KST 기준 해당 월의 [시작, 다음 달 시작) (views 와 같은 방식)"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(year, month, 1), tz)
+    end = timezone.make_aware(datetime(year, month, 1) + relativedelta(months=1), tz)
+    return start, end
+
+
+def view_queries(user, year, month):
+    """뷰들이 실제로 보내는 쿼리와 같은 조회 경로 [(이름, QuerySet), ...]"""
+    from dreamlens_core.models import Diary, Interpretation
+    from dreamlens_core.report_builder import diary_groups, keyword_groups
+
+    start, end = month_range(year, month)
+    diaries = Diary.objects.filter(user=user, date__gte=start, date__lt=end)
+    return [
+        # diary_calendar.build_month
+        ('diary_list', diaries.order_by('pk').annotate(
+            snippet=Substr('interpretation__input_text', 1, 21),
+        ).values('pk', 'date', 'dream_type_id', 'snippet')),
+        # report_builder.refresh_report (MonthlyReport 가 없거나 일기가 바뀐 달을 다시 집계)
+        ('report.diary_groups', diary_groups(diaries)),
+        ('report.keyword_groups', keyword_groups(diaries)),
+        # 사용자별 최신 해몽 (Interpretation.Meta.ordering)
+        ('interpretation.latest', Interpretation.objects.filter(user=user)[:20]),
+    ]
+
+
+def seed_diaries(rng, users, count, start, span, weights=None, log=None):
+    """
+    users 에게 가짜 일기 count 개를 나눠 줌 (날짜는 start ~ start + span 사이, 해몽/키워드 연결 포함)
+    꿈 유형은 good/bad/normal, 감정은 DB 에 있는 감정(없으면 DEFAULT_EMOTIONS 를 만듦) + 없음 중에서 무작위
+    """
+    from dreamlens_core.keywords import split_keywords
+    from dreamlens_core.models import Diary, DreamType, Emotion, Interpretation, InterpretationKeyword, Keyword
+
+    dream_types = [DreamType.objects.get_or_create(type=t)[0] for t in ('good', 'bad', 'normal')]
+    if not Emotion.objects.exists():
+        Emotion.objects.bulk_create([Emotion(icon=icon, name=name) for icon, name in DEFAULT_EMOTIONS])
+    emotions = list(Emotion.objects.all()) + [None]
+    Keyword.objects.bulk_create([Keyword(name=name) for name in KEYWORDS], ignore_conflicts=True)
+    keyword_ids = dict(Keyword.objects.filter(name__in=KEYWORDS).values_list('name', 'pk'))
+
+    remaining = count
+    while remaining > 0:
+        size = min(BATCH_SIZE, remaining)
+        owners = rng.choices(users, weights=weights, k=size)
+        interpretations = Interpretation.objects.bulk_create(
+            Interpretation(
+                user=owner,
+                input_text=f"가짜 꿈 {rng.random():.6f} " * 5,
+                result='',
+                keywords=', '.join(rng.sample(KEYWORDS, 3)),
+            )
+            for owner in owners
+        )
+        if interpretations[0].pk is None:
+            # 한 번의 INSERT 로 들어간 행은 pk 가 연속이므로 마지막 size 개를 순서대로 다시 읽음
+            pks = Interpretation.objects.order_by('-pk').values_list('pk', flat=True)[:size]
+            for interpretation, pk in zip(interpretations, reversed(list(pks))):
+                interpretation.pk = pk
+        InterpretationKeyword.objects.bulk_create(
+            InterpretationKeyword(interpretation_id=interpretation.pk, keyword_id=keyword_ids[name], position=position)
+            for interpretation in interpretations
+            for position, name in enumerate(split_keywords(interpretation.keywords))
+        )
+        Diary.objects.bulk_create(
+            Diary(
+                user=owner,
+                interpretation=interpretation,
+                emotion=rng.choice(emotions),
+                dream_type=rng.choice(dream_types),
+                date=start + span * rng.random(),
+            )
+            for owner, interpretation in zip(owners, interpretations)
+        )
+        remaining -= size
+        if log:
+            log(f"🌱 {count - remaining}/{count}")
+
+
+class Command(BaseCommand):
+    help = ("벤치마크용 DB(test_<DB 이름>)를 따로 만들어 가짜 사용자/일기를 대량으로 넣고, "
+            "복합 인덱스(Diary(user, date), Interpretation(user, created_at)) 유무에 따른 "
+            "뷰 쿼리의 EXPLAIN 과 실행 시간을 비교합니다. 설정된 DB 에는 쓰지 않습니다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--diaries', type=int, default=200_000, help="만들 일기 수 (해몽도 같은 수만큼 생성)")
+        parser.add_argument('--users', type=int, default=200, help="일기를 나눠 가질 가짜 사용자 수")
+        parser.add_argument('--months', type=int, default=24, help="일기 날짜를 흩뿌릴 기간 (최근 N개월)")
+        parser.add_argument('--repeat', type=int, default=20, help="쿼리별 반복 실행 횟수 (중앙값 사용)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--no-explain', action='store_true', help="실행 계획은 출력하지 않고 시간만 비교")
+        parser.add_argument('--keep', action='store_true', help="끝난 뒤 벤치마크용 DB 를 지우지 않음 (다음 실행 때 재사용)")
+
+    def handle(self, *args, **options):
+        from dreamlens_core.models import Diary, Interpretation
+
+        indexes = [(model, index) for model in (Diary, Interpretation) for index in model._meta.indexes]
+        if not indexes:
+            raise CommandError("비교할 인덱스가 모델에 정의되어 있지 않습니다.")
+
+        with scratch_database(keep=options['keep'], log=self.stdout.write):
+            self.benchmark(indexes, options)
+
+    def benchmark(self, indexes, options):
+        from dreamlens_core.models import Diary, Interpretation, User
+
+        rng = random.Random(options['seed'])
+        users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('pk'))
+        if users:
+            self.stdout.write(f"♻️ 벤치마크용 DB 의 가짜 사용자 {len(users)}명을 재사용합니다. (새로 만들려면 --keep 없이 실행)")
+        else:
+            users = self.seed(rng, options)
+        self.analyze_tables([Diary, Interpretation])
+
+        # 일기가 가장 많은 사용자의, 일기가 있는 달 하나를 대상으로 측정
+        user = max(users, key=lambda u: u.diaries.count())
+        latest = Diary.objects.filter(user=user).order_by('-date').values_list('date', flat=True).first()
+        if latest is None:
+            raise CommandError("측정할 일기가 없습니다.")
+        latest = timezone.localtime(latest)
+        queries = view_queries(user, latest.year, latest.month)
+        self.stdout.write(f"🎯 대상: {user.username} ({latest.year}-{latest.month:02d}), DB: {connection.vendor}")
+
+        try:
+            dropped = self.drop_indexes(indexes)
+            before = self.measure(queries, 'before', options)
+            self.create_indexes(indexes)
+            self.analyze_tables([Diary, Interpretation])
+            after = self.measure(queries, 'after', options)
+        finally:
+            # 측정 중 실패해도 인덱스는 원래대로 둠
+            self.create_indexes(indexes)
+
+        self.stdout.write(f"\n📊 중앙값 (ms, {options['repeat']}회), 제거 후 다시 만든 인덱스: {', '.join(dropped) or '없음'}")
+        self.stdout.write(f"{'query':<28}{'before':>10}{'after':>10}{'speedup':>10}")
+        for name, _ in queries:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f"{name:<28}{before[name]:>10.2f}{after[name]:>10.2f}{speedup:>9.1f}x")
+
+    # ------------------------------
+    # 데이터 생성
+    # ------------------------------
+    def seed(self, rng, options):
+        from dreamlens_core.models import User
+
+        started = time.monotonic()
+        users = User.objects.bulk_create(
+            User(username=f"{USERNAME_PREFIX}{i}", nickname=f"bench {i}") for i in range(options['users'])
+        )
+        if users[0].pk is None:
+            # bulk_create 가 pk 를 채우지 못하는 DB(MySQL 등)
+            users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('pk'))
+
+        # 사용자마다 일기 수가 다르도록 (상위 사용자에게 몰림)
+        weights = [1 / (rank + 1) for rank in range(len(users))]
+        span = timedelta(days=30 * options['months'])
+        seed_diaries(rng, users, options['diaries'], timezone.now() - span, span, weights=weights, log=self.stdout.write)
+
+        self.stdout.write(f"✅ 사용자 {len(users)}명, 일기 {options['diaries']}개 생성 ({time.monotonic() - started:.1f}s)")
+        return users
+
+    # ------------------------------
+    # 인덱스 / 측정
+    # ------------------------------
+    def existing_indexes(self, model):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+    def drop_indexes(self, indexes):
+        dropped = []
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                if index.name in self.existing_indexes(model):
+                    editor.remove_index(model, index)
+                    dropped.append(index.name)
+        return dropped
+
+    def create_indexes(self, indexes):
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                if index.name not in self.existing_indexes(model):
+                    editor.add_index(model, index)
+
+    def analyze_tables(self, models):
+        """옵티마이저 통계 갱신 (대량 삽입/인덱스 생성 직후엔 통계가 없어 계획이 틀어질 수 있음)"""
+        with connection.cursor() as cursor:
+            for model in models:
+                table = connection.ops.quote_name(model._meta.db_table)
+                if connection.vendor == 'mysql':
+                    cursor.execute(f"ANALYZE TABLE {table}")
+                    cursor.fetchall()
+                elif connection.vendor in ('sqlite', 'postgresql'):
+                    cursor.execute(f"ANALYZE {table}")
+
+    def measure(self, queries, label, options):
+        self.stdout.write(f"\n===== {label} =====")
+        timings = {}
+        for name, qs in queries:
+            if not options['no_explain']:
+                self.stdout.write(f"--- {name}\n{qs.explain()}")
+            list(qs)  # 캐시 워밍업
+            samples = []
+            for _ in range(max(options['repeat'], 1)):
+                started = time.perf_counter()
+                list(qs.all())  # 새 QuerySet 으로 매번 실제 조회
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(samples)
+        return timings
@@ -0,0 +1,26 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "꿈 사전 검색용 n-gram 색인을 미리 만들어 파일로 저장합니다. (배포 후 첫 검색이 느려지지 않도록)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="저장된 색인이 최신이어도 다시 만듦")
+
+    def handle(self, *args, **options):
+        from dreamlens_core.dictionary import SEARCH_INDEX_PATH, get_dictionary
+
+        if options['force'] and os.path.exists(SEARCH_INDEX_PATH):
+            os.remove(SEARCH_INDEX_PATH)
+
+        # 사전을 읽을 때 저장된 색인을 읽거나 새로 만들어 저장함
+        started = time.monotonic()
+        index = get_dictionary().search_index
+        size_mb = os.path.getsize(SEARCH_INDEX_PATH) / 1024 / 1024 if os.path.exists(SEARCH_INDEX_PATH) else 0
+        self.stdout.write(
+            f"✅ 검색 색인 준비 완료: 문서 {index.doc_count}개, n-gram {len(index.vocab)}개,"
+            f" {size_mb:.1f} MB ({time.monotonic() - started:.1f}s, 버전 {index.version})"
+        )
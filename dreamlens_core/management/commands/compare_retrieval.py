@@ -0,0 +1,118 @@
+import time
+import random
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+MODES = ('vector', 'lexical', 'hybrid')
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+class Command(BaseCommand):
+    help = "참고 꿈 검색 방식(Faiss / BM25 / 하이브리드)별 결과 겹침, 분류 적중률, 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=200, help="사전에서 뽑을 질의 꿈 개수 (--queries 가 없을 때)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--k', type=int, default=None, help="비교할 상위 결과 수 (기본값: 참고 꿈 개수)")
+        parser.add_argument('--queries', default=None,
+                            help="질의 파일 (한 줄에 꿈 하나, 질의마다 임베딩 API 호출 → 임베딩 지연 시간도 측정)")
+
+    def handle(self, *args, **options):
+        from dreamlens_core import retrieval, views
+        from utils.knn_classifier import clean_label
+
+        if not retrieval.is_ready():
+            raise CommandError("Faiss 인덱스를 불러오지 못했습니다.")
+        try:
+            retrieval.get('lexical_index')  # HYBRID_RETRIEVAL_ENABLED 와 관계없이 비교용으로 로드
+        except retrieval.ArtifactUnavailable as e:
+            raise CommandError(f"BM25 색인을 불러오지 못했습니다: {e}")
+        faiss_index = retrieval.get('index')
+        metadata = retrieval.get('metadata')
+        k = options['k'] or views.REFERENCE_K
+
+        # (질의 텍스트, 질의 벡터 또는 None, 자기 자신의 메타데이터 위치 또는 None)
+        if options['queries']:
+            with open(options['queries'], encoding='utf-8') as f:
+                queries = [(line.strip(), None, None) for line in f if line.strip()]
+        else:
+            rng = random.Random(options['seed'])
+            sample = rng.sample(range(len(metadata)), min(options['sample'], len(metadata)))
+            queries = []
+            for i in sample:
+                # 인덱스에 저장된 벡터를 그대로 사용 (재구성이 안 되는 인덱스면 임베딩 API 사용)
+                try:
+                    vector = np.array([faiss_index.reconstruct(i)], dtype='float32')
+                except RuntimeError:
+                    vector = None
+                queries.append((metadata[i].get('꿈', ''), vector, i))
+        if not queries:
+            raise CommandError("질의가 없습니다.")
+
+        latencies = {mode: [] for mode in MODES + ('embedding',)}
+        hits = {mode: [] for mode in MODES}
+        overlaps = {'vector∩hybrid': [], 'vector∩lexical': [], 'lexical∩hybrid': []}
+        empty = {mode: 0 for mode in MODES}
+
+        for n, (text, vector, self_id) in enumerate(queries, 1):
+            if vector is None:
+                started = time.perf_counter()
+                vector = views.get_embedding(text)
+                latencies['embedding'].append(time.perf_counter() - started)
+
+            # leave-one-out: 사전에서 뽑은 질의는 자기 자신을 결과에서 제외
+            extra = 1 if self_id is not None else 0
+            results = {}
+
+            started = time.perf_counter()
+            vector_results = views.retrieve_similar_dreams(vector, k=k + extra)
+            latencies['vector'].append(time.perf_counter() - started)
+            results['vector'] = [item['id'] for item in vector_results]
+
+            started = time.perf_counter()
+            lexical_results = retrieval.lexical_search(text, k + extra)
+            latencies['lexical'].append(time.perf_counter() - started)
+            results['lexical'] = [idx for idx, _ in lexical_results]
+
+            started = time.perf_counter()
+            hybrid_results, _ = views.retrieve_hybrid(text, vector, k=k + extra)
+            latencies['hybrid'].append(time.perf_counter() - started)
+            results['hybrid'] = [item['id'] for item in hybrid_results]
+
+            for mode in MODES:
+                results[mode] = [idx for idx in results[mode] if idx != self_id][:k]
+                if not results[mode]:
+                    empty[mode] += 1
+                if self_id is not None:
+                    expected = clean_label(metadata[self_id].get('소분류'))
+                    same = sum(clean_label(metadata[idx].get('소분류')) == expected for idx in results[mode])
+                    hits[mode].append(same / k)
+
+            for pair in overlaps:
+                a, b = pair.split('∩')
+                overlaps[pair].append(len(set(results[a]) & set(results[b])) / k)
+
+            if n % 50 == 0:
+                self.stdout.write(f"[{n}/{len(queries)}]")
+
+        self.stdout.write("")
+        self.stdout.write(f"📊 질의 {len(queries)}개, 상위 {k}개 비교")
+        self.stdout.write("방식      평균(ms)  p95(ms)  결과 없음  같은 소분류 비율")
+        for mode in MODES:
+            ms = [value * 1000 for value in latencies[mode]]
+            hit = f"{np.mean(hits[mode]):>10.1%}" if hits[mode] else f"{'-':>10}"
+            self.stdout.write(
+                f"{mode:<8} {np.mean(ms):>9.2f} {percentile(ms, 95):>8.2f} {empty[mode]:>9}  {hit}"
+            )
+        if latencies['embedding']:
+            ms = [value * 1000 for value in latencies['embedding']]
+            self.stdout.write(f"(임베딩 API 평균 {np.mean(ms):.1f} ms, p95 {percentile(ms, 95):.1f} ms — vector/hybrid 에 더해짐)")
+
+        self.stdout.write("")
+        self.stdout.write("결과 겹침 (상위 k개 중 공통 비율)")
+        for pair, values in overlaps.items():
+            self.stdout.write(f"{pair:<16} {np.mean(values):>6.1%}")
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "로컬 kNN 분류기의 분류 결과를 LLM 분류(또는 데이터셋 라벨)와 비교해 일치율을 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=50, help="평가할 꿈 개수 (LLM 라벨은 건당 API 호출 1회)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--k', type=int, default=None, help="투표 이웃 수 (기본값: settings.KNN_CLASSIFIER['K'])")
+        parser.add_argument('--thresholds', default="0.3,0.4,0.5,0.6,0.7,0.8", help="비교할 신뢰도 임계값 목록")
+        parser.add_argument('--labels', choices=['llm', 'dataset'], default='llm',
+                            help="비교 기준: llm(현재 프롬프트로 GPT 가 고른 분류) / dataset(사전 원본 분류, API 호출 없음)")
+
+    def handle(self, *args, **options):
+        from dreamlens_core import retrieval, views
+        from utils.knn_classifier import classify_neighbors, clean_label, parse_classification
+
+        if not retrieval.warmup():
+            raise CommandError("Faiss 인덱스를 불러오지 못했습니다.")
+        faiss_index = retrieval.get('index')
+        metadata = retrieval.get('metadata')
+
+        k = options['k'] or views.KNN_CLASSIFIER_CONFIG.get('K', views.REFERENCE_K)
+        metric = views.KNN_CLASSIFIER_CONFIG.get('METRIC', 'l2')
+        thresholds = [float(t) for t in options['thresholds'].split(',')]
+
+        rng = random.Random(options['seed'])
+        sample = rng.sample(range(len(metadata)), min(options['sample'], len(metadata)))
+
+        rows = []  # (신뢰도, kNN 대분류, kNN 소분류, 기준 대분류, 기준 소분류)
+        for n, i in enumerate(sample, 1):
+            item = metadata[i]
+            dream = item.get('꿈', '').strip()
+
+            # 인덱스에 저장된 벡터를 그대로 사용 (재구성이 안 되는 인덱스면 다시 임베딩)
+            try:
+                query_vector = np.array([faiss_index.reconstruct(i)], dtype='float32')
+            except RuntimeError:
+                query_vector = views.get_embedding(dream)
+
+            # leave-one-out: 평가 대상 자신은 이웃에서 제외
+            neighbors = [
+                neighbor for neighbor in views.retrieve_similar_dreams(query_vector, k=max(k, views.REFERENCE_K) + 1)
+                if neighbor.get('꿈', '').strip() != dream
+            ]
+            result = classify_neighbors(neighbors[:k], metric=metric)
+            if result is None:
+                continue
+
+            if options['labels'] == 'dataset':
+                expected = (clean_label(item.get('대분류')), clean_label(item.get('소분류')))
+            else:
+                raw_answer = views.generate_llm_response(dream, neighbors[:views.REFERENCE_K], retrieval.get('categories'))
+                try:
+                    expected = parse_classification(views.parse_llm_response(raw_answer)['classification_result'])
+                except ValueError:
+                    self.stdout.write(f"⚠️ [{n}/{len(sample)}] LLM 답변 형식 오류, 건너뜀")
+                    continue
+
+            rows.append((result['confidence'], result['대분류'], result['소분류'], *expected))
+            self.stdout.write(
+                f"[{n}/{len(sample)}] kNN {result['대분류']}/{result['소분류']} ({result['confidence']:.2f})"
+                f" vs {options['labels']} {expected[0]}/{expected[1]}"
+            )
+
+        if not rows:
+            raise CommandError("평가할 수 있는 표본이 없습니다.")
+
+        self.stdout.write("")
+        self.stdout.write(f"📊 표본 {len(rows)}개, k={k}, 기준={options['labels']}")
+        self.stdout.write("임계값  적용률  대분류 일치  대+소분류 일치  (적용률: 신뢰도가 임계값 이상이라 LLM 분류를 생략하는 비율)")
+        for threshold in [0.0] + thresholds:
+            covered = [row for row in rows if row[0] >= threshold]
+            if not covered:
+                self.stdout.write(f"{threshold:>6.2f}  {0:>5.1%}  {'-':>10}  {'-':>13}")
+                continue
+            main_match = sum(row[1] == row[3] for row in covered) / len(covered)
+            both_match = sum(row[1] == row[3] and row[2] == row[4] for row in covered) / len(covered)
+            self.stdout.write(
+                f"{threshold:>6.2f}  {len(covered) / len(rows):>5.1%}  {main_match:>10.1%}  {both_match:>13.1%}"
+            )
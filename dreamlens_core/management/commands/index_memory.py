@@ -0,0 +1,125 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def read_status(pid):
+    """/proc/<pid>/status 의 메모리 항목 (kB)"""
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(('VmRSS', 'RssAnon', 'RssFile')):
+                key, value = line.split(':', 1)
+                values[key] = int(value.split()[0])
+    return values
+
+
+def read_mapping_usage(pid, path):
+    """/proc/<pid>/smaps 에서 path 파일을 mmap 한 영역의 Rss/Pss/공유/전용 메모리 합계 (kB)"""
+    usage = {'Rss': 0, 'Pss': 0, 'Shared': 0, 'Private': 0}
+    in_mapping = False
+    with open(f"/proc/{pid}/smaps") as f:
+        for line in f:
+            fields = line.split()
+            if not fields[0].endswith(':'):
+                # 매핑 헤더: 주소 권한 오프셋 장치 inode [경로]
+                in_mapping = len(fields) >= 6 and fields[5] == path
+                continue
+            if not in_mapping or not fields[1].isdigit():  # VmFlags 등 숫자가 아닌 항목 제외
+                continue
+            key, value = fields[0][:-1], int(fields[1])
+            if key in ('Rss', 'Pss'):
+                usage[key] += value
+            elif key.startswith('Shared_'):
+                usage['Shared'] += value
+            elif key.startswith('Private_'):
+                usage['Private'] += value
+    return usage
+
+
+def find_pids(patterns):
+    """명령행에 patterns 중 하나가 들어 있는 프로세스 (자기 자신 제외)"""
+    pids = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit() or int(name) == os.getpid():
+            continue
+        try:
+            with open(f"/proc/{name}/cmdline", 'rb') as f:
+                cmdline = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+        except OSError:
+            continue
+        if any(pattern in cmdline for pattern in patterns):
+            pids.append((int(name), cmdline))
+    return pids
+
+
+def mb(kb):
+    return f"{kb / 1024:8.1f}"
+
+
+class Command(BaseCommand):
+    help = "웹/해몽 워커 프로세스별로 Faiss 인덱스가 차지하는 메모리(RSS/PSS)를 출력합니다. (Linux 전용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pid', type=int, action='append', default=[], help="대상 프로세스 (여러 번 지정 가능)")
+        parser.add_argument('--match', action='append', default=[],
+                            help="명령행에 이 문자열이 들어간 프로세스를 대상으로 (기본값: dreamlens_project, run_interpret_workers)")
+        parser.add_argument('--load', action='store_true',
+                            help="이 프로세스에서 인덱스를 일반/mmap 방식으로 각각 읽어 메모리 증가량을 비교")
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps'):
+            raise CommandError("/proc 파일시스템이 필요합니다. (Linux 전용)")
+
+        from django.conf import settings
+        index_path = os.path.realpath(os.path.join(settings.BASE_DIR, 'vectorDB', 'dream.index'))
+        if not os.path.exists(index_path):
+            raise CommandError(f"인덱스 파일이 없습니다: {index_path}")
+        self.stdout.write(f"📐 인덱스: {index_path} ({mb(os.path.getsize(index_path) // 1024).strip()} MB)")
+
+        if options['load']:
+            self.compare_load_modes(index_path)
+            return
+
+        if options['pid']:
+            targets = [(pid, '') for pid in options['pid']]
+        else:
+            targets = find_pids(options['match'] or ['dreamlens_project', 'run_interpret_workers'])
+        if not targets:
+            raise CommandError("대상 프로세스를 찾지 못했습니다. --pid 나 --match 로 지정하세요.")
+
+        # mmap 모드면 인덱스는 파일 매핑으로 보이고 Pss 가 워커 수만큼 나눠짐
+        # 일반 모드면 인덱스 복사본이 프로세스 힙(RssAnon)에 들어 있음
+        self.stdout.write("    PID   RSS(MB) 익명(MB)  인덱스 매핑 RSS(MB)  PSS(MB) 공유(MB) 전용(MB)  명령행")
+        total_pss = 0
+        for pid, cmdline in targets:
+            try:
+                status = read_status(pid)
+                usage = read_mapping_usage(pid, index_path)
+            except (OSError, PermissionError) as e:
+                self.stdout.write(f"{pid:>7}  읽기 실패: {e}")
+                continue
+            total_pss += usage['Pss']
+            self.stdout.write(
+                f"{pid:>7}  {mb(status.get('VmRSS', 0))} {mb(status.get('RssAnon', 0))}"
+                f"  {mb(usage['Rss'])}           {mb(usage['Pss'])} {mb(usage['Shared'])} {mb(usage['Private'])}"
+                f"  {cmdline[:60]}"
+            )
+        self.stdout.write(f"📊 인덱스 매핑 PSS 합계: {mb(total_pss).strip()} MB (mmap 모드에서 서버 전체가 인덱스에 쓰는 실제 메모리)")
+
+    def compare_load_modes(self, index_path):
+        import numpy as np
+        from utils.faiss_helper import read_index
+
+        for mmap in (False, True):
+            before = read_status('self')
+            index = read_index(index_path, mmap=mmap)
+            # mmap 은 검색할 때 페이지가 올라오므로 한 번 검색한 뒤에 측정 (IVF 는 탐색한 군집만 올라옴)
+            index.search(np.zeros((1, index.d), dtype='float32'), 1)
+            after = read_status('self')
+            self.stdout.write(
+                f"{'mmap' if mmap else '일반':>4}: 익명 메모리 +{mb(after['RssAnon'] - before['RssAnon']).strip()} MB,"
+                f" 파일 매핑 +{mb(after['RssFile'] - before['RssFile']).strip()} MB"
+                f" ({'워커 간 공유' if mmap else '워커마다 따로'})"
+            )
+            del index
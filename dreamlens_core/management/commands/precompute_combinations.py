@@ -0,0 +1,65 @@
+import time
+from itertools import combinations
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def frequent_combinations(dictionary, top, max_size):
+    """
+    꿈 사전에서 자주 함께 나오는 키워드 조합 (크기별 상위 top 개)
+    항목마다 소분류 + 꿈 제목 키워드를 한 묶음으로 보고 1~max_size 개 조합의 등장 항목 수를 셈
+    """
+    counts = {size: Counter() for size in range(1, max_size + 1)}
+    for item, keywords in zip(dictionary.items, dictionary.title_keywords()):
+        keywords = sorted(keywords | {item['소분류']} - {''})
+        for size in counts:
+            counts[size].update(combinations(keywords, size))
+    return [(combo, count) for size in counts for combo, count in counts[size].most_common(top)]
+
+
+class Command(BaseCommand):
+    help = "자주 나오는 키워드 조합(1~3개)의 꿈 조합기 결과를 미리 만들어 캐시에 넣습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=50, help="조합 크기별로 미리 만들 개수")
+        parser.add_argument('--max-size', type=int, default=3, choices=[1, 2, 3], help="조합할 최대 키워드 수")
+        parser.add_argument('--concurrency', type=int, default=4, help="동시에 보낼 LLM 요청 수")
+        parser.add_argument('--dry-run', action='store_true', help="LLM 호출 없이 대상 조합만 출력")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+        from dreamlens_core import views
+        from dreamlens_core.dictionary import get_dictionary
+
+        if views.combine_cache is None:
+            raise CommandError("COMBINE_CACHE_ENABLED=true 일 때만 사용할 수 있습니다.")
+        if settings.CACHE_BACKEND == 'locmem' and not options['dry_run']:
+            self.stdout.write("⚠️ CACHE_BACKEND=locmem 이면 이 명령이 만든 결과는 웹 서버 프로세스와 공유되지 않습니다.")
+
+        targets = frequent_combinations(get_dictionary(), options['top'], options['max_size'])
+        pending = [(combo, count) for combo, count in targets if views.combine_cache.get(combo) is None]
+        self.stdout.write(f"🧩 대상 조합 {len(targets)}개 중 캐시에 없는 {len(pending)}개를 생성합니다.")
+        if options['dry_run']:
+            for combo, count in pending:
+                self.stdout.write(f"{count:>6}  {', '.join(combo)}")
+            return
+
+        started = time.monotonic()
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(options['concurrency'], 1), thread_name_prefix='precompute') as executor:
+            futures = {executor.submit(views.combine_keywords, list(combo)): combo for combo, _ in pending}
+            for future in as_completed(futures):
+                combo = futures[future]
+                try:
+                    future.result()
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(f"⚠️ {', '.join(combo)}: {e}")
+                    continue
+                if done % 10 == 0:
+                    self.stdout.write(f"[{done + failed}/{len(pending)}] {', '.join(combo)}")
+
+        self.stdout.write(f"✅ 완료: 생성 {done}개, 실패 {failed}개 ({time.monotonic() - started:.1f}s)")
@@ -0,0 +1,57 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "모든 사용자의 월간 리포트(MonthlyReport)를 일기 원본으로 다시 집계합니다. (사용자를 batch 단위로 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help="한 번에 처리할 사용자 수")
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="특정 사용자 id 만 (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        from django.db.models.functions import TruncMonth
+        from dreamlens_core.models import Diary, MonthlyReport, User
+        from dreamlens_core.report_builder import ReportAccumulator, diary_groups, keyword_groups
+
+        users = User.objects.order_by('pk').values_list('pk', flat=True)
+        if options['user_ids']:
+            users = users.filter(pk__in=options['user_ids'])
+        user_ids = list(users)
+        batch_size = max(options['batch_size'], 1)
+
+        tz = timezone.get_current_timezone()
+
+        def yyyymm(month):
+            local = month.astimezone(tz)  # 시간대를 지원하는 DB 는 UTC 로 돌려줌
+            return local.year * 100 + local.month
+
+        started = time.monotonic()
+        written = 0
+        for offset in range(0, len(user_ids), batch_size):
+            batch = user_ids[offset:offset + batch_size]
+
+            # 사용자 batch 의 일기를 refresh_report 와 같은 GROUP BY 에 (사용자, KST 월) 을 더해 집계
+            # (키워드도 refresh_report 처럼 InterpretationKeyword 에서 읽음)
+            accumulators = defaultdict(ReportAccumulator)
+            diaries = Diary.objects.filter(user_id__in=batch).annotate(month=TruncMonth('date', tzinfo=tz))
+            for user_id, month, *row in diary_groups(diaries, 'user_id', 'month'):
+                accumulators[(user_id, yyyymm(month))].add_diaries(*row)
+            for user_id, month, *row in keyword_groups(diaries, 'user_id', 'month'):
+                accumulators[(user_id, yyyymm(month))].add_keywords(*row)
+
+            reports = [
+                MonthlyReport(user_id=user_id, yyyymm=yyyymm, **accumulator.counts())
+                for (user_id, yyyymm), accumulator in accumulators.items()
+            ]
+            with transaction.atomic():
+                MonthlyReport.objects.filter(user_id__in=batch).delete()
+                MonthlyReport.objects.bulk_create(reports, batch_size=1_000)
+            written += len(reports)
+            self.stdout.write(f"[{min(offset + batch_size, len(user_ids))}/{len(user_ids)}] 리포트 {len(reports)}개")
+
+        self.stdout.write(f"✅ 완료: 사용자 {len(user_ids)}명, 리포트 {written}개 ({time.monotonic() - started:.1f}s)")
@@ -0,0 +1,119 @@
+import time
+import signal
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+
+
+def run_worker(index, poll_interval, max_attempts, backoff, stats_interval):
+    """
+    워커 프로세스 한 개의 루프: 작업 가져오기 -> 해몽 -> 결과 저장
+    (spawn 방식에서도 동작하도록 Django 관련 import 는 함수 안에서 수행)
+    """
+    import django
+    django.setup()
+
+    from django.db import close_old_connections, transaction
+    from dreamlens_core import jobs
+    from dreamlens_core import views
+
+    name = jobs.worker_name(index)
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"👷 워커 시작: {name}", flush=True)
+    last_stats = time.monotonic()
+    while not stopping:
+        close_old_connections()
+
+        # 0번 워커가 주기적으로 큐 상태를 출력
+        if index == 0 and stats_interval and time.monotonic() - last_stats >= stats_interval:
+            print(f"📊 큐 상태: {jobs.queue_stats()}", flush=True)
+            last_stats = time.monotonic()
+
+        job = jobs.claim(name, max_attempts=max_attempts)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        started = time.monotonic()
+        try:
+            parsed, served_from_cache = views.interpret_dream(job.input_text)
+            # 해몽 저장과 완료 처리를 한 트랜잭션으로: lease 가 만료되어 다른 워커가 가져간 작업이면
+            # 결과를 버리고 해몽 행도 만들지 않음 (같은 해몽이 두 번 저장되지 않도록)
+            with transaction.atomic():
+                interpretation = None
+                if job.user_id:
+                    interpretation = views.save_interpretation(job.user, job.input_text, parsed)
+                completed = jobs.complete(job, parsed, served_from_cache, interpretation)
+                if not completed:
+                    transaction.set_rollback(True)
+            if completed:
+                print(f"✅ 작업 {job.pk} 완료 ({time.monotonic() - started:.1f}s, 시도 {job.attempts}회)", flush=True)
+            else:
+                print(f"⏭️ 작업 {job.pk} 결과 버림 (lease 만료로 다른 워커가 처리 중)", flush=True)
+        except Exception as e:
+            if jobs.fail(job, e, max_attempts=max_attempts, backoff=backoff):
+                print(f"⚠️ 작업 {job.pk} 실패 (시도 {job.attempts}회, 상태 {job.status}): {e}", flush=True)
+            else:
+                print(f"⏭️ 작업 {job.pk} 실패 무시 (lease 만료로 다른 워커가 처리 중): {e}", flush=True)
+
+    print(f"🛑 워커 종료: {name}", flush=True)
+
+
+class Command(BaseCommand):
+    help = "DB 작업 큐(InterpretJob)에 쌓인 해몽 요청을 처리하는 워커 프로세스들을 실행합니다."
+
+    def add_arguments(self, parser):
+        from dreamlens_core import jobs
+
+        parser.add_argument('--concurrency', type=int, default=2, help="워커 프로세스 수")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="큐가 비었을 때 대기 시간(초)")
+        parser.add_argument('--max-attempts', type=int, default=jobs.MAX_ATTEMPTS, help="작업당 최대 시도 횟수")
+        parser.add_argument('--backoff', type=float, default=jobs.BACKOFF_SECONDS, help="재시도 기본 대기 시간(초), 시도마다 2배")
+        parser.add_argument('--stats-interval', type=float, default=30, help="큐 상태 출력 주기(초), 0이면 출력 안 함")
+        parser.add_argument('--stats', action='store_true', help="큐 상태만 출력하고 종료")
+
+    def handle(self, *args, **options):
+        from django.db import connections
+        from dreamlens_core import jobs
+
+        if options['stats']:
+            for key, value in jobs.queue_stats().items():
+                self.stdout.write(f"{key}: {value}")
+            return
+
+        worker_args = (
+            options['poll_interval'],
+            options['max_attempts'],
+            options['backoff'],
+            options['stats_interval'],
+        )
+
+        if options['concurrency'] <= 1:
+            run_worker(0, *worker_args)
+            return
+
+        # fork 시 부모의 DB 커넥션을 자식이 공유하지 않도록 먼저 닫음
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(i, *worker_args), name=f"interpret-worker-{i}")
+            for i in range(options['concurrency'])
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
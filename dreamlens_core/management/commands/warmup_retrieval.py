@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "해몽 검색 파일(Faiss 인덱스, 메타데이터, 분류 기준)을 로드해 보고 항목별 소요 시간/메모리를 출력합니다."
+
+    def handle(self, *args, **options):
+        from dreamlens_core import retrieval
+
+        ready = retrieval.warmup()
+        for name, info in retrieval.status().items():
+            if info.get('loaded'):
+                extra = ", ".join(f"{key}={value}" for key, value in info.items() if key not in ('loaded', 'seconds', 'memory_mb'))
+                self.stdout.write(f"✅ {name}: {info['seconds']}s, 메모리 +{info['memory_mb']} MB{f' ({extra})' if extra else ''}")
+            else:
+                self.stdout.write(f"❌ {name}: {info.get('error', '로드되지 않음')}")
+
+        if not ready:
+            raise CommandError("해몽 검색 파일을 모두 불러오지 못했습니다.")
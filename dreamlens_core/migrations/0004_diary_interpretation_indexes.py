@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dreamlens_core', '0003_interpretjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diary',
+            index=models.Index(fields=['user', 'date'], name='diary_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interpretation',
+            index=models.Index(fields=['user', '-created_at'], name='interp_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dreamlens_core', '0004_diary_interpretation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yyyymm', models.PositiveIntegerField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('dream_type_counts', models.JSONField(default=list)),
+                ('emotion_counts', models.JSONField(default=list)),
+                ('keyword_counts', models.JSONField(default=list)),
+                ('emotion_keyword_counts', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'yyyymm'), name='monthlyreport_user_month_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dreamlens_core', '0005_monthlyreport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InterpretationKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('interpretation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_links', to='dreamlens_core.interpretation')),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interpretation_links', to='dreamlens_core.keyword')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='interpretation',
+            name='keyword_tags',
+            field=models.ManyToManyField(blank=True, related_name='interpretations', through='dreamlens_core.InterpretationKeyword', to='dreamlens_core.keyword'),
+        ),
+        migrations.AddConstraint(
+            model_name='interpretationkeyword',
+            constraint=models.UniqueConstraint(fields=('interpretation', 'keyword'), name='interpretationkeyword_uniq'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:48
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+MAX_KEYWORD_LENGTH = 100
+
+
+# dreamlens_core/keywords.py 의 split_keywords 와 같은 규칙 (마이그레이션은 현재 앱 코드에 의존하지 않도록 복사)
+def split_keywords(raw):
+    keywords = (" ".join(keyword.casefold().split())[:MAX_KEYWORD_LENGTH] for keyword in (raw or '').split(','))
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+
+def backfill_keywords(apps, schema_editor):
+    """기존 해몽의 keywords 문자열을 BATCH_SIZE 개씩 Keyword/InterpretationKeyword 로 옮김"""
+    Interpretation = apps.get_model('dreamlens_core', 'Interpretation')
+    Keyword = apps.get_model('dreamlens_core', 'Keyword')
+    InterpretationKeyword = apps.get_model('dreamlens_core', 'InterpretationKeyword')
+
+    rows = Interpretation.objects.exclude(keywords__isnull=True).exclude(keywords='').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk).values_list('pk', 'keywords')[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        parsed = [(pk, split_keywords(raw)) for pk, raw in batch]
+        names = {name for _, row_names in parsed for name in row_names}
+        Keyword.objects.bulk_create([Keyword(name=name) for name in names], ignore_conflicts=True)
+        ids = dict(Keyword.objects.filter(name__in=names).values_list('name', 'pk'))
+        InterpretationKeyword.objects.bulk_create(
+            [
+                InterpretationKeyword(interpretation_id=pk, keyword_id=ids[name], position=position)
+                for pk, row_names in parsed
+                for position, name in enumerate(row_names)
+                if name in ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def clear_keywords(apps, schema_editor):
+    apps.get_model('dreamlens_core', 'InterpretationKeyword').objects.all().delete()
+    apps.get_model('dreamlens_core', 'Keyword').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dreamlens_core', '0006_keyword'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_keywords, clear_keywords),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:10
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+MAX_KEYWORD_LENGTH = 100
+
+
+# dreamlens_core/keywords.py 의 split_keywords 와 같은 규칙 (마이그레이션은 현재 앱 코드에 의존하지 않도록 복사)
+def split_keywords(raw):
+    keywords = (" ".join(keyword.casefold().split())[:MAX_KEYWORD_LENGTH] for keyword in (raw or '').split(','))
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+
+def alter_name_collation(schema_editor, collation):
+    """MySQL 에서만 Keyword.name 의 collation 변경 (None 이면 테이블 기본값으로)"""
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    quote = schema_editor.quote_name
+    collate = f" CHARACTER SET utf8mb4 COLLATE {collation}" if collation else ""
+    schema_editor.execute(
+        f"ALTER TABLE {quote('dreamlens_core_keyword')} MODIFY {quote('name')} varchar(100){collate} NOT NULL"
+    )
+
+
+def use_binary_collation(apps, schema_editor):
+    """
+    MySQL 기본 collation(utf8mb4_0900_ai_ci 등)은 악센트/전각·반각을 무시하고 비교해서
+    파이썬에서는 다른 키워드가 unique 인덱스에서 충돌함 → 바이트 그대로 비교하는 utf8mb4_bin 으로
+    (ci 에서 서로 달랐던 값은 bin 에서도 다르므로 기존 행끼리 충돌하지 않음)
+    """
+    alter_name_collation(schema_editor, 'utf8mb4_bin')
+
+
+def use_default_collation(apps, schema_editor):
+    alter_name_collation(schema_editor, None)
+
+
+def relink_keywords(apps, schema_editor):
+    """
+    0007 이 collation 충돌로 연결하지 못하고 건너뛴 키워드를 다시 연결 (이미 있는 연결은 그대로)
+    그래도 DB 에서 찾지 못한 이름은 버리지 않고 출력
+    """
+    Interpretation = apps.get_model('dreamlens_core', 'Interpretation')
+    Keyword = apps.get_model('dreamlens_core', 'Keyword')
+    InterpretationKeyword = apps.get_model('dreamlens_core', 'InterpretationKeyword')
+
+    rows = Interpretation.objects.exclude(keywords__isnull=True).exclude(keywords='').order_by('pk')
+    last_pk = 0
+    relinked = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk).values_list('pk', 'keywords')[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        parsed = [(pk, split_keywords(raw)) for pk, raw in batch]
+        names = {name for _, row_names in parsed for name in row_names}
+        Keyword.objects.bulk_create([Keyword(name=name) for name in names], ignore_conflicts=True)
+        ids = dict(Keyword.objects.filter(name__in=names).values_list('name', 'pk'))
+        for pk, row_names in parsed:
+            unmatched = [name for name in row_names if name not in ids]
+            if unmatched:
+                print(f"\n⚠️ 해몽 {pk} 의 키워드를 Keyword 에서 찾지 못했습니다: {unmatched}")
+
+        existing = set(
+            InterpretationKeyword.objects
+            .filter(interpretation_id__in=[pk for pk, _ in batch])
+            .values_list('interpretation_id', 'keyword_id')
+        )
+        missing = [
+            InterpretationKeyword(interpretation_id=pk, keyword_id=ids[name], position=position)
+            for pk, row_names in parsed
+            for position, name in enumerate(row_names)
+            if name in ids and (pk, ids[name]) not in existing
+        ]
+        InterpretationKeyword.objects.bulk_create(missing, ignore_conflicts=True)
+        relinked += len(missing)
+
+    if relinked:
+        print(f"\n🔗 빠져 있던 해몽 키워드 연결 {relinked}개를 추가했습니다. manage.py rebuild_reports 로 리포트를 다시 집계하세요.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dreamlens_core', '0007_backfill_keywords'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_binary_collation, use_default_collation),
+        migrations.RunPython(relink_keywords, migrations.RunPython.noop),
+    ]
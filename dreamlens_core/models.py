@@ -73,6 +73,13 @@ class Interpretation(models.Model):
         null=True,
         blank=True,
     )
+    # keywords 문자열을 정규화해서 연결한 키워드 (DB 에서 키워드별로 GROUP BY 가능)
+    keyword_tags = models.ManyToManyField(
+        'Keyword',
+        through='InterpretationKeyword',
+        related_name='interpretations',
+        blank=True,
+    )
     summary = models.TextField(
         null=True,
         blank=True,
@@ -84,12 +91,55 @@ class Interpretation(models.Model):
     class Meta:
         # 데이터베이스에 표시될 순서를 최신순으로 정렬
         ordering = ['-created_at']
+        indexes = [
+            # 사용자별 최신 해몽 목록 (user + created_at 내림차순)
+            models.Index(fields=['user', '-created_at'], name='interp_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"🟦 {self.user.username}님의 해몽 요청 (ID: {self.id})"
 
 
 
+# ----------------------------------------------------------------
+# Keyword 모델
+# ----------------------------------------------------------------
+class Keyword(models.Model):
+    """
+    해몽 결과에서 뽑은 키워드 (공백/대소문자를 정규화한 이름, keywords.normalize_keyword)
+    MySQL 에서는 name 을 utf8mb4_bin 으로 비교 (마이그레이션 0008, 기본 collation 은 악센트/전각·반각을 무시)
+    """
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class InterpretationKeyword(models.Model):
+    """
+    해몽 - 키워드 연결 (해몽 하나에 같은 키워드는 한 번만)
+    """
+    interpretation = models.ForeignKey(
+        Interpretation,
+        on_delete=models.CASCADE,
+        related_name="keyword_links",
+    )
+    keyword = models.ForeignKey(
+        Keyword,
+        on_delete=models.CASCADE,
+        related_name="interpretation_links",
+    )
+    position = models.PositiveSmallIntegerField(default=0)  # 원래 keywords 문자열에서의 순서
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['interpretation', 'keyword'], name='interpretationkeyword_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.interpretation_id} - {self.keyword_id}"
+
+
 # ----------------------------------------------------------------
 # Emotion 모델
 # ----------------------------------------------------------------
@@ -180,6 +230,107 @@ class Diary(models.Model):
         verbose_name = "꿈 일기"
         verbose_name_plural = "꿈 일기 목록"
         ordering = ['-date']
+        indexes = [
+            # 달력/리포트/감정 분석이 모두 쓰는 조회 경로 (사용자 + 날짜 범위)
+            models.Index(fields=['user', 'date'], name='diary_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}님의 꿈 일기 ({self.date:%Y-%m-%d %H:%M})"
+
+
+# ----------------------------------------------------------------
+# InterpretJob 모델
+# ----------------------------------------------------------------
+class InterpretJob(models.Model):
+    """
+    백그라운드 워커(manage.py run_interpret_workers)가 처리하는 해몽 작업 큐
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_RUNNING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,  # 비로그인 사용자도 해몽 가능
+        blank=True,
+        related_name="interpret_jobs",
+    )
+    input_text = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(
+        default=timezone.now,  # 재시도 시 backoff 만큼 뒤로 미룸
+    )
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)  # 파싱된 4개 부분
+    served_from_cache = models.BooleanField(default=False)
+    interpretation = models.ForeignKey(
+        Interpretation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 워커가 다음 작업을 찾는 조회 경로
+            models.Index(fields=['status', 'run_after'], name='interpretjob_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"🟪 해몽 작업 (ID: {self.id}, 상태: {self.status}, 시도: {self.attempts})"
+
+
+# ----------------------------------------------------------------
+# MonthlyReport 모델
+# ----------------------------------------------------------------
+class MonthlyReport(models.Model):
+    """
+    (사용자, 연월) 별 분석 리포트 집계
+    - Diary 저장/삭제 시 signals.py 가 해당 달만 다시 집계 (report_builder.refresh_report)
+    - 전체 재집계: manage.py rebuild_reports
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="monthly_reports",
+    )
+    yyyymm = models.PositiveIntegerField()  # 예: 202507 (KST 기준)
+    total = models.PositiveIntegerField(default=0)  # 일기 수
+
+    # 개수 많은 순으로 정렬된 목록 (JSON 객체 키로 쓸 수 없는 None 도 담기 위해 배열로 저장)
+    dream_type_counts = models.JSONField(default=list)       # [[꿈 종류, 개수], ...]
+    emotion_counts = models.JSONField(default=list)          # [[감정 이름, 아이콘, 개수], ...]
+    keyword_counts = models.JSONField(default=list)          # [[키워드, 개수], ...]
+    emotion_keyword_counts = models.JSONField(default=dict)  # {'😊 기쁨': [[키워드, 개수], ...]}
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # 리포트 페이지는 이 유니크 인덱스로 한 행만 조회
+            models.UniqueConstraint(fields=['user', 'yyyymm'], name='monthlyreport_user_month_uniq'),
+        ]
+
+    def __str__(self):
+        return f"🟩 {self.user_id}번 사용자의 {self.yyyymm} 리포트 (일기 {self.total}개)"
@@ -0,0 +1,183 @@
+"""
+월간 분석 리포트 집계
+- 해당 월의 일기를 DB 에서 (꿈 종류, 감정) 별, (감정, 키워드) 별로 GROUP BY 한 두 쿼리로
+  꿈 종류별/감정별 개수, 키워드 클라우드, 감정별 상위 키워드를 계산 (키워드는 InterpretationKeyword 사용)
+- 집계 결과는 MonthlyReport 에 (사용자, 연월) 별로 저장해 두고 리포트 페이지는 그 한 행만 읽음
+  (Diary 가 바뀌면 signals.py 가 해당 달만 refresh_report 로 다시 집계)
+- 변경분(+1/-1)을 더하는 대신 그 (사용자, 월) 전체를 다시 집계함: 한 달 치 GROUP BY 두 번이라 충분히 싸고,
+  날짜 이동/해몽 삭제/키워드 변경이 겹쳐도 저장된 값이 실제 일기와 어긋나지 않음
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Diary, MonthlyReport
+
+# 감정별 키워드 분석에서 보여줄 상위 키워드 수
+TOP_EMOTION_KEYWORDS = 3
+
+
+def emotion_label(name, icon):
+    """감정별 키워드 분석 표에 쓰는 이름 (예: '😊 기쁨')"""
+    return f"{icon} {name}"
+
+
+def ranked(counter):
+    """개수 많은 순, 같으면 이름 순 (DB 의 GROUP BY 결과 순서와 관계없이 항상 같은 순서)"""
+    return sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+@dataclass
+class MonthlyReportData:
+    """한 달 치 리포트 집계 결과"""
+    year: int
+    month: int
+    total: int = 0
+    dream_counts: list = field(default_factory=list)       # [(꿈 종류, 개수), ...] 많은 순
+    emotion_counts: list = field(default_factory=list)     # [(감정 이름, 아이콘, 개수), ...] 많은 순
+    keyword_counts: list = field(default_factory=list)     # [(키워드, 개수), ...] 많은 순 (워드 클라우드용)
+    emotion_keywords: dict = field(default_factory=dict)   # {'😊 기쁨': [상위 키워드, ...]} 감정 이름 순
+
+    @property
+    def has_data(self):
+        return self.total > 0
+
+    @classmethod
+    def from_report(cls, report):
+        """MonthlyReport 행 -> 리포트 결과"""
+        year, month = divmod(report.yyyymm, 100)
+        return cls(
+            year=year,
+            month=month,
+            total=report.total,
+            dream_counts=[tuple(item) for item in report.dream_type_counts],
+            emotion_counts=[tuple(item) for item in report.emotion_counts],
+            keyword_counts=[tuple(item) for item in report.keyword_counts],
+            emotion_keywords={
+                label: [keyword for keyword, _ in counts[:TOP_EMOTION_KEYWORDS]]
+                for label, counts in report.emotion_keyword_counts.items()
+            },
+        )
+
+
+class ReportAccumulator:
+    """GROUP BY 결과(add_diaries/add_keywords)를 받아 리포트 집계"""
+
+    def __init__(self):
+        self.total = 0
+        self.dream_types = Counter()
+        self.emotions = Counter()                   # (이름, 아이콘) -> 개수
+        self.keywords = Counter()
+        self.emotion_keywords = defaultdict(Counter)
+
+    def add_diaries(self, dream_type, emotion_name, emotion_icon, count=1):
+        self.total += count
+        self.dream_types[dream_type] += count
+        self.emotions[(emotion_name, emotion_icon)] += count
+
+    def add_keywords(self, emotion_name, emotion_icon, keyword, count=1):
+        self.keywords[keyword] += count
+        # 감정이 없는 일기는 감정별 분석에서 제외
+        if emotion_name is not None:
+            self.emotion_keywords[emotion_label(emotion_name, emotion_icon)][keyword] += count
+
+    def counts(self):
+        """MonthlyReport 에 저장할 값 (개수 많은 순, 같으면 이름 순 / 감정별 키워드는 감정 이름 순)"""
+        return {
+            'total': self.total,
+            'dream_type_counts': [[dream_type, count] for dream_type, count in ranked(self.dream_types)],
+            'emotion_counts': [[name, icon, count] for (name, icon), count in ranked(self.emotions)],
+            'keyword_counts': [[keyword, count] for keyword, count in ranked(self.keywords)],
+            'emotion_keyword_counts': {
+                label: [[keyword, count] for keyword, count in ranked(counter)]
+                for label, counter in sorted(self.emotion_keywords.items())
+            },
+        }
+
+
+def month_range(year, month):
+    """현재 시간대(KST) 기준 [월초, 다음 달 월초)"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(year, month, 1), tz)
+    end = timezone.make_aware(datetime(year, month, 1) + relativedelta(months=1), tz)
+    return start, end
+
+
+def diary_groups(diaries, *keys):
+    """(*keys, 꿈 종류, 감정 이름, 감정 아이콘, 일기 수) - keys 는 앞에 더 묶을 필드 (예: 'user_id', 'month')"""
+    return (
+        diaries.order_by()
+        .values_list(*keys, 'dream_type__type', 'emotion__name', 'emotion__icon')
+        .annotate(count=Count('pk'))
+    )
+
+
+def keyword_groups(diaries, *keys):
+    """(*keys, 감정 이름, 감정 아이콘, 키워드, 일기 수) - 해몽/키워드가 없는 일기는 제외"""
+    return (
+        diaries.filter(interpretation__keyword_links__isnull=False).order_by()
+        .values_list(*keys, 'emotion__name', 'emotion__icon', 'interpretation__keyword_links__keyword__name')
+        .annotate(count=Count('pk'))
+    )
+
+
+def aggregate_month(user_id, year, month):
+    """해당 달의 일기를 GROUP BY 로 집계 (저장하지 않음, 일기가 없으면 키워드 쿼리는 생략)"""
+    start, end = month_range(year, month)
+    diaries = Diary.objects.filter(user_id=user_id, date__gte=start, date__lt=end)
+
+    accumulator = ReportAccumulator()
+    for row in diary_groups(diaries):
+        accumulator.add_diaries(*row)
+    if accumulator.total:
+        for emotion_name, emotion_icon, keyword, count in keyword_groups(diaries):
+            accumulator.add_keywords(emotion_name, emotion_icon, keyword, count)
+    return accumulator
+
+
+def save_report(user_id, year, month, accumulator):
+    report, _ = MonthlyReport.objects.update_or_create(
+        user_id=user_id,
+        yyyymm=year * 100 + month,
+        defaults=accumulator.counts(),
+    )
+    return report
+
+
+def refresh_report(user_id, year, month, keep_empty=True):
+    """
+    해당 달의 일기로 MonthlyReport 를 다시 집계해서 저장
+    keep_empty=False 이면 일기가 없는 달은 행을 지움 (사용자 삭제로 일기가 모두 지워진 경우 등)
+    """
+    accumulator = aggregate_month(user_id, year, month)
+    if not accumulator.total and not keep_empty:
+        MonthlyReport.objects.filter(user_id=user_id, yyyymm=year * 100 + month).delete()
+        return None
+    return save_report(user_id, year, month, accumulator)
+
+
+def refresh_reports_later(user_id, *datetimes):
+    """해당 날짜들이 속한 달의 리포트를 트랜잭션 커밋 후 다시 집계 (signals.py 에서 사용)"""
+    locals_ = (timezone.localtime(value) for value in datetimes if value is not None)
+    for year, month in {(local.year, local.month) for local in locals_}:
+        transaction.on_commit(partial(refresh_report, user_id, year, month, keep_empty=False))
+
+
+def build_report(user_id, year, month):
+    """
+    사용자의 한 달 치 리포트 (저장된 MonthlyReport 한 행 조회, 아직 없으면 집계해서 저장)
+    일기가 없는 달은 저장하지 않고 빈 리포트 (아무 달이나 열어 봐도 빈 행이 쌓이지 않도록)
+    """
+    report = MonthlyReport.objects.filter(user_id=user_id, yyyymm=year * 100 + month).first()
+    if report is None:
+        accumulator = aggregate_month(user_id, year, month)
+        if not accumulator.total:
+            return MonthlyReportData(year=year, month=month)
+        report = save_report(user_id, year, month, accumulator)
+    return MonthlyReportData.from_report(report)
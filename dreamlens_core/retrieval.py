@@ -0,0 +1,226 @@
+"""
+해몽 검색에 쓰는 파일들(Faiss 인덱스, 메타데이터, 분류 목록)을 처음 쓸 때 한 번만 읽는 레지스트리
+- import 시점에는 아무것도 읽지 않으므로 manage.py 명령/마이그레이션/테스트 시작이 느려지지 않음
+- 여러 스레드가 동시에 처음 접근해도 lock 으로 한 번만 로드
+- warmup() 으로 미리 로드 (AppConfig.ready 또는 manage.py warmup_retrieval)
+- status() 로 로드 여부/소요 시간/메모리 사용량 확인 (readiness 엔드포인트)
+- 하이브리드 검색이 켜져 있으면 꿈 텍스트 BM25 색인(lexical_index)도 함께 관리
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+from django.conf import settings
+
+INDEX_PATH = os.path.join(settings.BASE_DIR, 'vectorDB', 'dream.index')
+METADATA_PATH = os.path.join(settings.BASE_DIR, 'data', 'meta_dream.json')
+LEXICAL_INDEX_PATH = os.path.join(settings.BASE_DIR, 'vectorDB', 'dream.lexical.npz')
+
+# mmap 으로 열면 같은 서버의 워커들이 인덱스 한 벌(페이지 캐시)을 공유
+FAISS_INDEX_MMAP = getattr(settings, 'FAISS_INDEX_MMAP', False)
+
+# 검색 시점 파라미터: settings 에 없으면 인덱스 생성 시 저장한 값 사용
+FAISS_SEARCH_CONFIG = getattr(settings, 'FAISS_SEARCH', {})
+
+# 로드에 실패한 항목은 이 시간 동안 다시 시도하지 않음 (요청마다 실패를 반복하지 않도록)
+RETRY_SECONDS = 30
+
+# 하이브리드(BM25 + Faiss) 검색 설정
+HYBRID_RETRIEVAL_CONFIG = getattr(settings, 'HYBRID_RETRIEVAL', {})
+
+REQUIRED = ('index_params', 'index', 'metadata', 'categories')
+if HYBRID_RETRIEVAL_CONFIG.get('ENABLED', False):
+    REQUIRED += ('lexical_index',)
+
+_lock = threading.RLock()  # 인덱스가 index_params 를 읽는 것처럼 로더 안에서 get() 을 다시 부름
+_warmup_lock = threading.Lock()  # readiness 확인이 로딩 중인 _lock 을 기다리지 않도록 따로 둠
+_artifacts = {}
+_status = {}
+_warmup_thread = None
+
+
+class ArtifactUnavailable(RuntimeError):
+    """검색 파일을 불러오지 못했을 때"""
+
+
+def _rss_anon_kb():
+    """현재 프로세스의 익명 메모리(kB), /proc 이 없으면 None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _load_index_params():
+    from utils.faiss_helper import load_index_params
+    return load_index_params(INDEX_PATH)
+
+
+def _load_index():
+    from utils.faiss_helper import read_index
+    return read_index(INDEX_PATH, mmap=FAISS_INDEX_MMAP, params=get('index_params'))
+
+
+def _load_metadata():
+    with open(METADATA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_categories():
+    """분류 기준(대분류/소분류 목록): 원본 dream.json 전체 대신 이미 읽은 메타데이터에서 추림"""
+    main_cats, sub_cats = set(), set()
+    for item in get('metadata'):
+        main_cats.add(item.get('대분류', '').replace('"', "").strip())
+        sub_cats.add(item.get('소분류', '').strip())
+    main_cats.discard('')
+    sub_cats.discard('')
+    return {"대분류": sorted(main_cats), "소분류": sorted(sub_cats)}
+
+
+def _load_lexical_index():
+    """
+    메타데이터 '꿈' 필드의 BM25 n-gram 색인
+    저장된 파일이 같은 메타데이터(내용 해시)로 만든 것이면 읽고, 아니면 새로 만들어 저장
+    """
+    from utils.ngram_index import NgramIndex
+
+    digest = hashlib.sha256()
+    with open(METADATA_PATH, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    version = digest.hexdigest()[:16]
+
+    if os.path.exists(LEXICAL_INDEX_PATH):
+        try:
+            index = NgramIndex.load(LEXICAL_INDEX_PATH)
+            if index.version == version:
+                return index
+        except Exception as e:
+            print(f"⚠️ BM25 색인 파일을 읽지 못했습니다 ({e}). 새로 만듭니다.")
+
+    index = NgramIndex.build(get('metadata'), {'꿈': 1.0}, version)
+    try:
+        temp_path = f"{LEXICAL_INDEX_PATH}.{os.getpid()}.tmp.npz"
+        index.save(temp_path)
+        os.replace(temp_path, LEXICAL_INDEX_PATH)
+    except OSError as e:
+        print(f"⚠️ BM25 색인 파일을 저장하지 못했습니다 ({e}).")
+    return index
+
+
+LOADERS = {
+    'index_params': _load_index_params,
+    'index': _load_index,
+    'metadata': _load_metadata,
+    'categories': _load_categories,
+    'lexical_index': _load_lexical_index,
+}
+
+
+def get(name):
+    """항목을 (필요하면 로드해서) 반환, 실패하면 ArtifactUnavailable"""
+    try:
+        return _artifacts[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name in _artifacts:
+            return _artifacts[name]
+
+        failed = _status.get(name, {})
+        if failed.get('error') and time.monotonic() - failed['failed_at'] < RETRY_SECONDS:
+            raise ArtifactUnavailable(f"{name}: {failed['error']}")
+
+        started = time.monotonic()
+        rss_before = _rss_anon_kb()
+        try:
+            value = LOADERS[name]()
+        except ArtifactUnavailable:
+            raise
+        except Exception as e:
+            print(f"⚠️ 경고: {name} 로딩 중 오류 발생 ({e}). 해몽 기능이 정상 작동하지 않을 수 있습니다.")
+            _status[name] = {'loaded': False, 'error': str(e), 'failed_at': time.monotonic()}
+            raise ArtifactUnavailable(f"{name}: {e}") from e
+
+        rss_after = _rss_anon_kb()
+        _status[name] = {
+            'loaded': True,
+            'seconds': round(time.monotonic() - started, 3),
+            # 로드 전후 익명 메모리 증가량 (다른 스레드 할당이 섞일 수 있는 근사치, mmap 인덱스는 거의 0)
+            'memory_mb': round((rss_after - rss_before) / 1024, 1) if rss_before is not None else None,
+        }
+        _artifacts[name] = value
+        print(f"✅ {name} 로드 완료 ({_status[name]['seconds']}s)")
+        return value
+
+
+def search(query_vector, k, nprobe=None, ef_search=None):
+    """인덱스 검색: (distances, indices)"""
+    from utils.faiss_helper import make_search_params
+
+    index = get('index')
+    index_params = get('index_params')
+    params = make_search_params(
+        index,
+        nprobe or FAISS_SEARCH_CONFIG.get('NPROBE') or index_params.get('nprobe'),
+        ef_search or FAISS_SEARCH_CONFIG.get('EF_SEARCH') or index_params.get('efSearch'),
+    )
+    if params is None:
+        return index.search(query_vector, k)
+    return index.search(query_vector, k, params=params)
+
+
+def lexical_search(text, k):
+    """꿈 텍스트 BM25 검색: 점수 순 (메타데이터 위치, 점수) 목록"""
+    return get('lexical_index').search(text, limit=k)
+
+
+def is_ready():
+    """해몽에 필요한 항목을 모두 로드할 수 있으면 True (아직 안 읽었으면 지금 읽음)"""
+    try:
+        for name in REQUIRED:
+            get(name)
+    except ArtifactUnavailable:
+        return False
+    return True
+
+
+def warmup(background=False):
+    """모든 항목을 미리 로드, background=True 면 데몬 스레드에서 (한 번만 시작)"""
+    global _warmup_thread
+    if not background:
+        return is_ready()
+
+    with _warmup_lock:
+        if _warmup_thread is None or (not _warmup_thread.is_alive() and not is_loaded()):
+            _warmup_thread = threading.Thread(target=is_ready, name='retrieval-warmup', daemon=True)
+            _warmup_thread.start()
+    return is_loaded()
+
+
+def is_loaded():
+    """로드를 시도하지 않고, 이미 모두 로드되었는지만 확인"""
+    return all(name in _artifacts for name in REQUIRED)
+
+
+def status():
+    """항목별 로드 여부, 소요 시간(초), 메모리 증가량(MB), 오류"""
+    result = {}
+    for name in REQUIRED:
+        info = {key: value for key, value in _status.get(name, {'loaded': False}).items() if key != 'failed_at'}
+        if name == 'index' and name in _artifacts:
+            index = _artifacts[name]
+            info.update({'ntotal': index.ntotal, 'dim': index.d, 'mmap': FAISS_INDEX_MMAP})
+        if name == 'metadata' and name in _artifacts:
+            info['count'] = len(_artifacts[name])
+        if name == 'lexical_index' and name in _artifacts:
+            info['ngrams'] = len(_artifacts[name].vocab)
+        result[name] = info
+    return result
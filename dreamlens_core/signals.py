@@ -0,0 +1,57 @@
+"""
+모델 변경에 따른 캐시 무효화 / 월간 리포트 갱신
+- Diary 저장/삭제 → 일기장 달력(diary_calendar) 의 해당 달 캐시 삭제,
+  월간 리포트(MonthlyReport) 의 해당 달 재집계 (날짜를 옮긴 경우 이전 달도)
+- Interpretation 삭제 → 연결된 일기의 제목/키워드가 비므로 위와 같이 처리
+- QuerySet.update()/bulk_create() 는 signal 을 보내지 않으므로 그 뒤에는 manage.py rebuild_reports 로 재집계
+"""
+from collections import defaultdict
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from . import diary_calendar
+from . import report_builder
+from .models import Diary, Interpretation, User
+
+
+def deleted_with_user(origin):
+    """사용자 삭제에 딸려 지워지는 중인지 (그 사용자의 MonthlyReport 도 함께 지워지므로 재집계 불필요)"""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is User
+
+
+@receiver(post_init, sender=Diary)
+def remember_diary_date(sender, instance, **kwargs):
+    # 수정 전 날짜 (values()/only() 로 date 가 빠진 경우에는 기록하지 않음)
+    instance._loaded_date = instance.__dict__.get('date')
+
+
+@receiver(post_save, sender=Diary)
+def invalidate_diary_month_on_save(sender, instance, **kwargs):
+    loaded_date = getattr(instance, '_loaded_date', None)
+    diary_calendar.invalidate(instance.user_id, instance.date, loaded_date)
+    report_builder.refresh_reports_later(instance.user_id, instance.date, loaded_date)
+    instance._loaded_date = instance.date
+
+
+@receiver(post_delete, sender=Diary)
+def invalidate_diary_month_on_delete(sender, instance, origin=None, **kwargs):
+    loaded_date = getattr(instance, '_loaded_date', None)
+    diary_calendar.invalidate(instance.user_id, instance.date, loaded_date)
+    if not deleted_with_user(origin):
+        report_builder.refresh_reports_later(instance.user_id, instance.date, loaded_date)
+
+
+@receiver(pre_delete, sender=Interpretation)
+def invalidate_diary_month_on_interpretation_delete(sender, instance, origin=None, **kwargs):
+    if deleted_with_user(origin):
+        return
+    dates = defaultdict(list)
+    for user_id, date in instance.diary_entries.values_list('user_id', 'date'):
+        dates[user_id].append(date)
+    for user_id, user_dates in dates.items():
+        diary_calendar.invalidate(user_id, *user_dates)
+        # 커밋 후(일기의 해몽 연결이 끊긴 뒤) 재집계
+        report_builder.refresh_reports_later(user_id, *user_dates)
@@ -0,0 +1,57 @@
+// ========================
+// 입력창 자동완성 (꿈 사전 자동완성 API + <datalist>)
+// 입력이 멈춘 뒤 delay(ms) 가 지나야 요청하고, 같은 접두어 결과는 다시 요청하지 않음
+// ========================
+function attachAutocomplete(input, url, options = {}) {
+    if (!input || !url || !window.fetch) return;
+
+    const delay = options.delay ?? 150;
+    const limit = options.limit ?? 8;
+    const list = document.createElement("datalist");
+    list.id = `${input.name || input.id}-suggestions`;
+    input.setAttribute("list", list.id);
+    input.setAttribute("autocomplete", "off");
+    input.after(list);
+
+    const cache = new Map();
+    let timer = null;
+    let latest = "";
+
+    function render(suggestions) {
+        list.replaceChildren(...suggestions.map(item => new Option(item.term)));
+    }
+
+    async function load(prefix) {
+        if (!cache.has(prefix)) {
+            const params = new URLSearchParams({ q: prefix, limit });
+            if (options.kind) params.set("kind", options.kind);
+            const promise = fetch(`${url}?${params}`, { headers: { "Accept": "application/json" } })
+                .then(response => {
+                    if (!response.ok) throw new Error(`자동완성 요청 실패 (${response.status})`);
+                    return response.json();
+                })
+                .then(data => data.suggestions);
+            cache.set(prefix, promise);
+            promise.catch(() => cache.delete(prefix));
+        }
+        return cache.get(prefix);
+    }
+
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        latest = prefix;
+        if (!prefix) {
+            render([]);
+            return;
+        }
+        timer = setTimeout(async () => {
+            try {
+                const suggestions = await load(prefix);
+                if (prefix === latest) render(suggestions);  // 늦게 도착한 이전 응답은 무시
+            } catch (e) {
+                render([]);
+            }
+        }, delay);
+    });
+}
@@ -1,10 +1,19 @@
 document.addEventListener("DOMContentLoaded", function () {
     const form = document.getElementById("dream-form");
     const btn = document.getElementById("combine-btn");
+    const resultBlock = document.getElementById("result-block");
+    const summaryBox = document.getElementById("summary-box");
+    const interpretationEl = document.getElementById("interpretation");
+    const summaryEl = document.getElementById("summary");
 
-    form.addEventListener("submit", function () {
-        btn.disabled = true;
+    // 키워드 입력창 자동완성 (사전에 있는 소분류/키워드로 유도)
+    if (typeof attachAutocomplete !== "undefined") {
+        ["kw1", "kw2", "kw3"].forEach(name => {
+            attachAutocomplete(form.elements[name], form.dataset.autocompleteUrl, { kind: "subcategory,keyword" });
+        });
+    }
 
+    function showLoading() {
         const loadingDiv = document.createElement("div");
         loadingDiv.id = "loading-message";
         loadingDiv.innerText = "🔄 해몽 중입니다...";
@@ -12,5 +21,49 @@ document.addEventListener("DOMContentLoaded", function () {
         loadingDiv.style.color = "#555";
 
         form.parentNode.insertBefore(loadingDiv, form.nextSibling);
+        return loadingDiv;
+    }
+
+    form.addEventListener("submit", function (e) {
+        btn.disabled = true;
+        const loadingDiv = showLoading();
+
+        // 스트리밍 미지원 브라우저는 기존처럼 전체 제출
+        if (typeof supportsEventStream === "undefined" || !supportsEventStream()) return;
+
+        e.preventDefault();
+        resultBlock.style.display = "none";
+        summaryBox.style.display = "none";
+        interpretationEl.textContent = "";
+        summaryEl.textContent = "";
+
+        let streamError = false;
+        postEventStream(form.dataset.streamUrl, new FormData(form), (event, data) => {
+            if (event === "section") {
+                loadingDiv.remove();
+                const box = data.section === "summary" ? summaryBox : resultBlock;
+                const target = data.section === "summary" ? summaryEl : interpretationEl;
+                box.style.display = "";
+                target.textContent += data.delta;
+            } else if (event === "done") {
+                interpretationEl.textContent = data.interpretation;
+                summaryEl.textContent = data.summary;
+                resultBlock.style.display = data.interpretation ? "" : "none";
+                summaryBox.style.display = data.summary ? "" : "none";
+            } else if (event === "error") {
+                streamError = true;
+                alert(data.message);
+            }
+        }).catch((error) => {
+            // 스트림이 열리기 전 실패만 일반 제출로 재시도 (열린 뒤에는 LLM 을 두 번 호출하게 됨)
+            if (error.beforeStream) {
+                form.submit();
+            } else if (!streamError) {
+                alert("해몽 중 연결이 끊어졌습니다. 잠시 후 다시 시도해주세요.");
+            }
+        }).finally(() => {
+            loadingDiv.remove();
+            btn.disabled = false;
+        });
     });
 });
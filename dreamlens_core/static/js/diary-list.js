@@ -17,81 +17,88 @@ document.addEventListener('DOMContentLoaded', function () {
     const popupDate = document.getElementById('popup-date');
     const popupText = document.getElementById('popup-text');
 
-    // 날짜 셀 클릭 이벤트 등록
-    document.querySelectorAll('.calendar td[data-day]').forEach(td => {
-        td.addEventListener('click', function () {
-            const day = parseInt(this.dataset.day);
-            const entries = entriesByDay[day] || [];
-
-            // 날짜 업데이트
-            popupDate.textContent = `${day}일`;
-
-            // 팝업 내용 구성
-            if (entries.length === 0) {
-                popupText.innerHTML = `
-                    <div class="popup-empty">
-                        <div class="popup-empty-icon">😴</div>
-                        <p>이 날에는 기록된 꿈이 없습니다.</p>
-                        <p>새로운 꿈을 해몽해보세요!</p>
-                    </div>
-                `;
-            } else {
-                const listItems = entries.map(entry => {
-                    const detailUrl = window.diaryDetailUrlTemplate.replace('0', entry.pk);
-
-                    // result가 없을 경우 빈 문자열로 처리
-                    let shortResult = entry.result || '';
-                    if (shortResult.length > 80) {
-                        shortResult = shortResult.substring(0, 80) + '...';
-                    }
+    const main = document.querySelector('.diary-main');
+    const tbody = document.querySelector('.calendar tbody');
+    const monthLabel = document.getElementById('month-label');
+    const prevLink = document.getElementById('prev-month');
+    const nextLink = document.getElementById('next-month');
 
-                    // 감정에 따른 이모지
-                    let emotionEmoji = '💭';
-                    if (entry.emotion) {
-                        if (entry.emotion.includes('기쁨') || entry.emotion.includes('행복') || entry.emotion.includes('좋')) {
-                            emotionEmoji = '😊';
-                        } else if (entry.emotion.includes('슬픔') || entry.emotion.includes('우울') || entry.emotion.includes('나쁜')) {
-                            emotionEmoji = '😢';
-                        } else if (entry.emotion.includes('무서움') || entry.emotion.includes('두려움')) {
-                            emotionEmoji = '😨';
-                        } else if (entry.emotion.includes('화남') || entry.emotion.includes('분노')) {
-                            emotionEmoji = '😠';
-                        } else if (entry.emotion.includes('놀람')) {
-                            emotionEmoji = '😲';
-                        } else {
-                            emotionEmoji = '😐';
-                        }
-                    }
+    // 날짜 셀 클릭 → 그날의 일기 목록 팝업 (달이 바뀌어도 동작하도록 tbody 에 위임)
+    tbody.addEventListener('click', function (e) {
+        const td = e.target.closest('td[data-day]');
+        if (!td) return;
+
+        const day = parseInt(td.dataset.day);
+        const entries = entriesByDay[day] || [];
+
+        // 날짜 업데이트
+        popupDate.textContent = `${day}일`;
+
+        // 팝업 내용 구성
+        if (entries.length === 0) {
+            popupText.innerHTML = `
+                <div class="popup-empty">
+                    <div class="popup-empty-icon">😴</div>
+                    <p>이 날에는 기록된 꿈이 없습니다.</p>
+                    <p>새로운 꿈을 해몽해보세요!</p>
+                </div>
+            `;
+        } else {
+            const listItems = entries.map(entry => {
+                const detailUrl = window.diaryDetailUrlTemplate.replace('0', entry.pk);
 
-                    return `
-                        <li>
-                            <a href="${detailUrl}">
-                                <div class="entry-info">
-                                    <div class="entry-header">
-                                        <span class="entry-emotion">${emotionEmoji}</span>
-                                        <span class="entry-type">${entry.dream_type || '꿈'}</span>
-                                    </div>
-                                    <div class="entry-content">${shortResult}</div>
-                                    <div class="entry-preview">
-                                        ${entry.title   
-                                            ? (entry.title.length > 30 
-                                                ? entry.title.substring(0, 30) + '···' 
-                                                : entry.title)
-                                            : '(내용 없음)'}
-                                    </div>
+                // result가 없을 경우 빈 문자열로 처리
+                let shortResult = entry.result || '';
+                if (shortResult.length > 80) {
+                    shortResult = shortResult.substring(0, 80) + '...';
+                }
 
+                // 감정에 따른 이모지
+                let emotionEmoji = '💭';
+                if (entry.emotion) {
+                    if (entry.emotion.includes('기쁨') || entry.emotion.includes('행복') || entry.emotion.includes('좋')) {
+                        emotionEmoji = '😊';
+                    } else if (entry.emotion.includes('슬픔') || entry.emotion.includes('우울') || entry.emotion.includes('나쁜')) {
+                        emotionEmoji = '😢';
+                    } else if (entry.emotion.includes('무서움') || entry.emotion.includes('두려움')) {
+                        emotionEmoji = '😨';
+                    } else if (entry.emotion.includes('화남') || entry.emotion.includes('분노')) {
+                        emotionEmoji = '😠';
+                    } else if (entry.emotion.includes('놀람')) {
+                        emotionEmoji = '😲';
+                    } else {
+                        emotionEmoji = '😐';
+                    }
+                }
+
+                return `
+                    <li>
+                        <a href="${detailUrl}">
+                            <div class="entry-info">
+                                <div class="entry-header">
+                                    <span class="entry-emotion">${emotionEmoji}</span>
+                                    <span class="entry-type">${entry.dream_type || '꿈'}</span>
+                                </div>
+                                <div class="entry-content">${shortResult}</div>
+                                <div class="entry-preview">
+                                    ${entry.title   
+                                        ? (entry.title.length > 30 
+                                            ? entry.title.substring(0, 30) + '···' 
+                                            : entry.title)
+                                        : '(내용 없음)'}
                                 </div>
-                            </a>
-                        </li>
-                    `;
-                }).join('');
 
-                popupText.innerHTML = `<ul class="popup-list">${listItems}</ul>`;
-            }
+                            </div>
+                        </a>
+                    </li>
+                `;
+            }).join('');
 
-            // 팝업 표시
-            showPopup();
-        });
+            popupText.innerHTML = `<ul class="popup-list">${listItems}</ul>`;
+        }
+
+        // 팝업 표시
+        showPopup();
     });
 
     // 팝업 표시 함수
@@ -128,35 +135,134 @@ document.addEventListener('DOMContentLoaded', function () {
         }
     });
 
-    // 터치 디바이스에서 눌렀을 때 효과
-    if ('ontouchstart' in window) {
+    // 날짜 셀 터치/호버 효과 (달을 새로 그릴 때마다 다시 등록)
+    function bindCellEffects() {
+        // 터치 디바이스에서 눌렀을 때 효과
+        if ('ontouchstart' in window) {
+            document.querySelectorAll('.calendar td[data-day]').forEach(td => {
+                td.addEventListener('touchstart', function () {
+                    this.style.transform = 'translateY(-2px)';
+                });
+
+                td.addEventListener('touchend', function () {
+                    setTimeout(() => {
+                        this.style.transform = '';
+                    }, 150);
+                });
+            });
+        }
+
+        // 데스크톱 호버 효과
         document.querySelectorAll('.calendar td[data-day]').forEach(td => {
-            td.addEventListener('touchstart', function () {
-                this.style.transform = 'translateY(-2px)';
+            td.addEventListener('mouseenter', function () {
+                if (window.innerWidth > 768) {
+                    this.style.transform = 'translateY(-2px) scale(1.02)';
+                    this.style.zIndex = '10';
+                }
             });
 
-            td.addEventListener('touchend', function () {
-                setTimeout(() => {
+            td.addEventListener('mouseleave', function () {
+                if (window.innerWidth > 768) {
                     this.style.transform = '';
-                }, 150);
+                    this.style.zIndex = '';
+                }
             });
         });
     }
+    bindCellEffects();
 
-    // 데스크톱 호버 효과
-    document.querySelectorAll('.calendar td[data-day]').forEach(td => {
-        td.addEventListener('mouseenter', function () {
-            if (window.innerWidth > 768) {
-                this.style.transform = 'translateY(-2px) scale(1.02)';
-                this.style.zIndex = '10';
-            }
-        });
+    // ========================
+    // 이전/다음 달 이동: 페이지를 다시 불러오지 않고 달력 API 로 다시 그림
+    // 앞뒤 달은 미리 가져와 두고, 한 번 가져온 달은 다시 요청하지 않음
+    // ========================
+    if (!window.fetch || !main.dataset.monthUrl) return;
+
+    const months = new Map();
+
+    function monthUrl(yyyymm) {
+        return main.dataset.monthUrl.replace('/0/', `/${yyyymm}/`);
+    }
 
-        td.addEventListener('mouseleave', function () {
-            if (window.innerWidth > 768) {
-                this.style.transform = '';
-                this.style.zIndex = '';
-            }
+    function listUrl(yyyymm) {
+        return main.dataset.listUrl.replace(/0$/, yyyymm);
+    }
+
+    function fetchMonth(yyyymm) {
+        if (!months.has(yyyymm)) {
+            const promise = fetch(monthUrl(yyyymm), { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+                .then(response => {
+                    if (!response.ok) throw new Error(`달력 요청 실패 (${response.status})`);
+                    return response.json();
+                });
+            months.set(yyyymm, promise);
+            promise.catch(() => months.delete(yyyymm));
+        }
+        return months.get(yyyymm);
+    }
+
+    function prefetchAdjacent(data) {
+        [data.prev_yyyymm, data.next_yyyymm].forEach(yyyymm => fetchMonth(yyyymm).catch(() => {}));
+    }
+
+    function renderMonth(data) {
+        main.dataset.yyyymm = data.yyyymm;
+        monthLabel.textContent = `${data.year}년 ${data.month}월`;
+        prevLink.href = listUrl(data.prev_yyyymm);
+        prevLink.dataset.yyyymm = data.prev_yyyymm;
+        nextLink.href = listUrl(data.next_yyyymm);
+        nextLink.dataset.yyyymm = data.next_yyyymm;
+
+        tbody.replaceChildren(...data.month_days.map(week => {
+            const tr = document.createElement('tr');
+            week.forEach(cell => {
+                const td = document.createElement('td');
+                if (!cell.day) {
+                    td.className = 'empty';
+                } else {
+                    if (cell.day === data.today_day) td.classList.add('today');
+                    if (cell.is_good) td.classList.add('good');
+                    else if (cell.is_bad) td.classList.add('bad');
+                    else if (cell.is_normal) td.classList.add('normal');
+                    td.dataset.day = cell.day;
+                    const span = document.createElement('span');
+                    span.textContent = cell.day;
+                    td.append(span);
+                }
+                tr.append(td);
+            });
+            return tr;
+        }));
+
+        entriesByDay = data.entries_by_day;
+        bindCellEffects();
+        prefetchAdjacent(data);
+    }
+
+    async function goToMonth(yyyymm, push) {
+        const data = await fetchMonth(yyyymm);
+        renderMonth(data);
+        if (push) history.pushState({ yyyymm }, '', listUrl(yyyymm));
+    }
+
+    [prevLink, nextLink].forEach(link => {
+        link.addEventListener('click', function (e) {
+            e.preventDefault();
+            goToMonth(Number(this.dataset.yyyymm), true).catch(() => {
+                window.location.href = this.href;
+            });
         });
     });
+
+    // 뒤로/앞으로 가기
+    history.replaceState({ yyyymm: Number(main.dataset.yyyymm) }, '');
+    window.addEventListener('popstate', e => {
+        if (e.state && e.state.yyyymm) {
+            goToMonth(e.state.yyyymm, false).catch(() => window.location.reload());
+        }
+    });
+
+    prefetchAdjacent({
+        prev_yyyymm: Number(prevLink.dataset.yyyymm),
+        next_yyyymm: Number(nextLink.dataset.yyyymm),
+    });
 });
@@ -1,21 +1,176 @@
 document.addEventListener('DOMContentLoaded', () => {
     const form = document.getElementById('dict-form');
+    const searchForm = document.getElementById('search-form');
+    const searchInput = document.getElementById('search-query');
     const category = document.getElementById('category');
     const subcat = document.getElementById('subcategory');
+    const tbody = document.querySelector('#result-table tbody');
+    const resultCount = document.getElementById('result-count');
+    const loadMore = document.getElementById('load-more');
+    const pageSize = Number(form.dataset.pageSize) || 50;
 
-    // 대분류 변경 시 → 소분류 활성화 & 폼 제출
-    category.addEventListener('change', () => {
-        if (category.value) {
-            subcat.disabled = false;
-        } else {
+    // 검색창 자동완성 (꿈 제목/소분류/키워드)
+    if (typeof attachAutocomplete !== "undefined") {
+        attachAutocomplete(searchInput, searchForm.dataset.autocompleteUrl);
+    }
+
+    // fetch 를 못 쓰는 브라우저는 기존처럼 폼 제출
+    if (!window.fetch) {
+        category.addEventListener('change', () => {
             subcat.value = '';
-            subcat.disabled = true;
+            subcat.disabled = !category.value;
+            form.submit();
+        });
+        subcat.addEventListener('change', () => form.submit());
+        return;
+    }
+
+    // 검색어가 있으면 더 보기가 검색 결과의 다음 페이지를 가져옴
+    let query = searchInput.value.trim();
+
+    // 같은 요청은 다시 보내지 않음 (새로고침 후에는 브라우저가 ETag 로 재검증 → 304)
+    const responses = new Map();
+
+    async function getJSON(url, params) {
+        const key = `${url}?${new URLSearchParams(params)}`;
+        if (!responses.has(key)) {
+            const promise = fetch(key, { headers: { 'Accept': 'application/json' } })
+                .then(response => {
+                    if (!response.ok) throw new Error(`요청 실패 (${response.status})`);
+                    return response.json();
+                });
+            responses.set(key, promise);
+            promise.catch(() => responses.delete(key));
+        }
+        return responses.get(key);
+    }
+
+    function updateUrl() {
+        const params = new URLSearchParams();
+        if (query) params.set('q', query);
+        if (category.value) params.set('category', category.value);
+        if (subcat.value) params.set('subcategory', subcat.value);
+        const qs = params.toString();
+        history.replaceState(null, '', qs ? `?${qs}` : location.pathname);
+    }
+
+    function showMessage(text) {
+        tbody.innerHTML = '';
+        const row = tbody.insertRow();
+        const cell = row.insertCell();
+        cell.colSpan = 2;
+        cell.className = 'p-4 text-center text-gray-500';
+        cell.textContent = text;
+        resultCount.hidden = true;
+        loadMore.hidden = true;
+    }
+
+    // 하이라이트 위치([시작, 끝))만 <mark> 로 감싸고 나머지는 텍스트 노드로 (innerHTML 미사용)
+    function fillHighlighted(cell, text, spans) {
+        let position = 0;
+        (spans || []).forEach(([start, end]) => {
+            if (start > position) cell.append(text.slice(position, start));
+            const mark = document.createElement('mark');
+            mark.textContent = text.slice(start, end);
+            cell.append(mark);
+            position = end;
+        });
+        cell.append(text.slice(position));
+    }
+
+    function appendItems(items) {
+        items.forEach(item => {
+            const row = tbody.insertRow();
+            row.className = 'border-t';
+            ['꿈', '해몽'].forEach(field => {
+                const cell = row.insertCell();
+                cell.className = 'py-2 px-3';
+                fillHighlighted(cell, item[field] || '', item.highlights && item.highlights[field]);
+            });
+        });
+    }
+
+    async function loadItems(page) {
+        const data = query
+            ? await getJSON(searchForm.dataset.searchUrl, { q: query, page, size: pageSize })
+            : await getJSON(form.dataset.itemsUrl, {
+                category: category.value,
+                subcategory: subcat.value,
+                page,
+                size: pageSize,
+            });
+        if (page === 1) {
+            tbody.innerHTML = '';
+            if (!data.items.length) {
+                showMessage(query ? '검색 결과가 없습니다.' : '조건에 맞는 항목이 없습니다.');
+                return;
+            }
+        }
+        appendItems(data.items);
+        resultCount.textContent = `${data.total}개 결과`;
+        resultCount.hidden = false;
+        loadMore.dataset.nextPage = page + 1;
+        loadMore.hidden = !data.has_next;
+    }
+
+    // 검색 → 검색어로 첫 페이지를 가져옴 (분류 선택은 해제)
+    searchForm.addEventListener('submit', async event => {
+        event.preventDefault();
+        query = searchInput.value.trim();
+        category.value = '';
+        subcat.innerHTML = '<option value="">--선택--</option>';
+        subcat.disabled = true;
+        updateUrl();
+        if (!query) {
+            showMessage('대분류와 소분류를 선택해주세요.');
+            return;
+        }
+        try {
+            await loadItems(1);
+        } catch (e) {
+            searchForm.submit();
+        }
+    });
+
+    // 대분류 변경 시 → 소분류 목록만 가져옴
+    category.addEventListener('change', async () => {
+        query = '';
+        searchInput.value = '';
+        subcat.innerHTML = '<option value="">--선택--</option>';
+        subcat.disabled = !category.value;
+        showMessage('대분류와 소분류를 선택해주세요.');
+        updateUrl();
+        if (!category.value) return;
+
+        try {
+            const data = await getJSON(form.dataset.subcategoriesUrl, { category: category.value });
+            data.subcategories.forEach(sub => subcat.add(new Option(sub.name, sub.name)));
+        } catch (e) {
+            form.submit();
         }
-        form.submit();
     });
 
-    // 소분류 변경 시 → 폼 제출
-    subcat.addEventListener('change', () => {
-        form.submit();
+    // 소분류 변경 시 → 첫 페이지 항목만 가져옴
+    subcat.addEventListener('change', async () => {
+        updateUrl();
+        if (!subcat.value) {
+            showMessage('대분류와 소분류를 선택해주세요.');
+            return;
+        }
+        try {
+            await loadItems(1);
+        } catch (e) {
+            form.submit();
+        }
+    });
+
+    // 더 보기 → 다음 페이지를 이어 붙임
+    loadMore.addEventListener('click', async () => {
+        loadMore.disabled = true;
+        try {
+            await loadItems(Number(loadMore.dataset.nextPage));
+        } finally {
+            loadMore.disabled = false;
+        }
     });
 });
@@ -355,6 +355,104 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // ========================
+    // 월별 추이 차트
+    // ========================
+    const trendCard = document.getElementById("trendCard");
+    const trendCanvas = document.getElementById("trendChart");
+    const trendNote = document.getElementById("trendNote");
+    const trendCache = new Map();   // 개월 수 -> 응답 (같은 범위를 다시 누르면 재사용)
+    let trendChart = null;
+    let trendMonths = 12;
+    let trendKind = "dream_types";
+
+    // 응답의 {labels, series} -> Chart.js datasets
+    function trendDatasets(data) {
+        const group = data[trendKind];
+        return group.labels.map((label, i) => {
+            let name = label ?? "미분류";
+            let color = pastelColors[i % pastelColors.length];
+            if (trendKind === "dream_types") {
+                name = dreamLabelMap[label] || name;
+                color = dreamColorMap[name] || "#ccc";
+            } else if (trendKind === "emotions") {
+                name = `${group.icons[i] || '💭'} ${name}`;
+            } else {
+                color = vividColors[i % vividColors.length];
+            }
+            return { label: name, data: group.series[i], backgroundColor: color, borderColor: color, tension: 0.3 };
+        });
+    }
+
+    function renderTrend(data) {
+        if (trendChart) {
+            trendChart.destroy();
+        }
+        // 꿈 종류/감정은 월별 누적 막대, 키워드는 (한 일기에 여러 개라 누적하지 않고) 선 그래프
+        const stacked = trendKind !== "keywords";
+        trendChart = new Chart(trendCanvas.getContext("2d"), {
+            type: stacked ? "bar" : "line",
+            data: { labels: data.labels, datasets: trendDatasets(data) },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                scales: {
+                    x: { stacked },
+                    y: { stacked, beginAtZero: true, ticks: { precision: 0 } }
+                },
+                plugins: {
+                    legend: {
+                        position: "bottom",
+                        labels: { font: { size: 13, family: "'Noto Sans KR', sans-serif" } }
+                    }
+                }
+            }
+        });
+
+        const total = data.totals.reduce((sum, count) => sum + count, 0);
+        const notes = [`기록한 꿈 ${total}개`];
+        if (data.bucket_months > 1) notes.push(`${data.bucket_months}개월씩 묶어서 표시`);
+        if (data.truncated) notes.push("최근 기간만 표시");
+        trendNote.textContent = notes.join(" · ");
+        console.log('📈 월별 추이 차트 생성 완료:', data.start, '~', data.end);
+    }
+
+    async function loadTrend() {
+        let data = trendCache.get(trendMonths);
+        if (!data) {
+            try {
+                const response = await fetch(`${trendCard.dataset.trendUrl}?months=${trendMonths}`, {
+                    headers: { "Accept": "application/json" }
+                });
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                data = await response.json();
+                trendCache.set(trendMonths, data);
+            } catch (error) {
+                console.error('❌ 월별 추이 불러오기 오류:', error);
+                trendNote.textContent = "월별 추이를 불러오지 못했습니다.";
+                return;
+            }
+        }
+        renderTrend(data);
+    }
+
+    if (trendCard && trendCanvas) {
+        trendCard.querySelectorAll(".trend-btn").forEach(button => {
+            button.addEventListener("click", () => {
+                const key = button.dataset.months ? "months" : "kind";
+                trendCard.querySelectorAll(`.trend-btn[data-${key}]`).forEach(b => b.classList.remove("active"));
+                button.classList.add("active");
+                if (button.dataset.months) {
+                    trendMonths = Number(button.dataset.months);
+                } else {
+                    trendKind = button.dataset.kind;
+                }
+                loadTrend();
+            });
+        });
+        loadTrend();
+    }
+
     // ========================
     // 초기 설명 문구 설정
     // ========================
@@ -0,0 +1,58 @@
+// ========================
+// POST 요청의 Server-Sent Events 응답 읽기
+// (EventSource는 GET만 지원하므로 fetch + ReadableStream으로 직접 파싱)
+// ========================
+function supportsEventStream() {
+    return !!(window.fetch && window.ReadableStream && window.TextDecoder);
+}
+
+// 스트림이 열리기 전(네트워크 오류, 200 이 아닌 응답)에 실패하면 error.beforeStream = true
+// -> 서버가 아직 LLM 을 호출하지 않았으므로 일반 제출로 다시 시도해도 됨
+// 스트림이 열린 뒤 실패하면 이미 과금된 요청이므로 다시 제출하지 말 것
+function streamNotOpened(error) {
+    error.beforeStream = true;
+    return error;
+}
+
+async function postEventStream(url, formData, onEvent) {
+    let response;
+    try {
+        response = await fetch(url, {
+            method: "POST",
+            body: formData,
+            headers: { "Accept": "text/event-stream" },
+        });
+    } catch (error) {
+        throw streamNotOpened(error);
+    }
+    if (!response.ok || !response.body) {
+        throw streamNotOpened(new Error(`스트리밍 요청 실패 (${response.status})`));
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder("utf-8");
+    let buffer = "";
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // 이벤트는 빈 줄(\n\n)로 구분
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventName = "message";
+            const dataLines = [];
+            rawEvent.split("\n").forEach(line => {
+                if (line.startsWith("event:")) eventName = line.slice(6).trim();
+                else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+            });
+            if (dataLines.length) {
+                onEvent(eventName, JSON.parse(dataLines.join("\n")));
+            }
+        }
+    }
+}
@@ -1,3 +1,1243 @@
-from django.test import TestCase
+import os
+import sys
+import json
+import importlib
+import shutil
+import tempfile
+import subprocess
+from inspect import iscoroutinefunction
+from io import StringIO
+from unittest import mock, skipUnless
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
 
-# Create your tests here.
+import faiss
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import F
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analytics, jobs, trend_report, views
+from . import dictionary as dictionary_module
+from .dictionary import DreamDictionary, load_or_build_search_index
+from .keywords import split_keywords, most_common_keywords
+from .models import (
+    User, Interpretation, Diary, DreamType, Emotion, MonthlyReport, Keyword, InterpretationKeyword, InterpretJob,
+)
+from .report_builder import refresh_report
+from .views import save_interpretation
+from utils import faiss_helper
+from utils.combine_cache import CombineCache, make_key, normalize_keywords
+from utils.embedding_cache import EmbeddingCache, make_key as make_embedding_key
+from utils.knn_classifier import classify_neighbors, format_classification, parse_classification
+from utils.ngram_index import NgramIndex, find_highlights, ngrams
+from utils.prefix_index import PrefixIndex, normalize
+from utils.prompt_builder import candidate_categories, count_tokens, fit_references, truncate_tokens
+from utils.rank_fusion import reciprocal_rank_fusion
+from utils.semantic_cache import SemanticCache
+from utils.stream_parser import SectionStreamParser
+
+
+class DiaryTestCase(TestCase):
+    """로그인한 사용자와 2025년 7월 일기를 만드는 공통 준비"""
+
+    DREAM = '어젯밤 커다란 뱀이 나를 쫓아오다가 갑자기 용으로 변하는 꿈을 꾸었다'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dreamer', password='pw', nickname='꿈꾸는이')
+        cls.good = DreamType.objects.create(type='good')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def add_diaries(self, count, text=DREAM):
+        for day in range(1, count + 1):
+            interpretation = Interpretation.objects.create(user=self.user, input_text=text, result='해몽 결과 ' * 200)
+            Diary.objects.create(
+                user=self.user,
+                interpretation=interpretation,
+                dream_type=self.good,
+                date=timezone.make_aware(datetime(2025, 7, day, 9, 0)),
+            )
+
+
+class LazyImportTests(SimpleTestCase):
+    """views 를 import 해도 faiss/tiktoken/openai 는 불러오지 않음 (manage.py 명령, 마이그레이션, 테스트 시작 속도)"""
+
+    def test_views_import_skips_heavy_modules(self):
+        code = (
+            "import sys, django; django.setup(); import dreamlens_core.views; "
+            "print('loaded:', [m for m in ('faiss', 'tiktoken', 'openai') if m in sys.modules])"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertIn("loaded: []", output.splitlines())
+
+
+class DictionaryPageScriptTests(SimpleTestCase):
+    """꿈 사전 페이지 JS(dict.js) 스모크 테스트: 가짜 DOM 에서 검색/분류 변경이 URL 을 바꾸고 API 를 부름 (node 필요)"""
+
+    SCRIPT = r"""
+const calls = {urls: [], fetched: [], options: [], submitted: 0};
+const element = dataset => {
+    const handlers = {};
+    return {
+        value: '', dataset: dataset || {}, handlers, innerHTML: '', hidden: false, disabled: false,
+        addEventListener: (type, handler) => { handlers[type] = handler; },
+        insertRow: () => ({insertCell: () => ({append() {}})}),
+        add(option) { calls.options.push(option.value); },
+        submit() { calls.submitted += 1; },
+    };
+};
+const elements = {
+    'dict-form': element({pageSize: '50', itemsUrl: '/items', subcategoriesUrl: '/subcategories'}),
+    'search-form': element({searchUrl: '/search'}),
+    'search-query': element(), 'category': element(), 'subcategory': element(),
+    'result-count': element(), 'load-more': element(),
+};
+const tbody = element();
+let ready;
+global.document = {
+    addEventListener: (type, handler) => { ready = handler; },
+    getElementById: id => elements[id],
+    querySelector: () => tbody,
+};
+global.window = global;
+global.history = {replaceState: (state, title, url) => calls.urls.push(url)};
+global.location = {pathname: '/dictionary/'};
+global.Option = function (text, value) { this.value = value; };
+global.fetch = url => {
+    calls.fetched.push(url);
+    return Promise.resolve({ok: true, json: () => ({items: [], total: 0, has_next: false, subcategories: [{name: '뱀'}]})});
+};
+require(process.argv[1]);
+ready();
+(async () => {
+    elements['search-query'].value = ' 뱀 ';
+    await elements['search-form'].handlers.submit({preventDefault() {}});
+    elements['category'].value = '동물';
+    await elements['category'].handlers.change();
+    elements['subcategory'].value = '뱀';
+    await elements['subcategory'].handlers.change();
+    console.log(JSON.stringify(calls));
+})();
+"""
+
+    @skipUnless(shutil.which('node'), 'node 가 없음')
+    def test_search_and_filters(self):
+        path = Path(__file__).resolve().parent / 'static' / 'js' / 'dict.js'
+        output = subprocess.run(
+            ['node', '-e', self.SCRIPT, str(path)], capture_output=True, text=True, check=True,
+        ).stdout
+        calls = json.loads(output)
+        self.assertEqual(calls['urls'], [
+            '?q=%EB%B1%80', '?category=%EB%8F%99%EB%AC%BC', '?category=%EB%8F%99%EB%AC%BC&subcategory=%EB%B1%80',
+        ])
+        self.assertEqual(calls['fetched'], [
+            '/search?q=%EB%B1%80&page=1&size=50',
+            '/subcategories?category=%EB%8F%99%EB%AC%BC',
+            '/items?category=%EB%8F%99%EB%AC%BC&subcategory=%EB%B1%80&page=1&size=50',
+        ])
+        self.assertEqual((calls['options'], calls['submitted']), (['뱀'], 0))
+
+
+class EmbeddingCacheTests(SimpleTestCase):
+    """임베딩 2단 캐시: 메모리 -> 디스크 -> miss, 오래 사용하지 않은 항목부터 제거, 파일 이름만 준 경로"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = f"{directory.name}/cache/embeddings.sqlite3"
+
+    def accessed_at(self, embedding_cache, text):
+        return embedding_cache._connect().execute(
+            "SELECT accessed_at FROM embeddings WHERE key = ?", (make_embedding_key(text, 'model'),)
+        ).fetchone()[0]
+
+    def test_memory_disk_miss(self):
+        embedding_cache = EmbeddingCache(self.path, memory_entries=1)
+        embedding_cache.set('뱀 꿈', 'model', [1, 2])
+        embedding_cache.set('돈 꿈', 'model', [3, 4])    # 메모리에서는 '뱀 꿈' 이 밀려남
+
+        self.assertEqual(embedding_cache.get(' 돈   꿈\n', 'model').tolist(), [3, 4])  # 공백 차이는 같은 키
+        self.assertEqual(embedding_cache.get('뱀 꿈', 'model').tolist(), [1, 2])
+        self.assertIsNone(embedding_cache.get('뱀 꿈', 'other-model'))
+        info = embedding_cache.info()
+        self.assertEqual((info['memory_hits'], info['disk_hits'], info['misses']), (1, 1, 1))
+        self.assertEqual((info['memory_entries'], info['disk_entries']), (1, 2))
+
+        # 다른 워커(새 인스턴스)는 디스크에서 읽음
+        other_worker = EmbeddingCache(self.path)
+        self.assertEqual(other_worker.get('돈 꿈', 'model').tolist(), [3, 4])
+        self.assertEqual(other_worker.stats['disk_hits'], 1)
+
+    def test_disk_hits_touch_in_batches(self):
+        embedding_cache = EmbeddingCache(self.path, memory_entries=0, touch_batch=2)
+        with mock.patch('utils.embedding_cache.time.time', return_value=100):
+            embedding_cache.set('뱀 꿈', 'model', [1])
+            embedding_cache.set('돈 꿈', 'model', [2])
+        with mock.patch('utils.embedding_cache.time.time', return_value=200):
+            embedding_cache.get('뱀 꿈', 'model')
+            self.assertEqual(self.accessed_at(embedding_cache, '뱀 꿈'), 100)  # 조회마다 쓰지 않음
+            embedding_cache.get('돈 꿈', 'model')                              # 두 개가 모이면 한 번에 반영
+        self.assertEqual((self.accessed_at(embedding_cache, '뱀 꿈'), self.accessed_at(embedding_cache, '돈 꿈')),
+                         (200, 200))
+
+    def test_evicts_least_recently_used(self):
+        embedding_cache = EmbeddingCache(self.path, max_entries=2, memory_entries=0)
+        for second, text in enumerate(['뱀 꿈', '돈 꿈', '물 꿈']):
+            with mock.patch('utils.embedding_cache.time.time', return_value=100 + second):
+                embedding_cache.set(text, 'model', [second])
+        with mock.patch('utils.embedding_cache.time.time', return_value=200):
+            embedding_cache.get('뱀 꿈', 'model')    # 아직 디스크에 반영 전이어도 evict 직전에 반영
+
+        self.assertEqual(embedding_cache.evict(), 1)
+        self.assertIsNone(embedding_cache.get('돈 꿈', 'model'))
+        self.assertEqual(embedding_cache.get('뱀 꿈', 'model').tolist(), [0])
+        self.assertEqual(embedding_cache.info()['evictions'], 1)
+
+    def test_bare_filename_path(self):
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.directory)
+        embedding_cache = EmbeddingCache('embeddings.sqlite3')
+        embedding_cache.set('뱀 꿈', 'model', [1])
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'embeddings.sqlite3')))
+
+
+class SemanticCacheTests(SimpleTestCase):
+    """의미 캐시: 코사인/L2 임계값 (단위 벡터에서 cos = 1 - d²/2), TTL 만료, capacity 초과 시 오래된 것부터 제거"""
+
+    @staticmethod
+    def at_cosine(cosine):
+        """[1, 0] 과의 코사인 유사도가 cosine 인 2차원 벡터"""
+        return [cosine, (1 - cosine ** 2) ** 0.5]
+
+    def test_cosine_threshold(self):
+        semantic_cache = SemanticCache(threshold=0.95)
+        semantic_cache.store([10, 0], {'summary_result': '뱀'})   # 길이는 정규화됨
+        result, score = semantic_cache.lookup(self.at_cosine(0.96))
+        self.assertEqual(result, {'summary_result': '뱀'})
+        self.assertAlmostEqual(score, 0.96, places=5)
+        self.assertIsNone(semantic_cache.lookup(self.at_cosine(0.94))[0])
+        self.assertEqual((semantic_cache.stats['hits'], semantic_cache.stats['misses']), (1, 1))
+
+    def test_l2_threshold(self):
+        # 최대 L2 거리 0.5 -> 코사인 1 - 0.25 / 2 = 0.875
+        semantic_cache = SemanticCache(threshold=0.5, metric='l2')
+        self.assertAlmostEqual(semantic_cache.threshold, 0.875)
+        semantic_cache.store([1, 0], {'summary_result': '뱀'})
+        self.assertIsNotNone(semantic_cache.lookup(self.at_cosine(0.9))[0])   # 거리 약 0.447
+        self.assertIsNone(semantic_cache.lookup(self.at_cosine(0.85))[0])     # 거리 약 0.548
+        with self.assertRaises(ValueError):
+            SemanticCache(metric='dot')
+
+    def test_ttl(self):
+        semantic_cache = SemanticCache(ttl=10)
+        with mock.patch('utils.semantic_cache.time.time', return_value=1000):
+            semantic_cache.store([1, 0], {'summary_result': '뱀'})
+        with mock.patch('utils.semantic_cache.time.time', return_value=1009):
+            self.assertIsNotNone(semantic_cache.lookup([1, 0])[0])
+        with mock.patch('utils.semantic_cache.time.time', return_value=1010):
+            self.assertEqual(semantic_cache.lookup([1, 0]), (None, 0.0))
+        self.assertEqual((semantic_cache.info()['entries'], semantic_cache.stats['evictions']), (0, 1))
+
+    def test_capacity(self):
+        semantic_cache = SemanticCache(capacity=2)
+        for axis in range(3):
+            vector = [0, 0, 0]
+            vector[axis] = 1
+            semantic_cache.store(vector, {'summary_result': axis})
+        self.assertIsNone(semantic_cache.lookup([1, 0, 0])[0])      # 가장 먼저 저장한 항목이 제거됨
+        self.assertEqual(semantic_cache.lookup([0, 1, 0])[0], {'summary_result': 1})
+        self.assertEqual(semantic_cache.lookup([0, 0, 1])[0], {'summary_result': 2})
+        self.assertEqual((semantic_cache.info()['entries'], semantic_cache.stats['evictions']), (2, 1))
+
+
+class PromptBuilderTests(SimpleTestCase):
+    """
+    프롬프트 토큰 예산: 분류 후보 좁히기, 참고 해몽 자르기/버리기, 메시지 전체가 PROMPT_BUDGET 안
+    tiktoken 인코딩(오프라인에서도 만들 수 있는 바이트 단위 인코딩)과 글자 수 추정 두 경우 모두 확인
+    """
+
+    REFERENCES = [
+        {'대분류': '"동물"', '소분류': '뱀', '꿈': f'뱀이 {i}마리 나오는 꿈', '해몽': '재물이 들어오는 길몽입니다. ' * 40}
+        for i in range(10)
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import tiktoken
+        cls.byte_encoding = tiktoken.Encoding(
+            name='bytes', pat_str=r"\S+|\s+", mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={},
+        )
+
+    def encoding(self, encoding):
+        return mock.patch.dict('utils.prompt_builder._encodings', {'gpt-4o': encoding})
+
+    def test_char_fallback(self):
+        with self.encoding(None):
+            self.assertEqual(count_tokens('뱀 꿈'), 3)
+            self.assertEqual(truncate_tokens('가나다라', 3), '가나…')
+            self.assertEqual(truncate_tokens('가나다', 3), '가나다')
+
+    def test_tiktoken(self):
+        with self.encoding(self.byte_encoding):
+            self.assertEqual(count_tokens('뱀 꿈'), 7)      # 한글은 UTF-8 3바이트
+            self.assertEqual(truncate_tokens('abcdef', 4), 'abc…')
+            self.assertEqual(truncate_tokens('abcd', 4), 'abcd')
+
+    def test_candidate_categories(self):
+        items = [{'대분류': '"동물"', '소분류': '뱀'}, {'대분류': '동물', '소분류': '용'}, {'대분류': ' 자연 ', '소분류': ''}]
+        self.assertEqual(candidate_categories(items), {'대분류': ['동물', '자연'], '소분류': ['뱀', '용']})
+
+    def test_fit_references(self):
+        with self.encoding(None):
+            references, used = fit_references(self.REFERENCES, budget=250, per_item_max=50)
+        self.assertEqual(len(references), 3)                  # 4번째부터는 예산 초과로 버림
+        self.assertTrue(references[0].startswith('1. 꿈: 뱀이 0마리 나오는 꿈'))
+        self.assertTrue(references[0].endswith('…'))          # 해몽은 50 토큰으로 자름
+        self.assertLessEqual(used, 250)
+
+    def test_messages_within_budget(self):
+        dream = '커다란 뱀이 쫓아오는 꿈 ' * 200
+        for encoding in (None, self.byte_encoding):
+            with self.subTest(tiktoken=encoding is not None), self.encoding(encoding), \
+                    mock.patch('sys.stdout', new_callable=StringIO):
+                settings = {'MODEL': 'gpt-4o', 'DREAM_MAX_TOKENS': 100, 'REFERENCE_MAX_TOKENS': 150}
+                # 예산 0 이면 참고 해몽 없이 나머지 부분만
+                with mock.patch.dict(views.PROMPT_BUDGET, settings, INPUT_TOKENS=0):
+                    base = sum(count_tokens(m['content']) for m in views.build_interpret_messages(dream, self.REFERENCES, {}))
+                with mock.patch.dict(views.PROMPT_BUDGET, settings, INPUT_TOKENS=base + 600):
+                    messages = views.build_interpret_messages(dream, self.REFERENCES, {})
+
+                self.assertLessEqual(sum(count_tokens(m['content']) for m in messages), base + 600)
+                prompt = messages[1]['content']
+                self.assertEqual(prompt.count('   해몽: '), 3 if encoding is None else 2)  # 예산 안에 들어가는 만큼만
+                self.assertIn("가능한 대분류: ['동물']", prompt)                          # 이웃 꿈의 분류만 후보로
+                self.assertNotIn('쫓아오는 꿈 ' * 100, prompt)                           # 꿈 이야기도 잘림
+
+
+class KnnClassifierTests(SimpleTestCase):
+    """이웃 꿈 거리 가중 투표: 가중치 1/(d+1e-6), confidence = 대분류 비율 x 소분류 비율"""
+
+    @staticmethod
+    def neighbor(main_cat, sub_cat, score):
+        return {'대분류': main_cat, '소분류': sub_cat, 'score': score}
+
+    def test_weighted_vote(self):
+        # 동물 1 + 1 = 2, 자연 1/0.25 = 4 -> 이웃 수가 적어도 더 가까운 자연
+        result = classify_neighbors([
+            self.neighbor('동물', '뱀', 1.0), self.neighbor('"동물"', '용', 1.0), self.neighbor('자연', '물', 0.25),
+        ])
+        self.assertEqual((result['대분류'], result['소분류']), ('자연', '물'))
+        self.assertAlmostEqual(result['confidence'], 4 / 6, places=5)
+
+        # 소분류는 이긴 대분류 안에서만: 뱀 1, 용 2 + 2 -> 용, confidence 1 x 4/5
+        result = classify_neighbors([
+            self.neighbor('동물', '뱀', 1.0), self.neighbor('동물', '용', 0.5), self.neighbor('동물', '용', 0.5),
+            self.neighbor('', '무시', 0.1),
+        ])
+        self.assertEqual((result['대분류'], result['소분류']), ('동물', '용'))
+        self.assertAlmostEqual(result['confidence'], 0.8, places=5)
+
+    def test_ties_keep_nearest_first(self):
+        # 가중치가 같으면 먼저 나온(검색 순위가 높은) 이웃의 분류
+        result = classify_neighbors([self.neighbor('동물', '뱀', 1.0), self.neighbor('자연', '물', 1.0)])
+        self.assertEqual((result['대분류'], result['소분류']), ('동물', '뱀'))
+        self.assertAlmostEqual(result['confidence'], 0.5)
+        result = classify_neighbors([self.neighbor('동물', '용', 1.0), self.neighbor('동물', '뱀', 1.0)])
+        self.assertEqual((result['소분류'], result['confidence']), ('용', 0.5))
+
+    def test_exact_match(self):
+        # 거리 0 이어도 0 으로 나누지 않고, 같은 꿈이 사실상 결정함
+        result = classify_neighbors([self.neighbor('동물', '뱀', 0.1)] * 3 + [self.neighbor('자연', '물', 0.0)])
+        self.assertEqual((result['대분류'], result['소분류']), ('자연', '물'))
+        self.assertGreater(result['confidence'], 0.9999)
+
+    def test_inner_product_and_empty(self):
+        result = classify_neighbors([self.neighbor('동물', '뱀', 0.9), self.neighbor('자연', '물', -0.5)], metric='ip')
+        self.assertEqual((result['대분류'], result['confidence']), ('동물', 1.0))
+        self.assertIsNone(classify_neighbors([self.neighbor('동물', '뱀', -0.1)], metric='ip'))
+        self.assertIsNone(classify_neighbors([]))
+
+    def test_format_and_parse(self):
+        text = format_classification({'대분류': '동물', '소분류': '뱀'})
+        self.assertEqual(parse_classification(text), ('동물', '뱀'))
+        self.assertEqual(parse_classification('**대분류**: "자연"\n소분류 : 물'), ('자연', '물'))
+
+
+class FaissHelperTests(SimpleTestCase):
+    """Faiss 인덱스 스펙 파싱, 학습 벡터가 적을 때 nlist 줄이기, 파라미터 파일, 종류별 인덱스 저장/읽기(mmap 포함)"""
+
+    SPECS = ['Flat', 'IVFFlat,nlist=8,nprobe=8', 'HNSW,M=8,efSearch=32', 'IVFPQ,nlist=8,m=4,nbits=4,nprobe=8']
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.vectors = np.random.default_rng(0).random((640, 16), dtype='float32')  # PQ 학습(16개 중심) 권장치 624개 이상
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_parse_index_spec(self):
+        self.assertEqual(faiss_helper.parse_index_spec('Flat'), {'type': 'Flat'})
+        self.assertEqual(faiss_helper.parse_index_spec(' IVFFlat, nlist=64 '), {'type': 'IVFFlat', 'nlist': 64, 'nprobe': 16})
+        self.assertEqual(faiss_helper.parse_index_spec({'type': 'HNSW', 'M': 16})['M'], 16)
+        with self.assertRaises(ValueError):
+            faiss_helper.parse_index_spec('LSH')
+        with self.assertRaises(ValueError):
+            faiss_helper.parse_index_spec('HNSW,nlist=8')
+
+    def test_create_index_shrinks_nlist(self):
+        spec = faiss_helper.parse_index_spec('IVFFlat')
+        with mock.patch('sys.stdout', new_callable=StringIO):
+            index = faiss_helper.create_index(16, spec, n_train=200)
+        # 군집당 학습 벡터 39개 이상: 200 // 39 = 5, nprobe 도 nlist 를 넘지 않게
+        self.assertEqual((index.nlist, spec['nlist'], spec['nprobe']), (5, 5, 5))
+        with self.assertRaises(ValueError):
+            faiss_helper.create_index(16, faiss_helper.parse_index_spec('IVFPQ,nlist=8,m=5'), n_train=640)
+
+    def test_save_and_read(self):
+        for spec in self.SPECS:
+            with self.subTest(spec=spec):
+                spec = faiss_helper.parse_index_spec(spec)
+                path = f"{self.directory}/{spec['type']}.index"
+                with mock.patch('sys.stdout', new_callable=StringIO):
+                    index = faiss_helper.train_index(self.vectors, spec)
+                faiss.write_index(index, path)
+                faiss_helper.save_index_params(index, spec, path)
+
+                params = faiss_helper.load_index_params(path)
+                self.assertEqual(params, {**spec, 'dim': 16, 'ntotal': 640, 'metric': 'l2'})
+                search_params = faiss_helper.make_search_params(index, params.get('nprobe'), params.get('efSearch'))
+                expected = index.search(self.vectors[:5], 3, params=search_params)[1]
+                if spec['type'] != 'IVFPQ':        # PQ 는 압축 때문에 자기 자신이 1등이 아닐 수 있음
+                    self.assertEqual(expected[:, 0].tolist(), [0, 1, 2, 3, 4])
+
+                for mmap in (False, True):
+                    loaded = faiss_helper.read_index(path, mmap=mmap, params=params)
+                    self.assertEqual(loaded.ntotal, 640)
+                    _, ids = loaded.search(self.vectors[:5], 3, params=search_params)
+                    self.assertEqual(ids.tolist(), expected.tolist())
+
+        # 파라미터 파일이 없는 예전 인덱스는 Flat
+        self.assertEqual(faiss_helper.load_index_params(f"{self.directory}/old.index"), {'type': 'Flat'})
+
+    def test_load_faiss_index(self):
+        spec = faiss_helper.parse_index_spec('IVFFlat,nlist=8,nprobe=4')
+        index_path, meta_path = f"{self.directory}/dream.index", f"{self.directory}/meta.json"
+        with self.assertRaises(FileNotFoundError):
+            faiss_helper.load_faiss_index(index_path, meta_path)
+
+        with mock.patch('sys.stdout', new_callable=StringIO):
+            index = faiss_helper.train_index(self.vectors, spec)
+        faiss.write_index(index, index_path)
+        faiss_helper.save_index_params(index, spec, index_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump([{'꿈': f'꿈 {i}'} for i in range(640)], f, ensure_ascii=False)
+
+        for mmap in (False, True):
+            loaded, metadata = faiss_helper.load_faiss_index(index_path, meta_path, mmap=mmap)
+            self.assertEqual((loaded.ntotal, len(metadata)), (640, 640))
+            self.assertEqual(faiss.extract_index_ivf(loaded).nprobe, 4)   # 저장된 nprobe 가 검색 기본값
+
+
+class DictionaryReloadTests(SimpleTestCase):
+    """사전 파일이 바뀌면 트리/색인을 다시 만들고, mtime 만 바뀐 경우(touch)는 다시 만들지 않음"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = f"{directory.name}/meta_dream.json"
+        patcher = mock.patch.multiple(
+            dictionary_module, DICTIONARY_PATH=self.path, SEARCH_INDEX_PATH=f"{directory.name}/index.npz",
+            CHECK_INTERVAL=0, _dictionary=None, _checked_at=0.0,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        stdout = mock.patch('sys.stdout', new_callable=StringIO)
+        stdout.start()
+        self.addCleanup(stdout.stop)
+
+    def write(self, items, mtime):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        os.utime(self.path, ns=(mtime, mtime))
+
+    def test_reload(self):
+        snake = {'대분류': '동물', '소분류': '뱀', '꿈': '뱀이 나오는 꿈', '해몽': '재물운'}
+        self.write([snake], 10 ** 18)
+        first = dictionary_module.get_dictionary()
+        self.assertEqual(first.tree, {'동물': ['뱀']})
+
+        # 내용이 같으면 mtime 이 바뀌어도 같은 사전 (다시 만들지 않음)
+        self.write([snake], 2 * 10 ** 18)
+        with mock.patch.object(dictionary_module, 'DreamDictionary', side_effect=AssertionError('rebuilt')):
+            self.assertIs(dictionary_module.get_dictionary(), first)
+
+        # 내용이 바뀌면 트리, (대분류, 소분류) 색인, 검색 색인을 새로 만듦
+        water = {'대분류': '자연', '소분류': '물', '꿈': '맑은 물을 마시는 꿈', '해몽': '건강운'}
+        self.write([snake, water, {**water, '꿈': '물에 빠지는 꿈'}], 3 * 10 ** 18)
+        second = dictionary_module.get_dictionary()
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(second.tree, {'동물': ['뱀'], '자연': ['물']})
+        self.assertEqual(second.pair_index, {('동물', '뱀'): [0], ('자연', '물'): [1, 2]})
+        self.assertEqual(second.search_index.version, second.version)
+        self.assertEqual(second.search('물')[0], 2)
+
+    def test_check_interval(self):
+        self.write([{'대분류': '동물', '소분류': '뱀'}], 10 ** 18)
+        first = dictionary_module.get_dictionary()
+        self.write([{'대분류': '자연', '소분류': '물'}], 2 * 10 ** 18)
+        with mock.patch.object(dictionary_module, 'CHECK_INTERVAL', 60):
+            self.assertIs(dictionary_module.get_dictionary(), first)   # 간격 안에서는 파일을 다시 보지 않음
+        self.assertEqual(dictionary_module.get_dictionary().tree, {'자연': ['물']})
+
+
+class DictionaryApiTests(SimpleTestCase):
+    """사전 JSON API: ETag/Last-Modified 조건부 GET 은 304, page/size 는 범위 안으로 맞춤"""
+
+    def setUp(self):
+        raw = [{'대분류': '동물', '소분류': '뱀', '꿈': f'뱀이 {i}마리 나오는 꿈', '해몽': '재물운'} for i in range(250)]
+        self.dictionary = DreamDictionary(raw, 'v1', 1_700_000_000)
+        self.dictionary._search_index = load_or_build_search_index(self.dictionary, path='unused.npz', save=False)
+        patcher = mock.patch('dreamlens_core.views.get_dictionary', side_effect=lambda: self.dictionary)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_items(self, headers=None, **params):
+        return self.client.get(
+            reverse('dict_api_items'), {'category': '동물', 'subcategory': '뱀', **params}, headers=headers,
+        )
+
+    def test_conditional_get(self):
+        response = self.get_items()
+        self.assertEqual((response.status_code, response['ETag']), (200, '"v1"'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self.get_items(headers={'If-None-Match': '"v1"'})
+        self.assertEqual((response.status_code, response.content), (304, b''))
+        response = self.client.get(
+            reverse('dict_api_search'), {'q': '뱀'}, headers={'If-Modified-Since': self.get_items()['Last-Modified']},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # 사전이 바뀌면 예전 ETag 로는 304 가 아님
+        self.dictionary = DreamDictionary([], 'v2', 1_800_000_000)
+        response = self.client.get(reverse('dict_api_categories'), headers={'If-None-Match': '"v1"'})
+        self.assertEqual((response.status_code, response['ETag']), (200, '"v2"'))
+
+    def test_page_bounds(self):
+        data = self.get_items(page=0, size=1000).json()
+        self.assertEqual((data['page'], data['size'], len(data['items']), data['has_next']), (1, 200, 200, True))
+        data = self.get_items(page=-3, size=0).json()
+        self.assertEqual((data['page'], data['size'], data['items'][0]['id']), (1, 1, 0))
+        data = self.get_items(page=2, size=200).json()
+        self.assertEqual((data['total'], len(data['items']), data['has_next']), (250, 50, False))
+        self.assertEqual(self.get_items(page=99).json()['items'], [])
+        self.assertEqual(self.get_items(size='many').status_code, 400)
+
+        data = self.client.get(reverse('dict_api_search'), {'q': '뱀', 'page': 0, 'size': 500}).json()
+        self.assertEqual((data['page'], data['size'], data['total'], len(data['items'])), (1, 200, 250, 200))
+
+
+class PrefixIndexTests(SimpleTestCase):
+    """자동완성 접두어 색인: 1~2글자는 미리 계산한 상위 목록, 더 긴 접두어는 bisect 구간, 빈/없는 접두어"""
+
+    COUNTS = {'뱀': 5, '뱀 꿈': 3, '뱀장어': 2, '바다': 7, '바람': 7, 'Big  Snake': 4, '  ': 9}
+
+    def brute_force(self, counts, prefix, limit):
+        matches = sorted((-count, normalize(term), term) for term, count in counts.items()
+                         if normalize(term) and normalize(term).startswith(normalize(prefix)))
+        return [(term, -count) for count, _, term in matches[:limit]]
+
+    def test_precomputed_short_prefixes(self):
+        index = PrefixIndex(self.COUNTS)
+        self.assertEqual(len(index), 6)                       # 공백뿐인 용어는 제외
+        self.assertIn('뱀', index.top)
+        self.assertEqual(index.complete('뱀'), [('뱀', 5), ('뱀 꿈', 3), ('뱀장어', 2)])
+        self.assertEqual(index.complete('바', limit=1), [('바다', 7)])   # 빈도가 같으면 정렬 순서
+        self.assertEqual(index.complete('B'), [('Big  Snake', 4)])       # 대소문자 무관
+
+    def test_bisect_longer_prefixes(self):
+        index = PrefixIndex(self.COUNTS)
+        self.assertEqual(index.complete('뱀장어'), [('뱀장어', 2)])
+        self.assertEqual(index.complete('뱀장군'), [])
+        self.assertEqual(index.complete(' big   s'), [('Big  Snake', 4)])
+        self.assertEqual(index.complete('뱀 꿈'), [('뱀 꿈', 3)])
+
+    def test_matches_brute_force_and_limit(self):
+        counts = {f'가나{i:02d}': i % 7 for i in range(30)}
+        counts.update({f'가{i}': 10 + i for i in range(5)})
+        index = PrefixIndex(counts)
+        for prefix in ('가', '가나', '가나0', '가나1', '가3'):
+            for limit in (1, 5, 50):
+                with self.subTest(prefix=prefix, limit=limit):
+                    self.assertEqual(index.complete(prefix, limit), self.brute_force(counts, prefix, min(limit, 20)))
+        self.assertEqual(len(index.complete('가', 50)), PrefixIndex.MAX_LIMIT)
+
+    def test_empty_and_unknown(self):
+        index = PrefixIndex(self.COUNTS)
+        for prefix in ('', '   ', None, '호', '호랑이', '뱀뱀뱀'):
+            self.assertEqual(index.complete(prefix), [])
+        self.assertEqual(PrefixIndex({}).complete('뱀'), [])
+
+
+class DictionarySearchTests(SimpleTestCase):
+    """꿈 사전 검색의 total 은 일치하는 전체 항목 수이고, 앞쪽 1000개 너머의 페이지도 조회됨"""
+
+    def test_total_counts_every_match(self):
+        raw = [{'대분류': '동물', '소분류': '뱀', '꿈': f'뱀이 {i}마리 나오는 꿈', '해몽': '재물운'} for i in range(1500)]
+        raw += [{'대분류': '자연', '소분류': '물', '꿈': '맑은 물을 마시는 꿈', '해몽': '건강운'}] * 5
+        dictionary = DreamDictionary(raw, 'test', 0)
+        dictionary._search_index = load_or_build_search_index(dictionary, path='unused.npz', save=False)
+
+        total, page = dictionary.search('뱀', offset=1490, limit=20)
+        self.assertEqual((total, len(page)), (1500, 10))
+        self.assertTrue(all(item['소분류'] == '뱀' for item in page))
+        self.assertEqual(dictionary.search('물', limit=3)[0], 5)
+        self.assertEqual(dictionary.search('!!'), (0, []))
+
+
+class NgramIndexTests(SimpleTestCase):
+    """글자 n-gram BM25 색인: 순위, 조사가 붙은 한 글자 명사, 하이라이트, 파일 저장/읽기"""
+
+    DOCUMENTS = [
+        {'꿈': '뱀이 나오는 꿈', '해몽': '재물이 들어온다'},
+        {'꿈': '호랑이를 보는 꿈', '해몽': '뱀처럼 조심할 일이 생긴다'},
+        {'꿈': '돈을 줍는 꿈', '해몽': '뜻밖의 재물운'},
+        {'꿈': '하늘을 나는 꿈', '해몽': '소원이 이루어진다'},
+    ]
+
+    def build(self):
+        return NgramIndex.build(self.DOCUMENTS, {'꿈': 2.0, '해몽': 1.0}, version='v1')
+
+    def test_ngrams(self):
+        self.assertEqual(ngrams('돈을'), ['돈', '돈을'])
+        self.assertEqual(ngrams('돈', query=True), ['돈'])
+        self.assertEqual(ngrams('하늘을', query=True), ['하늘', '늘을', '하늘을'])  # 긴 질의에는 한 글자 n-gram 없음
+
+    def test_ranking(self):
+        index = self.build()
+        # 제목(가중치 2)에 나온 문서가 본문에만 나온 문서보다 앞
+        self.assertEqual([doc_id for doc_id, _ in index.search('뱀')], [0, 1])
+        self.assertEqual([doc_id for doc_id, _ in index.search('돈')], [2])
+        # 같은 필드면 짧은 본문이 앞 (BM25 길이 정규화), limit 은 상위 몇 개만
+        self.assertEqual([doc_id for doc_id, _ in index.search('재물')], [2, 0])
+        self.assertEqual([doc_id for doc_id, _ in index.search('재물', limit=1)], [2])
+        self.assertEqual(index.search('!!'), [])
+        self.assertEqual(index.search('없는말'), [])
+
+    def test_highlights(self):
+        self.assertEqual(find_highlights('뱀이 뱀을 문다', '뱀'), [[0, 1], [3, 4]])
+        self.assertEqual(find_highlights('Big Snake', 'big bi'), [[0, 3]])  # 겹치는 위치는 합침
+        self.assertEqual(find_highlights('', '뱀'), [])
+
+    def test_save_and_load(self):
+        index = self.build()
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/index.npz"
+            index.save(path)
+            loaded = NgramIndex.load(path)
+
+        self.assertEqual((loaded.version, loaded.doc_count, loaded.vocab), ('v1', 4, index.vocab))
+        for query in ('뱀', '재물', '하늘을 나는'):
+            expected = index.search(query)
+            actual = loaded.search(query)
+            self.assertEqual([doc_id for doc_id, _ in actual], [doc_id for doc_id, _ in expected])
+            for (_, score), (_, expected_score) in zip(actual, expected):
+                self.assertAlmostEqual(score, expected_score, places=2)  # 가중치는 float16 으로 저장
+
+
+class SectionStreamParserTests(SimpleTestCase):
+    """구분자가 청크 경계에서 잘려 들어와도 섹션이 제대로 나뉘고, 구분자 앞부분으로 보류한 글자도 잃지 않음"""
+
+    MARKERS = {'[해몽시작]': 'interpretation', '[요약시작]': 'summary'}
+
+    def feed_all(self, chunks):
+        parser = SectionStreamParser(self.MARKERS)
+        events = [event for chunk in chunks for event in parser.feed(chunk)] + parser.close()
+        return parser, events
+
+    def test_marker_split_across_chunks(self):
+        parser = SectionStreamParser(self.MARKERS)
+        self.assertEqual(parser.feed('서론[해'), [])
+        self.assertEqual(parser.feed('몽시'), [])
+        self.assertEqual(parser.feed('작]뱀은 재물[요'), [('interpretation', ''), ('interpretation', '뱀은 재물')])
+        self.assertEqual(parser.feed('약시작]좋은 꿈'), [('summary', ''), ('summary', '좋은 꿈')])
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(parser.text, '서론[해몽시작]뱀은 재물[요약시작]좋은 꿈')
+
+    def test_held_back_text_that_is_not_a_marker(self):
+        # '[해' 까지는 구분자일 수 있어 보류했다가, 다음 청크에서 아닌 것이 밝혀지면 그대로 내보냄
+        _, events = self.feed_all(['[해몽시작]별[해', '와 달'])
+        self.assertEqual(events, [('interpretation', ''), ('interpretation', '별'), ('interpretation', '[해와 달')])
+
+    def test_marker_at_end_of_stream(self):
+        _, events = self.feed_all(['[해몽시작]내용', '[요약시작]'])
+        self.assertEqual(events, [('interpretation', ''), ('interpretation', '내용'), ('summary', '')])
+        # 스트림이 구분자 앞부분에서 끝나면 보류한 글자는 close() 에서 현재 섹션으로
+        _, events = self.feed_all(['[해몽시작]내용', '[요약'])
+        self.assertEqual(events, [('interpretation', ''), ('interpretation', '내용'), ('interpretation', '[요약')])
+
+    def test_text_without_markers(self):
+        parser, events = self.feed_all(['구분자 없는 ', '답변 [괄호]'])
+        self.assertEqual(events, [])
+        self.assertEqual(parser.text, '구분자 없는 답변 [괄호]')
+
+
+class InterpretStreamTests(TestCase):
+    """해몽 스트리밍 응답: text/event-stream, 섹션 이벤트를 구분자가 도착하는 대로 보내고 마지막에 done"""
+
+    ANSWER = ['[해', '몽시작]뱀은 ', '재물[키워드', '추출]뱀, 재물[요약시작]', '좋은 꿈']
+
+    @mock.patch('dreamlens_core.views.semantic_cache', None)
+    @mock.patch('dreamlens_core.views.retrieval.is_ready', return_value=True)
+    @mock.patch('dreamlens_core.views.retrieval.get', return_value={})
+    @mock.patch('dreamlens_core.views.embed_dream', return_value=None)
+    @mock.patch('dreamlens_core.views.retrieve_and_classify', return_value=([], '대분류: 동물\n소분류: 뱀'))
+    @mock.patch('dreamlens_core.views.build_interpret_messages', return_value=[])
+    @mock.patch('dreamlens_core.views.openai')
+    def test_event_framing(self, openai, *mocks):
+        openai.chat.completions.create.return_value = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+            for text in self.ANSWER
+        ]
+        response = self.client.post(reverse('dream_interpreter_stream'), {'input_text': '뱀 꿈'})
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.endswith('\n\n'))
+        events = []
+        for block in body[:-2].split('\n\n'):
+            event, data = block.split('\n')
+            self.assertTrue(event.startswith('event: ') and data.startswith('data: '))
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+
+        sections = [(data['section'], data['delta']) for event, data in events if event == 'section']
+        self.assertEqual(sections, [
+            ('classification_result', '대분류: 동물\n소분류: 뱀'),
+            ('interpretation_result', ''), ('interpretation_result', '뱀은 '), ('interpretation_result', '재물'),
+            ('keywords_result', ''), ('keywords_result', '뱀, 재물'),
+            ('summary_result', ''), ('summary_result', '좋은 꿈'),
+        ])
+        event, done = events[-1]
+        self.assertEqual(event, 'done')
+        self.assertEqual((done['interpretation_result'], done['keywords_result'], done['summary_result']),
+                         ('뱀은 재물', '뱀, 재물', '좋은 꿈'))
+        self.assertEqual((done['interpret_pk'], done['served_from_cache']), (None, False))
+
+
+class RankFusionTests(SimpleTestCase):
+    """Reciprocal Rank Fusion: 점수 = Σ 가중치 / (k + 순위)"""
+
+    def test_scores_and_order(self):
+        fused = reciprocal_rank_fusion({'vector': [1, 2, 3], 'lexical': [3, 1]}, k=60)
+        self.assertEqual([doc_id for doc_id, _ in fused], [1, 3, 2])
+        scores = dict(fused)
+        self.assertAlmostEqual(scores[1], 1 / 61 + 1 / 62)
+        self.assertAlmostEqual(scores[3], 1 / 63 + 1 / 61)
+        self.assertAlmostEqual(scores[2], 1 / 62)
+
+    def test_weights(self):
+        rankings = {'vector': [1, 2], 'lexical': [2, 1]}
+        # 같은 가중치면 동점 -> 먼저 나온 순위 목록의 순서
+        self.assertEqual([doc_id for doc_id, _ in reciprocal_rank_fusion(rankings)], [1, 2])
+        self.assertEqual([doc_id for doc_id, _ in reciprocal_rank_fusion(rankings, {'lexical': 2.0})], [2, 1])
+        # 가중치 0 이면 그 목록은 무시
+        self.assertEqual(reciprocal_rank_fusion(rankings, {'vector': 0}, k=1), [(2, 0.5), (1, 1 / 3)])
+        self.assertEqual(reciprocal_rank_fusion({}), [])
+
+
+class CombineCacheTests(SimpleTestCase):
+    """꿈 조합기 캐시: 키워드 순서/대소문자/공백 무관 키, TTL, LRU 제거, 공유 캐시"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_make_key(self):
+        self.assertEqual(normalize_keywords([' Big  Snake', '불', '', '불']), ('big snake', '불'))
+        self.assertEqual(make_key(['뱀', 'Fire '], 'gpt'), make_key(['fire', ' 뱀', 'FIRE'], 'gpt'))
+        self.assertNotEqual(make_key(['뱀'], 'gpt'), make_key(['뱀'], 'other'))
+        self.assertNotEqual(make_key(['뱀', '불'], 'gpt'), make_key(['뱀 불'], 'gpt'))
+
+    def test_ttl(self):
+        combine_cache = CombineCache('gpt', ttl=10)
+        with mock.patch('utils.combine_cache.time.time', return_value=1000):
+            combine_cache.set(['뱀'], {'summary': 'a'})
+        with mock.patch('utils.combine_cache.time.time', return_value=1009):
+            self.assertEqual(combine_cache.get(['뱀']), {'summary': 'a'})
+        with mock.patch('utils.combine_cache.time.time', return_value=1010):
+            self.assertIsNone(combine_cache.get(['뱀']))
+        self.assertEqual(combine_cache.info()['memory_entries'], 0)
+
+    def test_lru_eviction(self):
+        combine_cache = CombineCache('gpt', capacity=2)
+        combine_cache.set(['뱀'], {'summary': '뱀'})
+        combine_cache.set(['불'], {'summary': '불'})
+        combine_cache.get(['뱀'])                   # 최근 사용 -> 불이 가장 오래됨
+        combine_cache.set(['물'], {'summary': '물'})
+        self.assertIsNone(combine_cache.get(['불']))
+        self.assertEqual(combine_cache.get(['뱀']), {'summary': '뱀'})
+        info = combine_cache.info()
+        self.assertEqual((info['evictions'], info['memory_hits'], info['misses']), (1, 2, 1))
+
+    def test_shared_cache(self):
+        CombineCache('gpt', shared=cache).set(['뱀', '불'], {'summary': '공유'})
+        other_worker = CombineCache('gpt', shared=cache)
+        self.assertEqual(other_worker.get(['불', '뱀']), {'summary': '공유'})
+        self.assertEqual(other_worker.get(['불', '뱀']), {'summary': '공유'})
+        self.assertEqual((other_worker.stats['shared_hits'], other_worker.stats['memory_hits']), (1, 1))
+
+
+class JobQueueTests(TestCase):
+    """
+    lease 가 만료되어 다른 워커가 다시 가져간 작업은 원래 워커가 완료/실패로 덮어쓰지 못함
+    lease 만료가 반복되는 작업도 최대 시도 횟수를 넘으면 failed
+    """
+
+    def test_reclaimed_job_ignores_original_worker(self):
+        jobs.enqueue('뱀 꿈')
+        slow = jobs.claim('slow')
+        InterpretJob.objects.filter(pk=slow.pk).update(locked_at=timezone.now() - timedelta(seconds=jobs.LEASE_SECONDS + 1))
+        fast = jobs.claim('fast')
+        self.assertEqual((fast.pk, fast.attempts), (slow.pk, 2))
+
+        self.assertFalse(jobs.complete(slow, {'summary_result': 'slow'}))
+        self.assertFalse(jobs.fail(slow, RuntimeError('timeout')))
+        job = InterpretJob.objects.get(pk=slow.pk)
+        self.assertEqual((job.status, job.locked_by, job.result), (InterpretJob.STATUS_RUNNING, 'fast', None))
+
+        self.assertTrue(jobs.complete(fast, {'summary_result': 'fast'}))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (InterpretJob.STATUS_DONE, {'summary_result': 'fast'}))
+
+    def test_expired_lease_stops_after_max_attempts(self):
+        # 워커가 작업 중 죽으면 (OOM 등) fail() 이 불리지 않으므로 lease 만료로만 시도 횟수가 쌓임
+        crashing = jobs.enqueue('뱀 꿈')
+        expired = timezone.now() - timedelta(seconds=jobs.LEASE_SECONDS + 1)
+        for attempt in (1, 2):
+            self.assertEqual(jobs.claim('worker', max_attempts=2).attempts, attempt)
+            InterpretJob.objects.filter(pk=crashing.pk).update(locked_at=expired)
+
+        waiting = jobs.enqueue('돈 꿈')
+        self.assertEqual(jobs.claim('worker', max_attempts=2).pk, waiting.pk)
+        crashing.refresh_from_db()
+        self.assertEqual((crashing.status, crashing.attempts), (InterpretJob.STATUS_FAILED, 2))
+        self.assertIn('lease 만료', crashing.error)
+        self.assertIsNone(jobs.claim('worker', max_attempts=2))
+
+    def test_fail_retries_with_backoff(self):
+        jobs.enqueue('뱀 꿈')
+        job = jobs.claim('worker')
+        self.assertTrue(jobs.fail(job, RuntimeError('boom'), max_attempts=2, backoff=10))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (InterpretJob.STATUS_PENDING, 'boom'))
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=9))
+
+
+class InterpretJobModeTests(TestCase):
+    """작업 큐 모드에서는 동기/비동기(ASGI) 해몽 뷰 모두 OpenAI 를 부르지 않고 작업만 등록"""
+
+    def post(self, view):
+        request = RequestFactory().post('/interpret/', {'input_text': ' 뱀 꿈 '})
+        request.session = SessionStore()
+        request.user = AnonymousUser()
+        response = async_to_sync(view)(request) if iscoroutinefunction(view) else view(request)
+        return request, response
+
+    @mock.patch('dreamlens_core.views.INTERPRET_JOB_MODE', True)
+    @mock.patch('dreamlens_core.views.retrieval.is_ready', return_value=True)
+    @mock.patch('dreamlens_core.views.interpret_dream', side_effect=AssertionError('OpenAI 호출'))
+    @mock.patch('dreamlens_core.views.aembed_dream', side_effect=AssertionError('OpenAI 호출'))
+    def test_sync_and_async_views_enqueue(self, *mocks):
+        for view in (views.dream_interpreter, views.dream_interpreter_async):
+            with self.subTest(view=view.__name__):
+                request, response = self.post(view)
+                job = InterpretJob.objects.latest('pk')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual((job.input_text, job.status), ('뱀 꿈', InterpretJob.STATUS_PENDING))
+                self.assertEqual(request.session['interpret_jobs'], [job.pk])
+                self.assertContains(response, reverse('interpret_job_status', args=[job.pk]))
+        self.assertEqual(InterpretJob.objects.count(), 2)
+
+
+class AnonymousPageCacheTests(TestCase):
+    """로그인하지 않은 사용자의 페이지만 캐시: 로그인 사용자는 캐시를 거치지 않고, 그 페이지가 다른 사람에게 나가지도 않음"""
+
+    def setUp(self):
+        cache.clear()
+        for patcher in (
+            mock.patch('dreamlens_core.views.PAGE_CACHE_TIMEOUT', 60),
+            mock.patch('dreamlens_core.views.get_dictionary', return_value=SimpleNamespace(version='v1')),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_authenticated_users_bypass_cache(self):
+        user = User.objects.create_user(username='dreamer', password='pw', nickname='꿈꾸는이')
+        with mock.patch('dreamlens_core.views.render', wraps=views.render) as render:
+            anonymous = self.client.get(reverse('index'))
+            self.assertEqual(self.client.get(reverse('index')).content, anonymous.content)
+            self.assertEqual(render.call_count, 1)              # 두 번째는 캐시에서
+
+            self.client.force_login(user)
+            for _ in range(2):
+                response = self.client.get(reverse('index'))
+                self.assertContains(response, '꿈꾸는이 님')
+            self.assertEqual(render.call_count, 3)              # 로그인 사용자는 매번 렌더링
+
+            self.client.logout()
+            response = self.client.get(reverse('index'))
+            self.assertNotContains(response, '꿈꾸는이')
+            self.assertEqual(response.content, anonymous.content)
+            self.assertEqual(render.call_count, 3)
+
+    def test_dictionary_fragments_exclude_user(self):
+        # 사전 페이지의 조각 캐시({% cache %})는 사용자와 무관한 목록만 -> 상단바 닉네임은 매번 렌더링
+        user = User.objects.create_user(username='dreamer', password='pw', nickname='꿈꾸는이')
+        dictionary = DreamDictionary([{'대분류': '동물', '소분류': '뱀', '꿈': '뱀 꿈', '해몽': '재물운'}], 'v1', 0)
+        url = reverse('dream_dict') + '?category=동물&subcategory=뱀'
+        with mock.patch('dreamlens_core.views.get_dictionary', return_value=dictionary):
+            self.assertNotContains(self.client.get(url), '꿈꾸는이')
+            self.client.force_login(user)
+            response = self.client.get(url)
+        self.assertContains(response, '꿈꾸는이 님')
+        self.assertContains(response, '재물운')
+
+
+class DiaryListQueryTests(DiaryTestCase):
+    """일기장 달력(diary_list)은 일기 수와 관계없이 같은 수의 쿼리로 만들어져야 함"""
+
+    def get_month(self):
+        return self.client.get(reverse('diary_list', kwargs={'yyyymm': 202507}))
+
+    def test_query_count_does_not_grow_with_diaries(self):
+        self.add_diaries(1)
+        with self.assertNumQueries(3):  # 세션, 사용자, 일기(해몽 JOIN)
+            self.get_month()
+
+        self.add_diaries(20)
+        with self.assertNumQueries(3):
+            self.get_month()
+
+    def test_titles_are_truncated_snippets(self):
+        self.add_diaries(1)
+        Diary.objects.create(user=self.user, date=timezone.make_aware(datetime(2025, 7, 2, 9, 0)))
+        Diary.objects.create(
+            user=self.user,
+            interpretation=Interpretation.objects.create(user=self.user, input_text='짧은 꿈', result=''),
+            date=timezone.make_aware(datetime(2025, 7, 2, 10, 0)),
+        )
+
+        entries = json.loads(self.get_month().context['entries_by_day_json'])
+        self.assertEqual(entries['1'][0]['title'], self.DREAM[:20] + '…')
+        self.assertEqual([entry['title'] for entry in entries['2']], ['', '짧은 꿈'])
+
+
+class DiaryMonthApiTests(DiaryTestCase):
+    """달력 API 는 (사용자, 연월) 별로 캐시하고, 일기가 바뀌면 해당 달만 다시 만듦"""
+
+    def get_month_api(self, yyyymm=202507):
+        return self.client.get(reverse('diary_month_api', kwargs={'yyyymm': yyyymm}))
+
+    def test_cached_until_diary_changes(self):
+        self.add_diaries(2)
+        self.assertEqual(len(self.get_month_api().json()['entries_by_day']), 2)
+        with self.assertNumQueries(2):  # 세션, 사용자 (달력은 캐시)
+            self.get_month_api()
+
+        self.add_diaries(3)
+        self.assertEqual(len(self.get_month_api().json()['entries_by_day']), 3)
+
+        Diary.objects.filter(date__day=3).first().delete()
+        self.assertEqual(len(self.get_month_api().json()['entries_by_day']), 2)
+
+    def test_moving_diary_invalidates_both_months(self):
+        self.add_diaries(1)
+        self.get_month_api(202507)
+        self.get_month_api(202508)
+
+        diary = Diary.objects.get()
+        diary.date = timezone.make_aware(datetime(2025, 8, 15, 9, 0))
+        diary.save()
+
+        self.assertEqual(self.get_month_api(202507).json()['entries_by_day'], {})
+        self.assertEqual(list(self.get_month_api(202508).json()['entries_by_day']), ['15'])
+
+    def test_invalid_month(self):
+        self.assertEqual(self.get_month_api(202513).status_code, 404)
+
+
+class ReportTests(DiaryTestCase):
+    """월간 리포트는 해당 월의 일기를 한 번만 조회해서 집계하고, 이후에는 MonthlyReport 한 행만 읽음"""
+
+    def get_report(self, yyyymm=202507):
+        return self.client.get(reverse('report', kwargs={'yyyymm': yyyymm}))
+
+    def add_diary(self, day, keywords, emotion=None, dream_type=None, month=7):
+        interpretation = None
+        if keywords is not None:
+            interpretation = save_interpretation(self.user, self.DREAM, {
+                'interpretation_result': '', 'keywords_result': keywords, 'summary_result': '',
+            })
+        return Diary.objects.create(
+            user=self.user,
+            interpretation=interpretation,
+            emotion=emotion,
+            dream_type=dream_type,
+            date=timezone.make_aware(datetime(2025, month, day, 9, 0)),
+        )
+
+    def test_aggregation_and_materialized_lookup(self):
+        joy = Emotion.objects.create(icon='😊', name='기쁨')
+        fear = Emotion.objects.create(icon='😱', name='두려움')
+        self.add_diary(1, '뱀, 돈 ,물', joy, self.good)
+        self.add_diary(2, '뱀,돈', joy, self.good)
+        self.add_diary(3, '뱀, 불, 돈, 꽃', fear)
+        self.add_diary(4, '뱀', None, self.good)  # 감정 없음 -> 감정별 분석에서 제외
+        self.add_diary(5, None, joy)             # 해몽 없음
+
+        self.get_report()  # 처음 열 때 집계해서 MonthlyReport 에 저장
+        with self.assertNumQueries(3):  # 세션, 사용자, MonthlyReport
+            context = self.get_report().context
+
+        self.assertTrue(context['has_data'])
+        self.assertEqual(json.loads(context['dream_labels']), ['good', None])
+        self.assertEqual(json.loads(context['dream_data']), [3, 2])
+        emotions = dict(zip(json.loads(context['emotion_labels']), json.loads(context['emotion_data'])))
+        self.assertEqual(emotions, {'기쁨': 3, '두려움': 1, None: 1})
+        self.assertEqual(dict(json.loads(context['keywords'])), {'뱀': 4, '돈': 3, '물': 1, '불': 1, '꽃': 1})
+        self.assertEqual(context['emotion_keyword_analysis'], {
+            '😊 기쁨': ['돈', '뱀', '물'],  # 개수가 같으면 이름 순
+            '😱 두려움': ['꽃', '돈', '뱀'],
+        })
+
+    def test_analytics_matches_report(self):
+        joy = Emotion.objects.create(icon='😊', name='기쁨')
+        fear = Emotion.objects.create(icon='😱', name='두려움')
+        self.add_diary(1, '뱀, 돈, 물', joy)
+        self.add_diary(2, '돈, 꽃', joy)
+        self.add_diary(3, '불', fear)
+        self.add_diary(4, '뱀', None)
+        self.add_diary(1, '뱀, 불', fear, month=8)
+
+        month = analytics.analyze_emotion_keywords(self.user, 2025, 7)
+        self.assertEqual(month, self.get_report().context['emotion_keyword_analysis'])
+        self.assertEqual(month, {'😊 기쁨': ['돈', '꽃', '물'], '😱 두려움': ['불']})
+
+        # 기간/사용자 여러 명
+        other = User.objects.create_user(username='other', password='pw')
+        interpretation = save_interpretation(other, self.DREAM, {
+            'interpretation_result': '', 'keywords_result': '꽃', 'summary_result': '',
+        })
+        Diary.objects.create(
+            user=other, interpretation=interpretation, emotion=fear, date=timezone.make_aware(datetime(2025, 7, 9)),
+        )
+        self.assertEqual(analytics.top_keywords_by_emotion([self.user.pk, other.pk], top=1),
+                         {'😊 기쁨': ['돈'], '😱 두려움': ['불']})
+        self.assertEqual(analytics.top_keywords_by_emotion(start=timezone.make_aware(datetime(2025, 7, 5))),
+                         {'😱 두려움': ['꽃', '뱀', '불']})
+
+    def test_diary_changes_refresh_only_affected_months(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            diary = self.add_diary(1, '뱀, 돈', None, self.good)
+            self.add_diary(2, '물')
+        self.assertEqual(MonthlyReport.objects.get(yyyymm=202507).total, 2)
+
+        # 다른 달로 옮기면 두 달 모두 다시 집계
+        with self.captureOnCommitCallbacks(execute=True):
+            diary.date = timezone.make_aware(datetime(2025, 8, 1, 9, 0))
+            diary.save()
+        july = MonthlyReport.objects.get(yyyymm=202507)
+        august = MonthlyReport.objects.get(yyyymm=202508)
+        self.assertEqual((july.total, july.keyword_counts), (1, [['물', 1]]))
+        self.assertEqual((august.total, august.dream_type_counts), (1, [['good', 1]]))
+
+        # 해몽이 지워지면 키워드도 빠짐, 일기가 모두 지워지면 행도 삭제
+        with self.captureOnCommitCallbacks(execute=True):
+            diary.interpretation.delete()
+        self.assertEqual(MonthlyReport.objects.get(yyyymm=202508).keyword_counts, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Diary.objects.get(pk=diary.pk).delete()
+        self.assertFalse(MonthlyReport.objects.filter(yyyymm=202508).exists())
+
+    def test_interpretation_delete_refreshes_linked_months(self):
+        # 해몽 삭제는 일기의 해몽 연결을 UPDATE 로 끊으므로 Diary signal 이 없음 -> pre_delete 에서 연결된 달을 재집계
+        other = User.objects.create_user(username='other', password='pw')
+        with self.captureOnCommitCallbacks(execute=True):
+            july = self.add_diary(1, '뱀, 돈', None, self.good)
+            Diary.objects.create(user=self.user, interpretation=july.interpretation, date=july.date.replace(month=8))
+            Diary.objects.create(user=other, interpretation=july.interpretation, date=july.date)
+            self.add_diary(2, '물')
+        reports = {(report.user_id, report.yyyymm): report for report in MonthlyReport.objects.all()}
+        self.assertEqual(reports[(self.user.pk, 202508)].keyword_counts, [['돈', 1], ['뱀', 1]])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Interpretation.objects.filter(pk=july.interpretation_id).delete()   # QuerySet 삭제도 같은 signal
+        self.assertEqual(len(callbacks), 3)   # (사용자, 달) 마다 한 번: 내 7월, 내 8월, 다른 사용자 7월
+
+        reports = {(report.user_id, report.yyyymm): report for report in MonthlyReport.objects.all()}
+        self.assertEqual((reports[(self.user.pk, 202507)].total, reports[(self.user.pk, 202507)].keyword_counts),
+                         (2, [['물', 1]]))
+        self.assertEqual((reports[(self.user.pk, 202508)].total, reports[(self.user.pk, 202508)].keyword_counts),
+                         (1, []))
+        self.assertEqual((reports[(other.pk, 202507)].total, reports[(other.pk, 202507)].keyword_counts), (1, []))
+
+        # 사용자와 함께 지워지는 해몽은 재집계하지 않음 (리포트도 함께 지워짐)
+        interpretation = save_interpretation(other, self.DREAM, {
+            'interpretation_result': '', 'keywords_result': '꽃', 'summary_result': '',
+        })
+        Diary.objects.create(user=other, interpretation=interpretation, date=july.date)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            other.delete()
+        self.assertEqual(callbacks, [])
+        self.assertFalse(MonthlyReport.objects.filter(user_id=other.pk).exists())
+
+    def test_rebuild_reports(self):
+        self.add_diary(1, '뱀, 돈', None, self.good)
+        self.add_diary(2, '뱀', None, None, month=8)
+        # KST 8월 1일 00:30 (UTC 로는 7월 31일) -> 8월
+        Diary.objects.create(user=self.user, date=timezone.make_aware(datetime(2025, 8, 1, 0, 30)))
+        MonthlyReport.objects.create(user=self.user, yyyymm=202401, total=9)  # 일기 없는 오래된 행
+        # 키워드는 원본 문자열이 아니라 연결 테이블(InterpretationKeyword) 기준 (refresh_report 와 같게)
+        Interpretation.objects.update(keywords='문자열은 무시')
+
+        call_command('rebuild_reports', batch_size=1, stdout=StringIO())
+
+        reports = {report.yyyymm: report for report in MonthlyReport.objects.all()}
+        self.assertEqual(sorted(reports), [202507, 202508])
+        self.assertEqual(reports[202507].keyword_counts, [['돈', 1], ['뱀', 1]])
+        self.assertEqual((reports[202508].total, reports[202508].dream_type_counts), (2, [[None, 2]]))
+        for report in reports.values():
+            refreshed = refresh_report(self.user.pk, *divmod(report.yyyymm, 100))
+            self.assertEqual(
+                (report.total, report.dream_type_counts, report.emotion_counts, report.keyword_counts),
+                (refreshed.total, refreshed.dream_type_counts, refreshed.emotion_counts, refreshed.keyword_counts),
+            )
+
+    def test_empty_and_invalid_month(self):
+        self.assertFalse(self.get_report().context['has_data'])
+        self.assertFalse(self.get_report(190001).context['has_data'])
+        self.assertFalse(MonthlyReport.objects.exists())  # 빈 달은 저장하지 않음
+        self.assertEqual(self.get_report(202500).status_code, 404)
+        # 이전/다음 달이 date 범위를 넘는 달은 500 이 아니라 404
+        for yyyymm in (101, 999912):
+            self.assertEqual(self.get_report(yyyymm).status_code, 404)
+            self.assertEqual(self.client.get(reverse('diary_list', kwargs={'yyyymm': yyyymm})).status_code, 404)
+        self.assertEqual(self.get_report(999812).context['next_yyyymm'], 999901)
+
+    def test_trend_queries(self):
+        joy = Emotion.objects.create(icon='😊', name='기쁨')
+        self.add_diary(1, '뱀, 돈, 물', joy, self.good)
+        self.add_diary(2, '돈', None, self.good)
+        self.add_diary(3, None, joy)
+        self.add_diary(4, '뱀', joy, month=9)
+        # KST 8월 1일 00:30 (UTC 로는 7월 31일) -> 8월
+        Diary.objects.create(user=self.user, emotion=joy, date=timezone.make_aware(datetime(2025, 8, 1, 0, 30)))
+        # 기존 DB 처럼 position 이 0 부터 시작하지 않아도 일기 수는 그대로
+        InterpretationKeyword.objects.update(position=F('position') + 1)
+
+        with self.assertNumQueries(2):
+            trend = trend_report.build_trend(self.user.pk, 202506, 202509)
+
+        self.assertEqual((trend['start'], trend['end'], trend['bucket_months'], trend['truncated']),
+                         (202506, 202509, 1, False))
+        self.assertEqual(trend['labels'], ['2025-06', '2025-07', '2025-08', '2025-09'])
+        self.assertEqual(trend['totals'], [0, 3, 1, 1])
+        self.assertEqual(trend['dream_types'], {'labels': [None, 'good'], 'series': [[0, 1, 1, 1], [0, 2, 0, 0]]})
+        self.assertEqual(trend['emotions'], {
+            'labels': ['기쁨', None], 'icons': ['😊', None], 'series': [[0, 2, 1, 1], [0, 1, 0, 0]],
+        })
+        self.assertEqual(trend['keywords'], {
+            'labels': ['돈', '뱀', '물'], 'series': [[0, 2, 0, 0], [0, 1, 0, 1], [0, 1, 0, 0]],
+        })
+
+    def test_trend_cap_and_buckets(self):
+        self.add_diary(1, '뱀')
+        self.add_diary(1, '돈', month=1)
+
+        # 72개월 -> 최근 60개월(2021-01 ~ 2025-12)만, 3개월씩 20개 구간
+        trend = trend_report.build_trend(self.user.pk, 202001, 202512)
+        self.assertTrue(trend['truncated'])
+        self.assertEqual((trend['start'], trend['bucket_months'], len(trend['labels'])), (202101, 3, 20))
+        self.assertEqual(trend['labels'][-2:], ['2025-07~2025-09', '2025-10~2025-12'])
+        self.assertEqual(trend['totals'][-4:], [1, 0, 1, 0])
+        self.assertRaises(ValueError, trend_report.build_trend, self.user.pk, 202512, 202501)
+
+    def test_trend_api(self):
+        url = reverse('report_trend_api')
+        self.add_diary(1, '뱀')
+        data = self.client.get(url, {'start': 202507, 'end': 202507}).json()
+        self.assertEqual((data['labels'], data['totals']), (['2025-07'], [1]))
+        self.assertEqual(len(self.client.get(url, {'months': 6}).json()['labels']), 6)
+        for params in ({'months': 0}, {'months': 'x'}, {'start': 202513}, {'end': 202507}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+class KeywordTests(DiaryTestCase):
+    """해몽 키워드는 정규화해서 Keyword 로 연결되고 DB 에서 집계됨"""
+
+    def save(self, keywords):
+        return save_interpretation(self.user, self.DREAM, {
+            'interpretation_result': '', 'keywords_result': keywords, 'summary_result': '',
+        })
+
+    def test_split_keywords(self):
+        self.assertEqual(split_keywords(' 뱀,  돈 ,뱀,, Big   Snake ,big snake'), ['뱀', '돈', 'big snake'])
+        self.assertEqual(split_keywords(None), [])
+
+    def test_save_links_keywords(self):
+        self.save('뱀, 돈 ,뱀')
+        interpretation = self.save('물,  돈')
+        self.save('')
+
+        self.assertEqual(Keyword.objects.count(), 3)
+        names = interpretation.keyword_links.order_by('position').values_list('keyword__name', flat=True)
+        self.assertEqual(list(names), ['물', '돈'])
+        self.assertEqual(most_common_keywords(2, user=self.user), [('돈', 2), ('물', 1)])
+
+    def test_unmatched_keywords_are_reported(self):
+        # DB 가 이름을 다르게 비교해서 방금 만든 Keyword 를 찾지 못하는 경우 (비 binary collation) 조용히 버리지 않음
+        with mock.patch.object(Keyword.objects, 'bulk_create'), mock.patch('sys.stdout', new_callable=StringIO) as out:
+            interpretation = self.save('뱀, 돈')
+        self.assertFalse(interpretation.keyword_links.exists())
+        self.assertIn("찾지 못해 연결하지 않았습니다: ['뱀', '돈']", out.getvalue())
+
+    def test_migration_relinks_missing_keywords(self):
+        migration = importlib.import_module('dreamlens_core.migrations.0008_keyword_binary_collation')
+        linked = self.save('뱀, 돈')
+        skipped = Interpretation.objects.create(user=self.user, input_text=self.DREAM, keywords='물, 뱀')  # 0007 에서 빠진 경우
+        linked.keyword_links.filter(keyword__name='돈').delete()
+
+        with mock.patch('sys.stdout', new_callable=StringIO) as out:
+            migration.relink_keywords(django_apps, None)
+        self.assertIn('연결 3개를 추가했습니다', out.getvalue())
+        for interpretation, expected in ((linked, ['뱀', '돈']), (skipped, ['물', '뱀'])):
+            names = interpretation.keyword_links.order_by('position').values_list('keyword__name', flat=True)
+            self.assertEqual(list(names), expected)
+
+        # MySQL 에서만 Keyword.name 을 utf8mb4_bin 으로 (다른 DB 는 그대로)
+        schema_editor = mock.Mock(connection=SimpleNamespace(vendor='mysql'), quote_name=lambda name: f'`{name}`')
+        migration.use_binary_collation(django_apps, schema_editor)
+        schema_editor.execute.assert_called_once_with(
+            "ALTER TABLE `dreamlens_core_keyword` MODIFY `name` varchar(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL"
+        )
+        schema_editor = mock.Mock(connection=SimpleNamespace(vendor='sqlite'))
+        migration.use_binary_collation(django_apps, schema_editor)
+        schema_editor.execute.assert_not_called()
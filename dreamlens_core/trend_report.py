@@ -0,0 +1,125 @@
+"""
+여러 달 추이 리포트 (리포트 페이지의 월별 추이 차트)
+- 기간 전체의 일기를 월간 리포트와 같은 두 GROUP BY(diary_groups / keyword_groups)에 KST 월을 더해 한 번씩만 읽고
+  월별 꿈 종류/감정/상위 키워드 개수를 차트용 배열로 만듦 (월마다 리포트를 따로 만들지 않음)
+- 기간은 최근 MAX_MONTHS 개월까지만, 점이 MAX_POINTS 개를 넘으면 여러 달을 한 구간으로 합침
+- MySQL 에서는 TruncMonth(tzinfo) 를 쓰려면 시간대 테이블이 로드되어 있어야 함 (mysql_tzinfo_to_sql)
+"""
+import math
+from collections import Counter, defaultdict
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .diary_calendar import split_yyyymm
+from .models import Diary
+from .report_builder import diary_groups, keyword_groups, ranked
+
+SEOUL = ZoneInfo('Asia/Seoul')
+
+# 한 번에 조회하는 최대 개월 수 (넘으면 최근 달만)
+MAX_MONTHS = getattr(settings, 'TREND_MAX_MONTHS', 60)
+# 차트 점 개수 상한 (넘으면 여러 달을 한 구간으로 합침)
+MAX_POINTS = getattr(settings, 'TREND_MAX_POINTS', 24)
+# 추이를 보여줄 상위 키워드 수
+TOP_KEYWORDS = 5
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+def index_yyyymm(index):
+    year, month = divmod(index, 12)
+    return year * 100 + month + 1
+
+
+def month_start(index):
+    """KST 월초"""
+    year, month = divmod(index, 12)
+    return timezone.make_aware(datetime(year, month + 1, 1), SEOUL)
+
+
+def bucket_label(first, last):
+    """'2025-01' 또는 여러 달을 합친 구간이면 '2025-01~2025-03'"""
+    labels = [f"{index // 12}-{index % 12 + 1:02d}" for index in (first, last)]
+    return labels[0] if first == last else "~".join(labels)
+
+
+def trend_diaries(user_id, start, end):
+    """기간 안의 일기에 KST 월초(month) 를 붙인 QuerySet"""
+    return (
+        Diary.objects.filter(user_id=user_id, date__gte=start, date__lt=end)
+        .annotate(month=TruncMonth('date', tzinfo=SEOUL))
+    )
+
+
+def series(counters, points, limit=None):
+    """{이름: Counter(구간 -> 개수)} -> (이름 목록, 구간별 개수 배열) 전체 개수 많은 순으로 limit 개"""
+    totals = Counter({name: sum(counter.values()) for name, counter in counters.items()})
+    names = [name for name, _ in ranked(totals)[:limit]]
+    return names, [[counters[name][point] for point in range(points)] for name in names]
+
+
+def build_trend(user_id, start_yyyymm, end_yyyymm):
+    """
+    사용자의 start_yyyymm ~ end_yyyymm (양 끝 포함) 월별 추이
+    잘못된 연월이거나 start 가 end 보다 늦으면 ValueError
+    """
+    first = month_index(*split_yyyymm(start_yyyymm))
+    last = month_index(*split_yyyymm(end_yyyymm))
+    if first > last:
+        raise ValueError(f"시작 연월이 끝 연월보다 늦습니다: {start_yyyymm} > {end_yyyymm}")
+
+    truncated = last - first + 1 > MAX_MONTHS
+    if truncated:
+        first = last - MAX_MONTHS + 1
+    months = last - first + 1
+    bucket = math.ceil(months / MAX_POINTS)
+    points = math.ceil(months / bucket)
+
+    totals = [0] * points
+    dream_types = defaultdict(Counter)
+    emotions = defaultdict(Counter)     # (이름, 아이콘) -> 구간별 개수
+    keywords = defaultdict(Counter)
+
+    def point(month):
+        month = month.astimezone(SEOUL)  # 시간대를 지원하는 DB 는 UTC 로 돌려줌
+        return (month_index(month.year, month.month) - first) // bucket
+
+    # 일기 수는 일기 기준 GROUP BY 로, 키워드는 키워드 연결 기준 GROUP BY 로 따로 셈
+    # (한 쿼리에서 키워드 JOIN 과 함께 세면 일기가 키워드 수만큼 중복되므로)
+    diaries = trend_diaries(user_id, month_start(first), month_start(last + 1))
+    for month, dream_type, emotion_name, emotion_icon, count in diary_groups(diaries, 'month'):
+        index = point(month)
+        totals[index] += count
+        dream_types[dream_type][index] += count
+        emotions[(emotion_name, emotion_icon)][index] += count
+    if any(totals):
+        for month, _, _, keyword, count in keyword_groups(diaries, 'month'):
+            keywords[keyword][point(month)] += count
+
+    dream_labels, dream_series = series(dream_types, points)
+    emotion_keys, emotion_series = series(emotions, points)
+    keyword_labels, keyword_series = series(keywords, points, TOP_KEYWORDS)
+    return {
+        'start': index_yyyymm(first),
+        'end': index_yyyymm(last),
+        'bucket_months': bucket,
+        'truncated': truncated,
+        'labels': [
+            bucket_label(first + point * bucket, min(first + (point + 1) * bucket - 1, last))
+            for point in range(points)
+        ],
+        'totals': totals,
+        'dream_types': {'labels': dream_labels, 'series': dream_series},
+        'emotions': {
+            'labels': [name for name, _ in emotion_keys],
+            'icons': [icon for _, icon in emotion_keys],
+            'series': emotion_series,
+        },
+        'keywords': {'labels': keyword_labels, 'series': keyword_series},
+    }
@@ -1,22 +1,40 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# ASGI 로 배포할 때는 해몽/조합기를 비동기 뷰로 연결
+if getattr(settings, 'USE_ASYNC_VIEWS', False):
+    dream_interpreter_view = views.dream_interpreter_async
+    dream_combiner_view = views.dream_combiner_async
+else:
+    dream_interpreter_view = views.dream_interpreter
+    dream_combiner_view = views.dream_combiner
+
 urlpatterns = [
     # 메인 화면
     path('', views.index, name='index'),
 
     # 꿈 해몽
-    path('interpret/', views.dream_interpreter, name='dream_interpreter'),
+    path('interpret/', dream_interpreter_view, name='dream_interpreter'),
+    path('interpret/stream/', views.dream_interpreter_stream, name='dream_interpreter_stream'),
+    path('interpret/jobs/<int:job_id>/', views.interpret_job_status, name='interpret_job_status'),
 
     # 꿈 사전
     path('dict/', views.dream_dict, name='dream_dict'),
+    path('dict/api/categories/', views.dict_api_categories, name='dict_api_categories'),
+    path('dict/api/subcategories/', views.dict_api_subcategories, name='dict_api_subcategories'),
+    path('dict/api/items/', views.dict_api_items, name='dict_api_items'),
+    path('dict/api/search/', views.dict_api_search, name='dict_api_search'),
+    path('dict/api/autocomplete/', views.dict_api_autocomplete, name='dict_api_autocomplete'),
 
     # 꿈 조합기
-    path('combine/', views.dream_combiner, name='dream_combiner'),
+    path('combine/', dream_combiner_view, name='dream_combiner'),
+    path('combine/stream/', views.dream_combiner_stream, name='dream_combiner_stream'),
 
     # 꿈 일기장 -> TODO : 현정, 지우
     path('diary/list/', views.diary_list, name='diary_list_base'),  # 기본 진입: today 리다이렉트
     path('diary/list/<int:yyyymm>', views.diary_list, name='diary_list'),
+    path('diary/api/month/<int:yyyymm>/', views.diary_month_api, name='diary_month_api'),
     path('diary/write/', views.diary_write, name='diary_write'),
     path('diary/writeOk/', views.diary_writeOk, name='diary_writeOk'),
     path('diary/detail/<int:pk>/', views.diary_detail, name='diary_detail'),
@@ -27,6 +45,7 @@ urlpatterns = [
     # 분석 리포트 -> TODO : 현정, 지우
     path('report/', views.report_base, name='report_base'),
     path('report/<int:yyyymm>/', views.report, name='report'),
+    path('report/api/trend/', views.report_trend_api, name='report_trend_api'),
 
     # 로그인/로그아웃, 회원가입
     path('login/', views.login_view, name='login'),
@@ -37,4 +56,7 @@ urlpatterns = [
     path('check-username/', views.check_username, name='check_username'),
 
     path('mypage/', views.mypage, name='mypage'),
+
+    # 배포 상태 확인 (해몽 검색 파일 로드 여부)
+    path('ready/', views.readiness, name='readiness'),
 ]
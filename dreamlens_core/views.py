@@ -1,33 +1,48 @@
 # --- 표준 라이브러리 ---
 import os
 import json
-import calendar
-from collections import defaultdict, Counter
+import asyncio
+import hashlib
+import importlib
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from datetime import timezone as py_timezone
 
 # --- 서드파티 ---
-import openai
-import faiss
 import numpy as np
-import pandas as pd
-import pytz
 from dateutil.relativedelta import relativedelta
+from asgiref.sync import sync_to_async
 
 # --- Django ---
 from django.conf import settings
-from django.http import JsonResponse, HttpResponse, Http404
+from django.core.cache import cache
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render, redirect, resolve_url
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST, require_GET, condition
+from django.views.decorators.cache import cache_control
 from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.db.models import Count
+from django.utils.functional import SimpleLazyObject
+from django.db import transaction
 
 # --- 로컬 앱 ---
-from .models import Interpretation, Diary
+from .models import Interpretation, Diary, InterpretJob
 from .forms import DiaryForm
+from . import jobs
+from . import retrieval
+from . import diary_calendar
+from . import report_builder
+from . import trend_report
+from .dictionary import get_dictionary, AUTOCOMPLETE_KINDS
+from .keywords import link_keywords
+from utils.embedding_cache import get_embedding_cache
+from utils.stream_parser import SectionStreamParser
+from utils.prompt_builder import count_tokens, truncate_tokens, candidate_categories, fit_references
+from utils.knn_classifier import classify_neighbors, format_classification
+from utils.rank_fusion import reciprocal_rank_fusion
 
 User = get_user_model()
 
@@ -37,13 +52,79 @@ User = get_user_model()
 # ------------------------------
 BASE_DIR = settings.BASE_DIR
 
+# openai 패키지는 import 만으로도 느리므로 처음 쓸 때 불러옴 (API 키는 OPENAI_API_KEY 환경변수에서 자동으로 읽음)
+openai = SimpleLazyObject(lambda: importlib.import_module('openai'))
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
-else:
+if not OPENAI_API_KEY:
     print("❌ .env에 OPENAI_API_KEY가 없습니다.")
 
+# 비동기(ASGI) 뷰 전용: 프로세스 전체가 공유하는 AsyncOpenAI 클라이언트와
+# Faiss 검색/임베딩 캐시 조회를 돌릴 크기 제한 스레드 풀
+_async_openai_client = None
+RETRIEVAL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'RETRIEVAL_EXECUTOR_WORKERS', 4),
+    thread_name_prefix='retrieval',
+)
+
+
+def get_async_openai_client():
+    """공유 AsyncOpenAI 클라이언트 (첫 호출 시 생성)"""
+    global _async_openai_client
+    if _async_openai_client is None:
+        _async_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _async_openai_client
+
+
+async def run_in_retrieval_executor(func, *args):
+    """블로킹 함수를 이벤트 루프 밖의 retrieval 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(RETRIEVAL_EXECUTOR, func, *args)
+
+
+# 로그인하지 않은 사용자의 메인/꿈 사전 페이지 전체 캐시 (초, 0 이면 끔)
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+
+
+def cache_anonymous_page(view):
+    """
+    로그인하지 않은 사용자의 GET 요청은 렌더링된 페이지를 캐시에서 바로 반환
+    - 키에 꿈 사전 데이터 버전이 들어가므로 사전이 바뀌면 이전 페이지는 쓰이지 않고 만료됨
+    - 로그인 사용자는 상단바에 닉네임이 들어가므로 캐시하지 않음
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not PAGE_CACHE_TIMEOUT or request.method != 'GET' or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        try:
+            version = get_dictionary().version
+        except OSError:  # 사전 파일이 없으면 캐시 없이 렌더링
+            return view(request, *args, **kwargs)
+
+        path_hash = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+        key = f"page:{version}:{path_hash}"
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        # CSRF 토큰이 들어간 페이지는 사용자마다 달라서 캐시하지 않음
+        if response.status_code == 200 and not response.streaming and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            cache.set(key, (response.content, response['Content-Type']), PAGE_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+@sync_to_async
+def aload_user(request):
+    """social-auth 백엔드에는 aget_user 가 없어 request.auser() 대신 사용 (lazy user 를 스레드에서 평가)"""
+    request.user.is_authenticated
+    return request.user
+
 
+@cache_anonymous_page
 def index(request):
     return render(request, "main.html")
 
@@ -62,68 +143,122 @@ def custom_404(request, exception):
     return HttpResponse(html, status=404)
 
 
+def readiness(request):
+    """
+    배포/오토스케일링용 readiness 확인: 해몽 검색 파일 로드 상태와 소요 시간, 메모리
+    아직 로드 전이면 백그라운드 warmup 을 시작하고 503 을 반환
+    """
+    ready = retrieval.warmup(background=True)
+    return JsonResponse({'ready': ready, 'artifacts': retrieval.status()}, status=200 if ready else 503)
+
+
 # ------------------------------
 # 1. 꿈 해몽
 # ------------------------------
-# 필요한 파일 경로들
-INDEX_PATH = os.path.join(BASE_DIR, 'vectorDB', 'dream.index')
-METADATA_PATH = os.path.join(BASE_DIR, 'data', 'meta_dream.json')
-ORIGINAL_DATA_PATH = os.path.join(BASE_DIR, 'data', 'dream.json')
-
-faiss_index = None
-metadata = None
-categories = {"대분류": [], "소분류": []}
-
-try:
-    # Faiss 인덱스와 메타데이터 로드
-    print("✅ Django 서버 시작: 기존 인덱스와 메타데이터를 불러옵니다.")
-    faiss_index = faiss.read_index(INDEX_PATH)
-    with open(METADATA_PATH, "r", encoding="utf-8") as f:
-        metadata = json.load(f)
-
-    # 분류 기준을 위한 카테고리 정보 로드
-    with open(ORIGINAL_DATA_PATH, 'r', encoding='utf-8') as f:
-        total_data = json.load(f)
-    main_cats, sub_cats = set(), set()
-    for main_cat, sub_cat_data in total_data.items():
-        main_cats.add(main_cat.replace('"', ""))
-        for sub_cat in sub_cat_data.keys():
-            sub_cats.add(sub_cat)
-    categories["대분류"] = sorted(list(main_cats))
-    categories["소분류"] = sorted(list(sub_cats))
-
-except Exception as e:
-    print(f"⚠️ 경고: 데이터 로딩 중 오류 발생 ({e}). 해몽 기능이 정상 작동하지 않을 수 있습니다.")
+# Faiss 인덱스/메타데이터/분류 기준은 retrieval 레지스트리가 처음 쓸 때 읽음
+# 해몽 프롬프트 입력 토큰 예산
+PROMPT_BUDGET = getattr(settings, 'PROMPT_BUDGET', {})
+
+# 프롬프트에 넣을 참고 꿈 개수와 로컬 kNN 분류기 설정
+REFERENCE_K = 5
+KNN_CLASSIFIER_CONFIG = getattr(settings, 'KNN_CLASSIFIER', {})
+
+# 참고 꿈 검색: Faiss 결과와 꿈 텍스트 BM25 결과를 RRF 로 합침 (임베딩 실패 시 BM25 만 사용)
+HYBRID_RETRIEVAL_CONFIG = getattr(settings, 'HYBRID_RETRIEVAL', {})
+
+# 작업 큐 모드: 해몽을 요청 처리 중에 하지 않고 백그라운드 워커에 맡김
+INTERPRET_JOB_MODE = getattr(settings, 'INTERPRET_JOBS', {}).get('ENABLED', False)
+
+# 비슷한 꿈이 다시 들어오면 LLM 호출 없이 이전 해몽 결과를 재사용
+SEMANTIC_CACHE_CONFIG = getattr(settings, 'SEMANTIC_CACHE', {})
+semantic_cache = None
+if SEMANTIC_CACHE_CONFIG.get('ENABLED', False):
+    from utils.semantic_cache import SemanticCache
+    semantic_cache = SemanticCache(
+        threshold=SEMANTIC_CACHE_CONFIG.get('THRESHOLD', 0.95),
+        metric=SEMANTIC_CACHE_CONFIG.get('METRIC', 'cosine'),
+        ttl=SEMANTIC_CACHE_CONFIG.get('TTL', 60 * 60 * 24),
+        capacity=SEMANTIC_CACHE_CONFIG.get('CAPACITY', 5000),
+    )
 
 
 # 꿈 해몽 LLM - AI 로직 함수
-def get_embedding(text, model="text-embedding-3-small"):
-    """사용자 텍스트를 OpenAI 임베딩으로 변환하는 함수"""
-    response = openai.embeddings.create(input=[text], model=model)
-    return np.array([response.data[0].embedding], dtype='float32')
+def get_embedding(text, model="text-embedding-3-small", timeout=None):
+    """사용자 텍스트를 OpenAI 임베딩으로 변환하는 함수 (정규화 텍스트 + 모델 기준으로 캐시)"""
+    cache = get_embedding_cache()
+    vector = cache.get(text, model)
+    if vector is None:
+        options = {'timeout': timeout} if timeout else {}
+        response = openai.embeddings.create(input=[text], model=model, **options)
+        vector = cache.set(text, model, response.data[0].embedding)
+    return np.array([vector], dtype='float32')
+
+
+async def aget_embedding(text, model="text-embedding-3-small", timeout=None):
+    """get_embedding 의 비동기 버전 (캐시 조회는 스레드 풀, API 호출은 await)"""
+    cache = get_embedding_cache()
+    vector = await run_in_retrieval_executor(cache.get, text, model)
+    if vector is None:
+        options = {'timeout': timeout} if timeout else {}
+        response = await get_async_openai_client().embeddings.create(input=[text], model=model, **options)
+        vector = await run_in_retrieval_executor(cache.set, text, model, response.data[0].embedding)
+    return np.array([vector], dtype='float32')
+
+
+def embed_dream(dream):
+    """
+    해몽 검색용 임베딩
+    하이브리드 검색이 켜져 있으면 임베딩 API 가 실패하거나 제한 시간을 넘겨도 None 을 반환 → BM25 검색만으로 진행
+    """
+    if not HYBRID_RETRIEVAL_CONFIG.get('ENABLED', False):
+        return get_embedding(dream)
+    try:
+        return get_embedding(dream, timeout=HYBRID_RETRIEVAL_CONFIG.get('EMBEDDING_TIMEOUT'))
+    except openai.OpenAIError as e:
+        print(f"⚠️ 임베딩 실패 ({e.__class__.__name__}), BM25 검색 결과만 사용합니다.")
+        return None
 
 
-def generate_llm_response(user_dream, retrieved_data, categories_data):
-    """검색된 데이터와 분류 기준을 바탕으로 LLM에게 최종 답변을 요청하는 함수"""
-    retrieved_data_json = json.dumps(retrieved_data, ensure_ascii=False)
-    retrieved_items = json.loads(retrieved_data_json)
-    reference_texts = []
-    for i, item in enumerate(retrieved_items):
-        clean_dream = item.get('꿈', '').strip()
-        clean_interp = item.get('해몽', '').strip()
-        reference_texts.append(f"{i + 1}. 꿈: {clean_dream}\n   해몽: {clean_interp}")
+async def aembed_dream(dream):
+    """embed_dream 의 비동기 버전"""
+    if not HYBRID_RETRIEVAL_CONFIG.get('ENABLED', False):
+        return await aget_embedding(dream)
+    try:
+        return await aget_embedding(dream, timeout=HYBRID_RETRIEVAL_CONFIG.get('EMBEDDING_TIMEOUT'))
+    except openai.OpenAIError as e:
+        print(f"⚠️ 임베딩 실패 ({e.__class__.__name__}), BM25 검색 결과만 사용합니다.")
+        return None
 
-    reference_section = "\n\n".join(reference_texts)
 
-    prompt = f"""
-    당신은 꿈 해몽과 분류에 매우 능숙한 AI 전문가입니다. 당신의 임무는 아래 정보를 바탕으로 사용자의 꿈을 분석하고, 네 부분으로 구성된 답변을 생성하는 것입니다.
-    
-    ---
-    [분류 기준 정보]
+CLASSIFICATION_GUIDE = '`[분류시작]`으로 시작합니다. [분류 기준 정보]를 참고하여 "대분류: [선택]\n소분류: [선택]" 형식으로 꿈을 분류하세요. 일치하는 것이 없으면 "대분류: 해당 없음\n소분류: 해당 없음" 이라고 적으세요.'
+INTERPRET_GUIDES = [
+    '`[해몽시작]`으로 시작합니다. "사용자님의 꿈을 자세히 살펴보니..." 와 같이 친근한 말투로 시작하여 상세한 해몽과 따뜻한 조언을 작성하세요.',
+    '`[키워드추출]`으로 시작합니다. 꿈의 의미를 압축하는 핵심 명사 키워드 3개를 쉼표(,)로 구분해서 나열하세요.',
+    '`[요약시작]`으로 시작합니다. 상세 해몽의 내용을 세 개의 문장으로 요약합니다.',
+]
+
+
+def render_interpret_prompt(user_dream, reference_section, categories_data=None):
+    """
+    해몽 요청 프롬프트 본문
+    categories_data 가 None 이면 로컬 kNN 분류기가 이미 분류했으므로 분류 기준과 [분류시작] 부분을 뺌
+    """
+    guides = INTERPRET_GUIDES if categories_data is None else [CLASSIFICATION_GUIDE] + INTERPRET_GUIDES
+    ordinals = ["첫", "두", "세", "네"]
+    guide_section = "\n    \n    ".join(
+        f"- **{ordinals[i]} 번째 부분**: {guide}" for i, guide in enumerate(guides)
+    )
+    classification_info = "" if categories_data is None else f"""[분류 기준 정보]
     - 가능한 대분류: {categories_data['대분류']}
     - 가능한 소분류: {categories_data['소분류']}
     
-    [해몽 참고 정보]
+    """
+
+    return f"""
+    당신은 꿈 해몽과 분류에 매우 능숙한 AI 전문가입니다. 당신의 임무는 아래 정보를 바탕으로 사용자의 꿈을 분석하고, {ordinals[len(guides) - 1]} 부분으로 구성된 답변을 생성하는 것입니다.
+    
+    ---
+    {classification_info}[해몽 참고 정보]
     - 유사한 꿈 데이터베이스:
     {reference_section}
     ---
@@ -131,34 +266,254 @@ def generate_llm_response(user_dream, retrieved_data, categories_data):
     {user_dream}
     ---
     [작업 지침 및 출력 형식]:
-    당신은 반드시 아래 4개의 부분으로 구성된 답변을 생성해야 합니다.
+    당신은 반드시 아래 {len(guides)}개의 부분으로 구성된 답변을 생성해야 합니다.
     각 부분은 지정된 구분자로 시작해야 합니다.
     **절대로, 절대로 각 부분에 제목이나 번호(예: "2. 상세 해몽:")를 붙이지 마세요. 오직 내용만 작성해야 합니다.**
     
-    - **첫 번째 부분**: `[분류시작]`으로 시작합니다. [분류 기준 정보]를 참고하여 "대분류: [선택]\n소분류: [선택]" 형식으로 꿈을 분류하세요. 일치하는 것이 없으면 "대분류: 해당 없음\n소분류: 해당 없음" 이라고 적으세요.
-    
-    - **두 번째 부분**: `[해몽시작]`으로 시작합니다. "사용자님의 꿈을 자세히 살펴보니..." 와 같이 친근한 말투로 시작하여 상세한 해몽과 따뜻한 조언을 작성하세요.
-    
-    - **세 번째 부분**: `[키워드추출]`으로 시작합니다. 꿈의 의미를 압축하는 핵심 명사 키워드 3개를 쉼표(,)로 구분해서 나열하세요.
-    
-    - **네 번째 부분**: `[요약시작]`으로 시작합니다. 상세 해몽의 내용을 세 개의 문장으로 요약합니다.
+    {guide_section}
     """
+
+
+INTERPRET_SYSTEM_PROMPT = "당신은 꿈을 분석하고, 분류하고, 해몽하고, 요약하는 다재다능한 AI 전문가입니다."
+
+
+def build_interpret_messages(user_dream, retrieved_data, categories_data, classification=None):
+    """
+    검색된 데이터와 분류 기준으로 해몽 요청 메시지를 구성하는 함수
+    classification(로컬 kNN 분류 결과)이 있으면 분류는 LLM 에게 맡기지 않음
+    입력 토큰 예산(PROMPT_BUDGET)을 넘지 않도록
+    - 분류 후보는 검색된 이웃 꿈들의 대분류/소분류로 좁히고
+    - 참고 해몽은 항목별로 자르고, 예산을 넘으면 순위가 낮은 것부터 버림
+    """
+    model = PROMPT_BUDGET.get('MODEL', 'gpt-4o')
+    budget = PROMPT_BUDGET.get('INPUT_TOKENS', 3000)
+
+    user_dream = truncate_tokens(user_dream, PROMPT_BUDGET.get('DREAM_MAX_TOKENS', 1000), model)
+    candidates = None
+    if classification is None:
+        candidates = candidate_categories(retrieved_data)
+        if not candidates['대분류']:
+            candidates = categories_data
+
+    # 참고 해몽을 뺀 나머지 부분의 토큰 수를 먼저 계산하고, 남은 예산을 참고 해몽에 배분
+    base_tokens = count_tokens(INTERPRET_SYSTEM_PROMPT, model) + count_tokens(
+        render_interpret_prompt(user_dream, "", candidates), model
+    )
+    reference_texts, reference_tokens = fit_references(
+        retrieved_data,
+        budget - base_tokens,
+        per_item_max=PROMPT_BUDGET.get('REFERENCE_MAX_TOKENS', 400),
+        model=model,
+    )
+    print(
+        f"🧮 프롬프트 예상 토큰: 기본 {base_tokens} + 참고 해몽 {reference_tokens} "
+        f"({len(reference_texts)}/{len(retrieved_data)}건) = {base_tokens + reference_tokens} / 예산 {budget}"
+    )
+
+    prompt = render_interpret_prompt(user_dream, "\n\n".join(reference_texts), candidates)
+    return [
+        {"role": "system", "content": INTERPRET_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def log_token_usage(usage, label="해몽"):
+    """LLM 응답의 실제 프롬프트/완성 토큰 수를 기록"""
+    if usage is not None:
+        print(f"🧾 [{label}] 실제 토큰: 프롬프트 {usage.prompt_tokens}, 완성 {usage.completion_tokens}, 합계 {usage.total_tokens}")
+
+
+def generate_llm_response(user_dream, retrieved_data, categories_data, classification=None):
+    """검색된 데이터와 분류 기준을 바탕으로 LLM에게 최종 답변을 요청하는 함수"""
     try:
         response = openai.chat.completions.create(
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "당신은 꿈을 분석하고, 분류하고, 해몽하고, 요약하는 다재다능한 AI 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_interpret_messages(user_dream, retrieved_data, categories_data, classification),
             temperature=0.7,
         )
+        log_token_usage(response.usage)
         return response.choices[0].message.content
     except Exception as e:
         return f"AI 답변 생성 중 오류가 발생했습니다: {e}"
 
 
+async def agenerate_llm_response(user_dream, retrieved_data, categories_data, classification=None):
+    """generate_llm_response 의 비동기 버전"""
+    try:
+        response = await get_async_openai_client().chat.completions.create(
+            model="gpt-4o",
+            messages=build_interpret_messages(user_dream, retrieved_data, categories_data, classification),
+            temperature=0.7,
+        )
+        log_token_usage(response.usage)
+        return response.choices[0].message.content
+    except Exception as e:
+        return f"AI 답변 생성 중 오류가 발생했습니다: {e}"
+
+
+def parse_llm_response(raw_answer, classification=None):
+    """
+    LLM 답변을 4개의 부분(분류/해몽/키워드/요약)으로 파싱하는 함수
+    classification 이 주어지면 답변에는 [분류시작] 부분이 없으므로 그 값을 분류 결과로 사용
+    형식에 맞지 않으면 ValueError 발생
+    """
+    if classification is None:
+        _, classification_part = raw_answer.split("[분류시작]", 1)
+        classification_part, interpretation_part = classification_part.split("[해몽시작]", 1)
+    else:
+        classification_part = classification
+        _, interpretation_part = raw_answer.split("[해몽시작]", 1)
+    interpretation_part, keywords_part = interpretation_part.split("[키워드추출]", 1)
+    keywords_part, summary_part = keywords_part.split("[요약시작]", 1)
+
+    return {
+        'classification_result': classification_part.strip(),
+        'interpretation_result': interpretation_part.strip(),
+        'keywords_result': keywords_part.strip(),
+        'summary_result': summary_part.strip().replace('`', ""),
+    }
+
+
+def save_interpretation(user, dream, parsed):
+    """파싱된 해몽 결과를 해몽로그(Interpretation)로 저장하고 키워드를 Keyword 로 연결하는 함수"""
+    with transaction.atomic():
+        interpretation = Interpretation.objects.create(
+            user=user,
+            input_text=dream,
+            result=parsed['interpretation_result'],
+            keywords=parsed['keywords_result'],
+            summary=parsed['summary_result'],
+        )
+        link_keywords(interpretation)
+    return interpretation
+
+
+def retrieve_similar_dreams(query_vector, k=5, nprobe=None, ef_search=None):
+    """
+    Faiss 인덱스에서 사용자 꿈과 가장 가까운 꿈 데이터 k개를 찾는 함수
+    nprobe(IVF) / ef_search(HNSW) 를 키우면 recall 이 오르는 대신 느려짐
+    """
+    distances, indices = retrieval.search(query_vector, k, nprobe, ef_search)
+    metadata = retrieval.get('metadata')
+    results = []
+    for dist, idx in zip(distances[0], indices[0]):
+        if idx != -1:
+            results.append({**metadata[idx], 'id': int(idx), 'score': float(dist)})
+    return results
+
+
+def retrieve_hybrid(dream, query_vector, k=5, vector_k=None, nprobe=None, ef_search=None):
+    """
+    꿈 텍스트 BM25 순위와 Faiss 순위를 Reciprocal Rank Fusion 으로 합친 상위 k개
+    (합친 결과, Faiss 이웃 목록)을 반환하고, query_vector 가 None 이면 BM25 순위만 사용 (Faiss 이웃은 빈 목록)
+    """
+    candidates = max(HYBRID_RETRIEVAL_CONFIG.get('CANDIDATES', 50), k)
+    rankings = {'lexical': [idx for idx, _ in retrieval.lexical_search(dream, candidates)]}
+
+    neighbors = []
+    if query_vector is not None:
+        neighbors = retrieve_similar_dreams(query_vector, max(candidates, vector_k or 0), nprobe, ef_search)
+        rankings['vector'] = [neighbor['id'] for neighbor in neighbors[:candidates]]
+
+    fused = reciprocal_rank_fusion(
+        rankings,
+        weights={
+            'vector': HYBRID_RETRIEVAL_CONFIG.get('VECTOR_WEIGHT', 1.0),
+            'lexical': HYBRID_RETRIEVAL_CONFIG.get('LEXICAL_WEIGHT', 1.0),
+        },
+        k=HYBRID_RETRIEVAL_CONFIG.get('RRF_K', 60),
+    )
+
+    metadata = retrieval.get('metadata')
+    by_id = {neighbor['id']: neighbor for neighbor in neighbors}
+    results = [
+        {**by_id.get(idx, {**metadata[idx], 'id': idx}), 'rrf_score': score}
+        for idx, score in fused[:k]
+    ]
+    return results, neighbors
+
+
+def classify_dream(retrieved_results):
+    """
+    이웃 꿈들의 거리 가중 투표로 대분류/소분류를 정함
+    신뢰도가 임계값보다 낮거나 분류기가 꺼져 있으면 None → LLM 이 분류
+    """
+    if not KNN_CLASSIFIER_CONFIG.get('ENABLED', True):
+        return None
+    result = classify_neighbors(retrieved_results, metric=KNN_CLASSIFIER_CONFIG.get('METRIC', 'l2'))
+    if result is None:
+        return None
+
+    threshold = KNN_CLASSIFIER_CONFIG.get('THRESHOLD', 0.6)
+    if result['confidence'] < threshold:
+        print(f"🤔 kNN 분류 신뢰도 낮음 ({result['confidence']:.2f} < {threshold}), LLM 이 분류합니다.")
+        return None
+    print(f"🏷️ kNN 분류: {result['대분류']} / {result['소분류']} (신뢰도 {result['confidence']:.2f})")
+    return format_classification(result)
+
+
+def retrieve_and_classify(query_vector, dream=None, nprobe=None, ef_search=None):
+    """
+    검색 후 분류까지: (프롬프트에 넣을 참고 꿈들, 로컬 분류 결과 또는 None)
+    분류 투표에는 참고 꿈보다 많은 이웃(K)을 사용할 수 있음
+    하이브리드 검색이 켜져 있고 dream 을 주면 참고 꿈은 BM25 + Faiss 합친 순위, 분류 투표는 Faiss 이웃으로
+    """
+    knn_k = KNN_CLASSIFIER_CONFIG.get('K', REFERENCE_K)
+    if dream is not None and HYBRID_RETRIEVAL_CONFIG.get('ENABLED', False):
+        references, neighbors = retrieve_hybrid(dream, query_vector, REFERENCE_K, knn_k, nprobe, ef_search)
+    else:
+        neighbors = retrieve_similar_dreams(query_vector, k=max(REFERENCE_K, knn_k), nprobe=nprobe, ef_search=ef_search)
+        references = neighbors[:REFERENCE_K]
+    return references, classify_dream(neighbors[:knn_k])
+
+
+class LLMResponseFormatError(ValueError):
+    """LLM 답변이 구분자 형식에 맞지 않을 때 (원본 답변을 함께 보관)"""
+
+    def __init__(self, raw_answer):
+        super().__init__("LLM 답변이 지정된 형식에 맞지 않습니다.")
+        self.raw_answer = raw_answer
+
+
+def interpret_dream(dream):
+    """
+    꿈 해몽 전체 흐름: 임베딩 -> (시맨틱 캐시) -> Faiss(+BM25) 검색 -> LLM -> 파싱
+    (파싱 결과, 캐시 사용 여부)를 반환하고, 형식 오류 시 LLMResponseFormatError 발생
+    """
+    # 1. 사용자 꿈 임베딩 (하이브리드 검색에서 실패하면 None)
+    query_vector = embed_dream(dream)
+
+    # 2. 비슷한 꿈의 해몽 결과가 캐시에 있으면 재사용
+    if semantic_cache is not None and query_vector is not None:
+        cached, similarity = semantic_cache.lookup(query_vector)
+        if cached is not None:
+            print(f"♻️ 시맨틱 캐시 적중 (유사도 {similarity:.4f})")
+            return cached, True
+
+    # 3. 검색 후 LLM 호출
+    retrieved_results, classification = retrieve_and_classify(query_vector, dream)
+    raw_answer = generate_llm_response(dream, retrieved_results, retrieval.get('categories'), classification)
+
+    # 4. LLM 답변을 4개의 부분으로 파싱
+    try:
+        parsed = parse_llm_response(raw_answer, classification)
+    except ValueError:
+        raise LLMResponseFormatError(raw_answer)
+
+    if semantic_cache is not None and query_vector is not None:
+        semantic_cache.store(query_vector, parsed)
+    return parsed, False
+
+
+def enqueue_interpret_job(request, user, dream):
+    """작업 큐에 해몽 작업을 등록하고, 상태를 폴링할 수 있도록 세션에 작업 id 를 남김 (최근 20개)"""
+    job = jobs.enqueue(dream, user if user.is_authenticated else None)
+    request.session['interpret_jobs'] = request.session.get('interpret_jobs', [])[-19:] + [job.pk]
+    return job.pk
+
+
 def dream_interpreter(request):
-    context = {}
+    context = {'job_mode': INTERPRET_JOB_MODE}
 
     # GET 요청
     if request.method == "GET":
@@ -173,46 +528,26 @@ def dream_interpreter(request):
         context['dream'] = dream
         request.session['saved_dream'] = dream
 
-        if dream and faiss_index is not None:
-            # 1. 사용자 꿈 임베딩 및 Faiss 검색
-            query_vector = get_embedding(dream)
-            k = 5
-            distances, indices = faiss_index.search(query_vector, k)
-            retrieved_results = [metadata[i] for i in indices[0]]
-
-            # 2. LLM 호출하여 원본 답변 생성
-            raw_answer = generate_llm_response(dream, retrieved_results, categories)
+        if dream and retrieval.is_ready():
+            # 작업 큐 모드: 작업만 등록하고 페이지에서 상태를 폴링
+            if INTERPRET_JOB_MODE:
+                context['job_id'] = enqueue_interpret_job(request, request.user, dream)
+                return render(request, 'interpret.html', context)
 
-            # 3. LLM 답변을 4개의 부분으로 파싱
             try:
-                _, classification_part = raw_answer.split("[분류시작]", 1)
-                classification_part, interpretation_part = classification_part.split("[해몽시작]", 1)
-                interpretation_part, keywords_part = interpretation_part.split("[키워드추출]", 1)
-                keywords_part, summary_part = keywords_part.split("[요약시작]", 1)
-
-                context['classification_result'] = classification_part.strip()
-                context['interpretation_result'] = interpretation_part.strip()
-                context['keywords_result'] = keywords_part.strip()
-                context['summary_result'] = summary_part.strip().replace('`', "")
+                parsed, context['served_from_cache'] = interpret_dream(dream)
+                context.update(parsed)
 
                 # 로그인한 사용자일 시, 해몽로그를 DB 에 저장하고 해당 로그의 pk를 session 에 저장
                 # 세션에 저장된 pk로 찾아서 일기장 작성에 뿌려준다.
                 if request.user.is_authenticated:
-                    interpretation = Interpretation(
-                        user=request.user,
-                        input_text=dream,
-                        result=context['interpretation_result'],
-                        keywords=context['keywords_result'],
-                        summary=context['summary_result'],
-                    )
-
-                    interpretation.save()
+                    interpretation = save_interpretation(request.user, dream, parsed)
                     context['interpret_pk'] = interpretation.pk
 
-            except ValueError:
+            except LLMResponseFormatError as e:
                 # LLM이 형식에 맞지 않게 답변했을 경우를 대비한 예외 처리
                 context['error'] = "AI가 답변을 생성하는 데 실패했습니다. 잠시 후 다시 시도해주세요."
-                context['interpretation_result'] = raw_answer  # 원본 답변이라도 보여줌
+                context['interpretation_result'] = e.raw_answer  # 원본 답변이라도 보여줌
         else:
             # 기타 오류 처리
             if not dream:
@@ -223,59 +558,393 @@ def dream_interpreter(request):
         return render(request, 'interpret.html', context)
 
 
+def interpret_job_status(request, job_id):
+    """작업 큐 모드에서 해몽 작업의 진행 상태를 알려주는 가벼운 폴링용 엔드포인트"""
+    if job_id not in request.session.get('interpret_jobs', []):
+        raise Http404()
+
+    job = InterpretJob.objects.filter(pk=job_id).only(
+        'status', 'attempts', 'result', 'served_from_cache', 'interpretation_id', 'error', 'run_after',
+    ).first()
+    if job is None:
+        raise Http404()
+
+    data = {'status': job.status, 'attempts': job.attempts}
+    if job.status == InterpretJob.STATUS_DONE:
+        data.update(job.result or {})
+        data['interpret_pk'] = job.interpretation_id
+        data['served_from_cache'] = job.served_from_cache
+    elif job.status == InterpretJob.STATUS_FAILED:
+        data['error'] = "AI가 답변을 생성하는 데 실패했습니다. 잠시 후 다시 시도해주세요."
+    else:
+        data['queue_position'] = jobs.queue_position(job)
+    return JsonResponse(data)
+
+
+# 스트리밍 응답 (Server-Sent Events)
+INTERPRET_SECTION_MARKERS = {
+    "[분류시작]": "classification_result",
+    "[해몽시작]": "interpretation_result",
+    "[키워드추출]": "keywords_result",
+    "[요약시작]": "summary_result",
+}
+
+
+def sse_event(event, data):
+    """SSE 형식의 이벤트 문자열 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events):
+    """이벤트 제너레이터를 버퍼링 없이 흘려보내는 StreamingHttpResponse"""
+    response = StreamingHttpResponse(events, content_type="text/event-stream; charset=utf-8")
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Nginx 프록시 버퍼링 해제
+    return response
+
+
+def stream_llm_sections(messages, parser, label="해몽"):
+    """LLM 답변을 스트리밍으로 받아 파서가 나눈 (섹션명, 추가 텍스트)를 yield"""
+    stream = openai.chat.completions.create(
+        model="gpt-4o",
+        messages=messages,
+        temperature=0.7,
+        stream=True,
+        stream_options={"include_usage": True},  # 마지막 청크에 토큰 사용량 포함
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield from parser.feed(chunk.choices[0].delta.content)
+        if getattr(chunk, 'usage', None):
+            log_token_usage(chunk.usage, label)
+    yield from parser.close()
+
+
+@require_POST
+def dream_interpreter_stream(request):
+    """해몽 결과를 구분자가 도착하는 대로 섹션별로 전송하고, 스트림이 끝나면 해몽로그를 저장"""
+    dream = request.POST.get('input_text', '').strip()
+    request.session['saved_dream'] = dream
+    user = request.user if request.user.is_authenticated else None
+
+    def events():
+        if not dream:
+            yield sse_event("error", {"message": "꿈 내용을 입력해주세요."})
+            return
+        if not retrieval.is_ready():
+            yield sse_event("error", {"message": "해몽 데이터베이스를 불러올 수 없습니다. 관리자에게 문의하세요."})
+            return
+
+        try:
+            query_vector = embed_dream(dream)
+
+            cached = None
+            if semantic_cache is not None and query_vector is not None:
+                cached, _ = semantic_cache.lookup(query_vector)
+
+            if cached is not None:
+                parsed = cached
+                for section in INTERPRET_SECTION_MARKERS.values():
+                    yield sse_event("section", {"section": section, "delta": parsed[section]})
+            else:
+                retrieved_results, classification = retrieve_and_classify(query_vector, dream)
+                messages = build_interpret_messages(dream, retrieved_results, retrieval.get('categories'), classification)
+
+                # 로컬에서 분류했으면 분류 섹션은 LLM 답변을 기다리지 않고 바로 전송
+                if classification is not None:
+                    yield sse_event("section", {"section": "classification_result", "delta": classification})
+
+                parser = SectionStreamParser(INTERPRET_SECTION_MARKERS)
+                for section, delta in stream_llm_sections(messages, parser):
+                    yield sse_event("section", {"section": section, "delta": delta})
+
+                parsed = parse_llm_response(parser.text, classification)
+                if semantic_cache is not None and query_vector is not None:
+                    semantic_cache.store(query_vector, parsed)
+
+        except ValueError:
+            yield sse_event("error", {"message": "AI가 답변을 생성하는 데 실패했습니다. 잠시 후 다시 시도해주세요."})
+            return
+        except Exception as e:
+            yield sse_event("error", {"message": f"AI 답변 생성 중 오류가 발생했습니다: {e}"})
+            return
+
+        # 스트림이 모두 끝난 뒤에만 해몽로그 저장
+        interpret_pk = save_interpretation(user, dream, parsed).pk if user else None
+        yield sse_event("done", {
+            **parsed,
+            'interpret_pk': interpret_pk,
+            'served_from_cache': cached is not None,
+        })
+
+    return sse_response(events())
+
+
+async def dream_interpreter_async(request):
+    """
+    dream_interpreter 의 비동기(ASGI) 버전
+    임베딩/LLM 호출은 await, Faiss 검색은 스레드 풀, DB 저장은 sync_to_async 로 처리해
+    네트워크 I/O 를 기다리는 동안 워커 스레드를 점유하지 않음
+    """
+    context = {'job_mode': INTERPRET_JOB_MODE}
+
+    if request.method == "GET":
+        saved = await request.session.apop('saved_dream', '')
+        if saved:
+            context['dream'] = saved
+        return await sync_to_async(render)(request, 'interpret.html', context)
+
+    dream = request.POST.get('input_text', '').strip()
+    context['dream'] = dream
+    await request.session.aset('saved_dream', dream)
+    user = await aload_user(request)
+
+    if dream and await run_in_retrieval_executor(retrieval.is_ready):
+        # 작업 큐 모드: 동기 뷰와 같이 작업만 등록하고 페이지에서 상태를 폴링
+        if INTERPRET_JOB_MODE:
+            context['job_id'] = await sync_to_async(enqueue_interpret_job)(request, user, dream)
+            return await sync_to_async(render)(request, 'interpret.html', context)
+
+        query_vector = await aembed_dream(dream)
+
+        cached = None
+        if semantic_cache is not None and query_vector is not None:
+            cached, _ = await run_in_retrieval_executor(semantic_cache.lookup, query_vector)
+        context['served_from_cache'] = cached is not None
+
+        try:
+            if cached is not None:
+                parsed = cached
+            else:
+                retrieved_results, classification = await run_in_retrieval_executor(retrieve_and_classify, query_vector, dream)
+
+                raw_answer = await agenerate_llm_response(dream, retrieved_results, retrieval.get('categories'), classification)
+                parsed = parse_llm_response(raw_answer, classification)
+                if semantic_cache is not None and query_vector is not None:
+                    await run_in_retrieval_executor(semantic_cache.store, query_vector, parsed)
+
+            context.update(parsed)
+
+            if user.is_authenticated:
+                interpretation = await sync_to_async(save_interpretation)(user, dream, parsed)
+                context['interpret_pk'] = interpretation.pk
+
+        except ValueError:
+            context['error'] = "AI가 답변을 생성하는 데 실패했습니다. 잠시 후 다시 시도해주세요."
+            context['interpretation_result'] = raw_answer
+    elif not dream:
+        context['error'] = "꿈 내용을 입력해주세요."
+    else:
+        context['error'] = "해몽 데이터베이스를 불러올 수 없습니다. 관리자에게 문의하세요."
+
+    return await sync_to_async(render)(request, 'interpret.html', context)
+
+
 # ------------------------------
 # 2. 꿈 사전
 # ------------------------------
+# 사전 항목은 한 번에 이 개수씩 보여줌 (더 보기 / JSON API 페이지 크기)
+DICT_PAGE_SIZE = 50
+DICT_MAX_PAGE_SIZE = 200
+
+# dict.html 의 분류 목록/결과 목록 조각 캐시 (초, 키에 사전 데이터 버전 포함)
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0)
+
+
+@cache_anonymous_page
 def dream_dict(request):
-    # 1) 원본 JSON 로드
-    METADATA_PATH
-    with open(METADATA_PATH, encoding='utf-8') as f:
-        raw = json.load(f)
-
-    # 2) 클리닝 & 데이터 재구성
-    data = []
-    for item in raw:
-        cat = item.get('대분류', '').strip().strip('"')
-        sub = item.get('소분류', '').strip().strip('"')
-        data.append({**item, '대분류': cat, '소분류': sub})
-
-    # 3) 대분류 리스트
-    categories = sorted({d['대분류'] for d in data})
-
-    # 4) 소분류 flat 리스트 (cat-sub 쌍)
-    sub_list = []
-    seen = set()
-    for d in data:
-        pair = (d['대분류'], d['소분류'])
-        if pair not in seen:
-            seen.add(pair)
-            sub_list.append({'cat': d['대분류'], 'sub': d['소분류']})
-
-    # 5) GET 파라미터
+    # 미리 만들어 둔 사전 색인에서 조회 (meta_dream.json 이 바뀌면 자동으로 다시 만듦)
+    dictionary = get_dictionary()
+
+    # GET 파라미터
     sel_cat = request.GET.get('category', '')
     sel_sub = request.GET.get('subcategory', '')
+    query = request.GET.get('q', '').strip()
+
+    # 검색어가 있으면 꿈/해몽 텍스트 검색 결과 (첫 페이지)
+    if query:
+        total, results = dictionary.search(query, 0, DICT_PAGE_SIZE)
+        for item in results:
+            item['꿈_segments'] = highlight_segments(item.get('꿈', ''), item['highlights']['꿈'])
+            item['해몽_segments'] = highlight_segments(item.get('해몽', ''), item['highlights']['해몽'])
+        return render(request, 'dict.html', {
+            'categories': dictionary.categories,
+            'filtered': results,
+            'total': total,
+            'has_next': total > len(results),
+            'page_size': DICT_PAGE_SIZE,
+            'query': query,
+            'dict_version': dictionary.version,
+            'fragment_timeout': FRAGMENT_CACHE_TIMEOUT,
+        })
 
-    # 6) 필터링된 결과
-    filtered = []
+    # 선택한 대분류의 소분류 목록 / 선택한 (대분류, 소분류)의 첫 페이지 항목들 (나머지는 dict.js 가 API 로 가져옴)
+    sub_list = [{'cat': sel_cat, 'sub': sub} for sub in dictionary.subcategories(sel_cat)]
+    filtered, total = [], 0
     if sel_cat and sel_sub:
-        filtered = [
-            item for item in data
-            if item['대분류'] == sel_cat and item['소분류'] == sel_sub
-        ]
+        filtered = dictionary.entries(sel_cat, sel_sub, 0, DICT_PAGE_SIZE)
+        total = dictionary.count(sel_cat, sel_sub)
 
     return render(request, 'dict.html', {
-        'categories': categories,
+        'categories': dictionary.categories,
         'sub_list': sub_list,
         'filtered': filtered,
+        'total': total,
+        'has_next': total > len(filtered),
+        'page_size': DICT_PAGE_SIZE,
         'sel_cat': sel_cat,
         'sel_sub': sel_sub,
+        'dict_version': dictionary.version,
+        'fragment_timeout': FRAGMENT_CACHE_TIMEOUT,
+    })
+
+
+def highlight_segments(text, spans):
+    """하이라이트 위치를 템플릿에서 <mark> 로 감쌀 수 있게 (텍스트, 일치 여부) 조각으로 나눔"""
+    segments, position = [], 0
+    for start, end in spans:
+        if start > position:
+            segments.append((text[position:start], False))
+        segments.append((text[start:end], True))
+        position = end
+    if position < len(text):
+        segments.append((text[position:], False))
+    return segments
+
+
+# 사전 JSON API: 응답은 사전 데이터 버전(파일 내용 해시)과 수정 시각에만 의존하므로
+# ETag/Last-Modified 로 조건부 GET 을 처리해 바뀌지 않았으면 304 (본문 생성 없음)
+dictionary_conditional = condition(
+    etag_func=lambda request, *args, **kwargs: get_dictionary().version,
+    last_modified_func=lambda request, *args, **kwargs: get_dictionary().last_modified,
+)
+
+
+def dictionary_api(view):
+    """사전 API 공통: GET 전용 + 조건부 GET + 매번 재검증(no-cache)하되 프록시 캐시는 허용"""
+    return require_GET(cache_control(public=True, no_cache=True)(dictionary_conditional(view)))
+
+
+@dictionary_api
+def dict_api_categories(request):
+    dictionary = get_dictionary()
+    return JsonResponse({'version': dictionary.version, 'categories': dictionary.categories})
+
+
+@dictionary_api
+def dict_api_subcategories(request):
+    dictionary = get_dictionary()
+    category = request.GET.get('category', '')
+    return JsonResponse({
+        'version': dictionary.version,
+        'category': category,
+        'subcategories': [
+            {'name': sub, 'count': dictionary.count(category, sub)}
+            for sub in dictionary.subcategories(category)
+        ],
+    })
+
+
+@dictionary_api
+def dict_api_items(request):
+    dictionary = get_dictionary()
+    category = request.GET.get('category', '')
+    subcategory = request.GET.get('subcategory', '')
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        size = min(max(int(request.GET.get('size', DICT_PAGE_SIZE)), 1), DICT_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': "page 와 size 는 숫자여야 합니다."}, status=400)
+
+    total = dictionary.count(category, subcategory)
+    entries = dictionary.entries(category, subcategory, (page - 1) * size, size)
+    return JsonResponse({
+        'version': dictionary.version,
+        'category': category,
+        'subcategory': subcategory,
+        'page': page,
+        'size': size,
+        'total': total,
+        'has_next': page * size < total,
+        'items': [{'id': item['id'], '꿈': item.get('꿈', ''), '해몽': item.get('해몽', '')} for item in entries],
+    })
+
+
+@dictionary_api
+def dict_api_search(request):
+    """꿈/해몽 텍스트 검색 (점수 순, 필드별 하이라이트 위치 포함)"""
+    dictionary = get_dictionary()
+    query = request.GET.get('q', '').strip()
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        size = min(max(int(request.GET.get('size', DICT_PAGE_SIZE)), 1), DICT_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': "page 와 size 는 숫자여야 합니다."}, status=400)
+
+    total, results = dictionary.search(query, (page - 1) * size, size) if query else (0, [])
+    return JsonResponse({
+        'version': dictionary.version,
+        'q': query,
+        'page': page,
+        'size': size,
+        'total': total,
+        'has_next': page * size < total,
+        'items': [
+            {
+                'id': item['id'],
+                '꿈': item.get('꿈', ''),
+                '해몽': item.get('해몽', ''),
+                '대분류': item['대분류'],
+                '소분류': item['소분류'],
+                'score': item['score'],
+                'highlights': item['highlights'],
+            }
+            for item in results
+        ],
+    })
+
+
+@dictionary_api
+def dict_api_autocomplete(request):
+    """
+    접두어 자동완성 (꿈 제목/소분류/키워드, 항목 수 순)
+    kind=subcategory,keyword 처럼 종류를 골라서 요청 가능 (꿈 조합기는 키워드만)
+    """
+    dictionary = get_dictionary()
+    prefix = request.GET.get('q', '').strip()
+    kinds = [kind for kind in request.GET.get('kind', '').split(',') if kind in AUTOCOMPLETE_KINDS] or AUTOCOMPLETE_KINDS
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 20)
+    except ValueError:
+        return JsonResponse({'error': "limit 은 숫자여야 합니다."}, status=400)
+
+    return JsonResponse({
+        'version': dictionary.version,
+        'q': prefix,
+        'suggestions': dictionary.autocomplete(prefix, kinds, limit),
     })
 
 
 # ------------------------------
 # 3. 꿈 조합기
 # ------------------------------
-def generate_interpretation(keywords):
+# 같은 키워드 조합(순서/대소문자/공백 무관)은 LLM 호출 없이 이전 결과를 재사용
+# 2단 캐시로 Django 캐시를 사용하므로 precompute_combinations 로 미리 만든 결과도 공유됨 (CACHE_BACKEND=file/redis)
+COMBINE_CACHE_CONFIG = getattr(settings, 'COMBINE_CACHE', {})
+COMBINE_MODEL = "gpt-4o"
+combine_cache = None
+if COMBINE_CACHE_CONFIG.get('ENABLED', False):
+    from utils.combine_cache import CombineCache
+    combine_cache = CombineCache(
+        model=COMBINE_MODEL,
+        ttl=COMBINE_CACHE_CONFIG.get('TTL', 60 * 60 * 24 * 7),
+        capacity=COMBINE_CACHE_CONFIG.get('CAPACITY', 1000),
+        shared=cache,
+    )
+
+
+def build_combine_messages(keywords):
+    """키워드 조합 해몽 요청 메시지를 구성하는 함수"""
     keyword_text = ", ".join(keywords)
 
     prompt = f"""
@@ -315,49 +984,146 @@ def generate_interpretation(keywords):
     - 너무 단정적이기보다 조심스럽고 공감 가는 어조  
     - 이모티콘/줄임말/구어체는 사용하지 마세요.
     """
+    return [
+        {"role": "system", "content": "당신은 숙련된 꿈 해몽가입니다."},
+        {"role": "user", "content": prompt}
+    ]
 
+
+def generate_interpretation(keywords):
     response = openai.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "당신은 숙련된 꿈 해몽가입니다."},
-            {"role": "user", "content": prompt}
-        ],
+        model=COMBINE_MODEL,
+        messages=build_combine_messages(keywords),
         temperature=0.7,
     )
+    log_token_usage(response.usage, "조합기")
     return response.choices[0].message.content
 
 
+def parse_combine_response(result):
+    """조합기 답변을 [해몽]/[요약] 부분으로 나누는 함수 (형식이 다르면 전체를 해몽으로)"""
+    try:
+        _, interp = result.split("[해몽]", 1)
+        interp, summary = interp.split("[요약]", 1)
+    except ValueError:
+        interp, summary = result, ""
+    return {"interpretation": interp.strip(), "summary": summary.strip()}
+
+
+def combine_keywords(keywords):
+    """
+    키워드 조합 해몽 (조합기 캐시에 있으면 재사용): (결과 dict, 캐시 사용 여부)
+    답변 형식이 어긋나 요약이 비어 있으면 캐시하지 않음
+    """
+    if combine_cache is not None:
+        cached = combine_cache.get(keywords)
+        if cached is not None:
+            return cached, True
+
+    parsed = parse_combine_response(generate_interpretation(keywords))
+    if combine_cache is not None and parsed['summary']:
+        combine_cache.set(keywords, parsed)
+    return parsed, False
+
+
+def get_combine_keywords(data):
+    """POST 데이터에서 kw1~kw3 키워드를 꺼내는 함수"""
+    raw = {name: data.get(name, "").strip() for name in ("kw1", "kw2", "kw3")}
+    return raw, [k for k in raw.values() if k]
+
+
 def dream_combiner(request):
     context = {"loading": False}
 
     if request.method == "POST":
-        kw1 = request.POST.get("kw1", "").strip()
-        kw2 = request.POST.get("kw2", "").strip()
-        kw3 = request.POST.get("kw3", "").strip()
-
-        keywords = [k for k in [kw1, kw2, kw3] if k]
-
-        context.update({"kw1": kw1, "kw2": kw2, "kw3": kw3})
+        raw, keywords = get_combine_keywords(request.POST)
+        context.update(raw)
 
         if 1 <= len(keywords) <= 3:
             context["loading"] = True
 
-            result = generate_interpretation(keywords)
-            try:
-                _, interp = result.split("[해몽]", 1)
-                interp, summary = interp.split("[요약]", 1)
-            except:
-                interp, summary = result, ""
-
-            context.update({
-                "interpretation": interp.strip(),
-                "summary": summary.strip(),
-                "loading": False,
-            })
+            parsed, context["served_from_cache"] = combine_keywords(keywords)
+            context.update(parsed)
+            context["loading"] = False
 
     return render(request, "combine.html", context)
 
 
+COMBINE_SECTION_MARKERS = {
+    "[해몽]": "interpretation",
+    "[요약]": "summary",
+}
+
+
+@require_POST
+def dream_combiner_stream(request):
+    """키워드 조합 해몽을 [해몽]/[요약] 섹션이 도착하는 대로 SSE 로 전송"""
+    _, keywords = get_combine_keywords(request.POST)
+
+    def events():
+        if not 1 <= len(keywords) <= 3:
+            yield sse_event("error", {"message": "키워드를 1~3개 입력해주세요."})
+            return
+
+        cached = combine_cache.get(keywords) if combine_cache is not None else None
+        if cached is not None:
+            for section in COMBINE_SECTION_MARKERS.values():
+                yield sse_event("section", {"section": section, "delta": cached[section]})
+            yield sse_event("done", {**cached, 'served_from_cache': True})
+            return
+
+        parser = SectionStreamParser(COMBINE_SECTION_MARKERS)
+        try:
+            for section, delta in stream_llm_sections(build_combine_messages(keywords), parser, label="조합기"):
+                yield sse_event("section", {"section": section, "delta": delta})
+        except Exception as e:
+            yield sse_event("error", {"message": f"AI 답변 생성 중 오류가 발생했습니다: {e}"})
+            return
+
+        parsed = parse_combine_response(parser.text)
+        if combine_cache is not None and parsed['summary']:
+            combine_cache.set(keywords, parsed)
+        yield sse_event("done", {**parsed, 'served_from_cache': False})
+
+    return sse_response(events())
+
+
+async def agenerate_interpretation(keywords):
+    """generate_interpretation 의 비동기 버전"""
+    response = await get_async_openai_client().chat.completions.create(
+        model=COMBINE_MODEL,
+        messages=build_combine_messages(keywords),
+        temperature=0.7,
+    )
+    log_token_usage(response.usage, "조합기")
+    return response.choices[0].message.content
+
+
+async def dream_combiner_async(request):
+    """dream_combiner 의 비동기(ASGI) 버전"""
+    context = {"loading": False}
+
+    if request.method == "POST":
+        raw, keywords = get_combine_keywords(request.POST)
+        context.update(raw)
+
+        if 1 <= len(keywords) <= 3:
+            cached = None
+            if combine_cache is not None:
+                cached = await run_in_retrieval_executor(combine_cache.get, keywords)
+            context["served_from_cache"] = cached is not None
+
+            if cached is not None:
+                context.update(cached)
+            else:
+                parsed = parse_combine_response(await agenerate_interpretation(keywords))
+                if combine_cache is not None and parsed['summary']:
+                    await run_in_retrieval_executor(combine_cache.set, keywords, parsed)
+                context.update(parsed)
+
+    return await sync_to_async(render)(request, "combine.html", context)
+
+
 # ------------------------------
 # 4. 꿈 일기장
 # ------------------------------
@@ -368,116 +1134,45 @@ def diary_list(request, yyyymm=None):
         today = timezone.localdate()
         return redirect('diary_list', yyyymm=today.year * 100 + today.month)
 
-    # 2) 연·월 분해
-    year = yyyymm // 100
-    month = yyyymm % 100
-
-    # 3) 오늘 하이라이트용
-    today = timezone.localdate()
-    today_day = today.day if (today.year == year and today.month == month) else None
-
-    # 4) 이전/다음 달 계산
-    first_of_month = date(year, month, 1)
-    prev_dt = first_of_month - relativedelta(months=1)
-    next_dt = first_of_month + relativedelta(months=1)
-    prev_yyyymm = prev_dt.year * 100 + prev_dt.month
-    next_yyyymm = next_dt.year * 100 + next_dt.month
-
-    # 5) KST 기준 월초/다음월초를 UTC-aware로 계산
-    tz = timezone.get_current_timezone()
-    start_local = timezone.make_aware(datetime(year, month, 1, 0, 0), tz)
-    if month == 12:
-        ny, nm = year + 1, 1
-    else:
-        ny, nm = year, month + 1
-    end_local = timezone.make_aware(datetime(ny, nm, 1, 0, 0), tz)
-    start_utc = start_local.astimezone(pytz.UTC)
-    end_utc = end_local.astimezone(pytz.UTC)
-
-    # 6) 해당 기간의 일기 조회 (pk 오름차순)
-    qs = Diary.objects.filter(
-        user=request.user,
-        date__gte=start_utc,
-        date__lt=end_utc,
-    ).order_by('pk')
-
-    # 7) 날짜별 색상용 정보(day_info)와 모달용 엔트리(entries_by_day) 수집
-    day_info = {}
-    entries_by_day = defaultdict(list)
-    for entry in qs:
-        d = timezone.localtime(entry.date).day
-
-        # 첫 번째(=가장 작은 pk) 일기로만 색상 정보 등록
-        if d not in day_info:
-            day_info[d] = {
-                'pk': entry.pk,
-                'dream_type': entry.dream_type_id,
-            }
-
-        # 모달용: interpretation.input_text 앞 20자 잘라서 title로 사용
-        interp = getattr(entry, 'interpretation', None)
-        raw = interp.input_text if interp else ''
-        snippet = raw[:20] + '…' if len(raw) > 20 else raw
-
-        entries_by_day[d].append({
-            'pk': entry.pk,
-            'title': snippet,
-        })
+    # 2) 달력 데이터 (사용자·연월별 캐시, 일기가 바뀌면 signal 로 삭제)
+    try:
+        data = diary_calendar.get_month(request.user.pk, yyyymm)
+    except ValueError:
+        raise Http404()
 
-    # 8) 달력용 2D 배열 생성 (일요일 시작)
-    cal = calendar.Calendar(firstweekday=6)
-    raw_weeks = cal.monthdayscalendar(year, month)
-
-    month_days = []
-    for week in raw_weeks:
-        row = []
-        for day in week:
-            if day == 0:
-                # 빈 칸
-                row.append({
-                    'day': None,
-                    'pk': None,
-                    'is_good': False,
-                    'is_bad': False,
-                    'is_normal': False,
-                })
-            else:
-                info = day_info.get(day)
-                if info:
-                    pk = info['pk']
-                    t = info['dream_type']
-                    is_good = (t == 1)
-                    is_bad = (t == 2)
-                    is_normal = not (is_good or is_bad)
-                else:
-                    pk = None
-                    is_good = False
-                    is_bad = False
-                    is_normal = False
-
-                row.append({
-                    'day': day,
-                    'pk': pk,
-                    'is_good': is_good,
-                    'is_bad': is_bad,
-                    'is_normal': is_normal,
-                })
-        month_days.append(row)
-
-    # 9) 컨텍스트에 JSON 직렬화된 entries_by_day 포함
+    # 3) 컨텍스트에 JSON 직렬화된 entries_by_day 포함 (오늘 하이라이트는 요청마다 계산)
     context = {
-        'year': year,
-        'month': month,
-        'today_day': today_day,
-        'month_days': month_days,
-        'prev_yyyymm': prev_yyyymm,
-        'next_yyyymm': next_yyyymm,
-        'entries_by_day_json': json.dumps(entries_by_day),
+        'year': data['year'],
+        'month': data['month'],
+        'yyyymm': yyyymm,
+        'today_day': diary_calendar.today_day(data['year'], data['month']),
+        'month_days': data['month_days'],
+        'prev_yyyymm': data['prev_yyyymm'],
+        'next_yyyymm': data['next_yyyymm'],
+        'entries_by_day_json': json.dumps(data['entries_by_day']),
     }
 
     return render(request, 'diary-list.html', context)
 
 
+@login_required
+@require_GET
+def diary_month_api(request, yyyymm):
+    """달력 이전/다음 달 이동용: 한 달 치 달력 칸과 날짜별 일기 목록 (diary-list.js 가 미리 가져옴)"""
+    try:
+        data = diary_calendar.get_month(request.user.pk, yyyymm)
+    except ValueError:
+        return JsonResponse({'error': "잘못된 연월입니다."}, status=404)
+
+    response = JsonResponse({
+        **data,
+        'yyyymm': yyyymm,
+        'today_day': diary_calendar.today_day(data['year'], data['month']),
+    })
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @login_required
 def diary_detail(request, pk):
     try:
@@ -600,11 +1295,13 @@ def report_base(request):
     return redirect('report', yyyymm=yyyymm)
 
 
-# 1. 꿈 종류 및 감정 분석 차트, 꿈 키워드 클라우드
+# 꿈 종류 및 감정 분석 차트, 꿈 키워드 클라우드, 감정별 키워드 연관성 분석
 @login_required
 def report(request, yyyymm):
-    year = yyyymm // 100
-    month = yyyymm % 100
+    try:
+        year, month = diary_calendar.split_yyyymm(yyyymm)
+    except ValueError:
+        raise Http404("잘못된 연월입니다.")
 
     # 현재 연/월 기준 날짜
     today = date.today()
@@ -616,48 +1313,8 @@ def report(request, yyyymm):
     prev_yyyymm = prev_dt.year * 100 + prev_dt.month
     next_yyyymm = next_dt.year * 100 + next_dt.month
 
-    # 시작/끝 UTC
-    tz = timezone.get_current_timezone()
-    start_local = timezone.make_aware(datetime(year, month, 1), tz)
-    end_local = timezone.make_aware(datetime(next_dt.year, next_dt.month, 1), tz)
-    start_utc = start_local.astimezone(py_timezone.utc)
-    end_utc = end_local.astimezone(py_timezone.utc)
-
-    diaries = Diary.objects.filter(
-        user=request.user,
-        date__gte=start_utc,
-        date__lt=end_utc
-    ).select_related('emotion', 'dream_type', 'interpretation')
-
-    # 차트용 데이터 처리
-    dream_counts = (
-        diaries.values('dream_type__type')
-        .annotate(count=Count('id'))
-        .order_by('-count')
-    )
-    dream_labels = [item['dream_type__type'] for item in dream_counts]
-    dream_data = [item['count'] for item in dream_counts]
-
-    emotion_counts = (
-        diaries.values('emotion__name', 'emotion__icon')
-        .annotate(count=Count('id'))
-        .order_by('-count')
-    )
-    emotion_labels = [item['emotion__name'] for item in emotion_counts]
-    emotion_icons = [item['emotion__icon'] for item in emotion_counts]
-    emotion_data = [item['count'] for item in emotion_counts]
-
-    # 키워드 수집
-    keywords_counter = Counter()
-    for diary in diaries:
-        interp = diary.interpretation
-        if interp and interp.keywords:
-            keywords = [k.strip() for k in interp.keywords.split(',') if k.strip()]
-            keywords_counter.update(keywords)
-    keyword_items = list(keywords_counter.items())  # ex. [('돈', 3), ('연애', 2)]
-
-    # 감정 & 키워드 연계 분석
-    emotion_keyword_data = analyze_emotion_keywords(request.user, year, month)
+    # 해당 월의 일기를 한 번만 조회해서 차트/워드 클라우드/감정 분석을 모두 계산
+    data = report_builder.build_report(request.user.pk, year, month)
 
     context = {
         'year': year,
@@ -671,92 +1328,51 @@ def report(request, yyyymm):
         'month_list': list(range(1, 13)),
 
         # 해당 연/월에 diary 데이터 존재 여부
-        'has_data': diaries.exists(),
+        'has_data': data.has_data,
 
         # 차트 정보
-        'dream_labels': json.dumps(dream_labels, ensure_ascii=False),
-        'dream_data': json.dumps(dream_data),
-        'emotion_labels': json.dumps(emotion_labels, ensure_ascii=False),
-        'emotion_icons': json.dumps(emotion_icons, ensure_ascii=False),
-        'emotion_data': json.dumps(emotion_data),
+        'dream_labels': json.dumps([dream_type for dream_type, _ in data.dream_counts], ensure_ascii=False),
+        'dream_data': json.dumps([count for _, count in data.dream_counts]),
+        'emotion_labels': json.dumps([name for name, _, _ in data.emotion_counts], ensure_ascii=False),
+        'emotion_icons': json.dumps([icon for _, icon, _ in data.emotion_counts], ensure_ascii=False),
+        'emotion_data': json.dumps([count for _, _, count in data.emotion_counts]),
 
-        # 워드 클라우드 정보
-        'keywords': json.dumps(keyword_items, ensure_ascii=False),
+        # 워드 클라우드 정보 ex. [('돈', 3), ('연애', 2)]
+        'keywords': json.dumps(data.keyword_counts, ensure_ascii=False),
 
         # 감정 & 키워드 분석 정보
         'analysis_year': year,
         'analysis_month': month,
-        'emotion_keyword_analysis': emotion_keyword_data,
+        'emotion_keyword_analysis': data.emotion_keywords,
     }
     return render(request, 'report.html', context)
 
 
-# 2. 감정별 키워드 연관성 분석
-def analyze_emotion_keywords(user, year, month):
-    print(user)
+@login_required
+@require_GET
+def report_trend_api(request):
     """
-    특정 사용자의 지정된 월별 일기 데이터를 받아, 감정별 상위 키워드를 분석하는 함수
+    월별 추이 차트 데이터 (report.js 가 가져옴)
+    ?start=202401&end=202412 또는 ?months=12 (이번 달까지 최근 n개월, 기본 12)
     """
-    # calendar.monthrange(year, month)는 (요일, 마지막 날짜)를 반환합니다.
-    _, last_day = calendar.monthrange(year, month)
-    start_date = timezone.datetime(year, month, 1)
-    end_date = timezone.datetime(year, month, last_day, 23, 59, 59)
-
-    # 2. __range를 사용하여 해당 월의 모든 데이터를 조회합니다.
-    diaries = Diary.objects.filter(
-        user=user,
-        date__range=(start_date, end_date)
-    ).values('emotion__icon', 'emotion__name', 'interpretation__keywords')
-
-    # [디버깅] 1. 필터링된 쿼리셋 확인
-    # print("\n[Debug 1] Filtered Diaries QuerySet:")
-    # print(diaries)
-
-    if not diaries.exists():
-        return {}  # 분석할 데이터가 없으면 빈 딕셔너리를 반환합니다.
-
-    # 2. 데이터를 Pandas DataFrame으로 변환합니다.
-    df = pd.DataFrame(list(diaries))
-
-    # [디버깅] 2. 생성된 데이터프레임 확인
-    # print("\n[Debug 2] Pandas DataFrame:")
-    # print(df)
-
-    # 아이콘과 이름을 합쳐 새로운 그룹 기준 열을 만듭니다.
-    df['emotion_label'] = df['emotion__icon'] + ' ' + df['emotion__name']
-
-    # 3. 새로 만든 'emotion_label' 열로 데이터를 그룹화합니다.
-    emotion_groups = df.groupby('emotion_label')
-
-    analysis_result = {}
-
-    # 4. 각 감정 그룹을 순회하며 키워드 빈도를 계산합니다.
-    for emotion, group_df in emotion_groups:
-
-        # [디버깅] 3. 각 감정 그룹별 데이터 확인
-        # print(f"\n[Debug 3] Processing Emotion Group: {emotion}")
-        # print(group_df)
-
-        # 4-1. 해당 감정 그룹의 모든 키워드들을 하나의 리스트로 합칩니다.
-        all_keywords = []
-        for keywords in group_df['interpretation__keywords']:
-            keyword_list = [keyword.strip() for keyword in keywords.split(',')]
-            all_keywords.extend(keyword_list)
-
-        if not all_keywords:
-            continue
-
-        # 5. 키워드 빈도를 계산합니다.
-        keyword_counts = Counter(all_keywords)
-
-        # 6. 가장 빈도가 높은 상위 3개의 키워드를 추출합니다.
-        top_3_keywords = keyword_counts.most_common(3)
-
-        # 결과 딕셔너리에 저장 (키워드 이름만 저장)
-        analysis_result[emotion] = [keyword for keyword, count in top_3_keywords]
-        # print(analysis_result)
-
-    return analysis_result
+    today = timezone.localdate()
+    try:
+        if 'start' in request.GET or 'end' in request.GET:
+            start = int(request.GET['start'])
+            end = int(request.GET.get('end', today.year * 100 + today.month))
+        else:
+            months = int(request.GET.get('months', 12))
+            if months < 1:
+                raise ValueError(f"잘못된 개월 수입니다: {months}")
+            first = today - relativedelta(months=months - 1)
+            start, end = first.year * 100 + first.month, today.year * 100 + today.month
+        data = trend_report.build_trend(request.user.pk, start, end)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': "잘못된 기간입니다."}, status=400)
+
+    response = JsonResponse(data)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 # ------------------------------
@@ -79,6 +79,7 @@ WSGI_APPLICATION = 'dreamlens_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 import os
+import sys
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -155,6 +156,113 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 AUTH_USER_MODEL = 'dreamlens_core.User'
 
 
+# Django 캐시 (배포 환경마다 CACHE_BACKEND 로 선택)
+# locmem: 프로세스별 메모리 (기본값) / file: CACHE_LOCATION 폴더를 워커끼리 공유 / redis: CACHE_LOCATION 의 Redis 서버 (redis 패키지 필요)
+# 테스트 실행 시에는 외부 서버 없이 locmem 사용
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_BACKEND = 'locmem' if 'test' in sys.argv else os.getenv('CACHE_BACKEND', 'locmem').lower()
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': {
+            'locmem': 'dreamlens',
+            'file': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+            'redis': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }[CACHE_BACKEND],
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 60 * 10)),
+        'KEY_PREFIX': 'dreamlens',
+    }
+}
+
+# 로그인하지 않은 사용자의 메인/꿈 사전 페이지 전체 캐시, 꿈 사전 결과 목록 조각 캐시 (초, 0 이면 끔)
+# 꿈 사전 데이터 버전이 키에 들어가므로 meta_dream.json 이 바뀌면 자동으로 새로 렌더링
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 60 * 10))
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', 60 * 60))
+
+# 일기장 달력 (사용자, 연월) 캐시 (초, 일기가 저장/삭제되면 signal 로 바로 지움)
+DIARY_CALENDAR_CACHE_TIMEOUT = int(os.getenv('DIARY_CALENDAR_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# 리포트 월별 추이: 한 번에 조회하는 최대 개월 수, 차트 점 개수 상한 (넘으면 여러 달을 한 구간으로 합침)
+TREND_MAX_MONTHS = int(os.getenv('TREND_MAX_MONTHS', 60))
+TREND_MAX_POINTS = int(os.getenv('TREND_MAX_POINTS', 24))
+
+# 해몽 결과 시맨틱 캐시 (질의 임베딩이 가까우면 LLM 호출 없이 이전 결과 재사용)
+# METRIC: 'cosine'(THRESHOLD 이상이면 적중) 또는 'l2'(THRESHOLD 이하이면 적중)
+SEMANTIC_CACHE = {
+    'ENABLED': os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true',
+    'METRIC': os.getenv('SEMANTIC_CACHE_METRIC', 'cosine'),
+    'THRESHOLD': float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.95)),
+    'TTL': int(os.getenv('SEMANTIC_CACHE_TTL', 60 * 60 * 24)),  # 초 단위, 기본 하루
+    'CAPACITY': int(os.getenv('SEMANTIC_CACHE_CAPACITY', 5000)),
+}
+
+# 꿈 조합기 결과 캐시 (키워드 순서/대소문자/공백이 달라도 같은 조합이면 LLM 호출 없이 재사용)
+# 프로세스 메모리 LRU(CAPACITY 개) + Django 캐시(CACHES) 2단, TTL 초 단위
+COMBINE_CACHE = {
+    'ENABLED': os.getenv('COMBINE_CACHE_ENABLED', 'true').lower() == 'true',
+    'TTL': int(os.getenv('COMBINE_CACHE_TTL', 60 * 60 * 24 * 7)),  # 기본 7일
+    'CAPACITY': int(os.getenv('COMBINE_CACHE_CAPACITY', 1000)),
+}
+
+# 해몽 프롬프트 입력 토큰 예산 (tiktoken 으로 계산)
+PROMPT_BUDGET = {
+    'MODEL': 'gpt-4o',
+    'INPUT_TOKENS': int(os.getenv('PROMPT_INPUT_TOKENS', 3000)),  # 시스템 + 사용자 메시지 전체
+    'DREAM_MAX_TOKENS': int(os.getenv('PROMPT_DREAM_MAX_TOKENS', 1000)),  # 사용자 꿈 이야기
+    'REFERENCE_MAX_TOKENS': int(os.getenv('PROMPT_REFERENCE_MAX_TOKENS', 400)),  # 참고 해몽 1건
+}
+
+# 해몽 검색 파일(Faiss 인덱스/메타데이터) 미리 로드: off(처음 쓸 때 로드) / background / blocking
+RETRIEVAL_WARMUP = os.getenv('RETRIEVAL_WARMUP', 'off').lower()
+
+# Faiss 인덱스를 mmap 으로 열어 여러 워커 프로세스가 메모리를 공유 (읽기 전용)
+FAISS_INDEX_MMAP = os.getenv('FAISS_INDEX_MMAP', 'false').lower() == 'true'
+
+# Faiss 검색 시점 파라미터 (비워두면 인덱스 생성 시 저장한 값 사용)
+# NPROBE: IVF 계열에서 탐색할 군집 수 / EF_SEARCH: HNSW 탐색 폭 → 클수록 정확하지만 느림
+FAISS_SEARCH = {
+    'NPROBE': int(os.getenv('FAISS_NPROBE', 0)) or None,
+    'EF_SEARCH': int(os.getenv('FAISS_EF_SEARCH', 0)) or None,
+}
+
+# 해몽 분류를 LLM 대신 Faiss 이웃 꿈들의 거리 가중 투표로 결정 (신뢰도가 임계값 미만이면 LLM 이 분류)
+KNN_CLASSIFIER = {
+    'ENABLED': os.getenv('KNN_CLASSIFIER_ENABLED', 'true').lower() == 'true',
+    'K': int(os.getenv('KNN_CLASSIFIER_K', 10)),  # 투표에 참여하는 이웃 수
+    'THRESHOLD': float(os.getenv('KNN_CLASSIFIER_THRESHOLD', 0.6)),  # 0~1
+    'METRIC': 'l2',  # vectorDB/dream.index 가 IndexFlatL2
+}
+
+# 참고 꿈 하이브리드 검색: Faiss 순위와 꿈 텍스트 BM25 순위를 Reciprocal Rank Fusion 으로 합침
+# 임베딩 API 가 실패하거나 EMBEDDING_TIMEOUT(초, 요청 1회 기준)을 넘기면 BM25 결과만으로 해몽
+HYBRID_RETRIEVAL = {
+    'ENABLED': os.getenv('HYBRID_RETRIEVAL_ENABLED', 'false').lower() == 'true',
+    'VECTOR_WEIGHT': float(os.getenv('HYBRID_VECTOR_WEIGHT', 1.0)),
+    'LEXICAL_WEIGHT': float(os.getenv('HYBRID_LEXICAL_WEIGHT', 1.0)),
+    'RRF_K': int(os.getenv('HYBRID_RRF_K', 60)),  # 클수록 상위 순위의 영향이 줄어듦
+    'CANDIDATES': int(os.getenv('HYBRID_CANDIDATES', 50)),  # 방식별로 합치기 전에 가져올 후보 수
+    'EMBEDDING_TIMEOUT': float(os.getenv('HYBRID_EMBEDDING_TIMEOUT', 5)),
+}
+
+# ASGI(uvicorn/daphne 등)로 배포할 때 해몽/조합기를 비동기 뷰로 서빙
+USE_ASYNC_VIEWS = os.getenv('USE_ASYNC_VIEWS', 'false').lower() == 'true'
+
+# 비동기 뷰에서 Faiss 검색/캐시 조회를 돌릴 스레드 수
+RETRIEVAL_EXECUTOR_WORKERS = int(os.getenv('RETRIEVAL_EXECUTOR_WORKERS', 4))
+
+# 해몽 작업 큐 모드 (요청 처리 중에 LLM 을 호출하지 않고 run_interpret_workers 워커에 맡김)
+INTERPRET_JOBS = {
+    'ENABLED': os.getenv('INTERPRET_JOBS_ENABLED', 'false').lower() == 'true',
+    'MAX_ATTEMPTS': int(os.getenv('INTERPRET_JOBS_MAX_ATTEMPTS', 3)),
+    'BACKOFF_SECONDS': int(os.getenv('INTERPRET_JOBS_BACKOFF_SECONDS', 5)),  # 재시도마다 2배
+    'LEASE_SECONDS': int(os.getenv('INTERPRET_JOBS_LEASE_SECONDS', 300)),
+}
+
+
 # 브라우저 닫으면 세션 만료
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
@@ -0,0 +1,91 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def normalize_keywords(keywords):
+    """키워드 순서/대소문자/공백 차이를 없앤 정렬된 튜플 (중복 제거)"""
+    normalized = {" ".join(keyword.casefold().split()) for keyword in keywords}
+    normalized.discard("")
+    return tuple(sorted(normalized))
+
+
+def make_key(keywords, model):
+    """정규화된 키워드 집합 + 모델명으로 만든 캐시 키 ('뱀, 불' 과 '불, 뱀' 이 같은 키)"""
+    payload = "\x00".join((model,) + normalize_keywords(keywords)).encode('utf-8')
+    return "combine:" + hashlib.sha256(payload).hexdigest()
+
+
+class CombineCache:
+    """
+    꿈 조합기 결과 2단 캐시
+    - 1단: 프로세스 내부 LRU (OrderedDict, TTL 지나면 버림)
+    - 2단: shared (Django 캐시 등 get/set 을 가진 객체) -> 다른 워커나 precompute_combinations 명령이 만든 결과도 사용
+    """
+
+    def __init__(self, model, ttl=60 * 60 * 24 * 7, capacity=1_000, shared=None):
+        self.model = model
+        self.ttl = ttl
+        self.capacity = capacity
+        self.shared = shared
+
+        self._memory = OrderedDict()  # key -> (저장 시각, 결과 dict)
+        self._lock = threading.Lock()
+
+        self.stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created_at, result = entry
+            if time.time() - created_at >= self.ttl:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return result
+
+    def _memory_set(self, key, result, created_at=None):
+        with self._lock:
+            self._memory[key] = (created_at or time.time(), result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.capacity:
+                self._memory.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get(self, keywords):
+        """캐시에 있으면 결과 dict, 없으면 None"""
+        key = make_key(keywords, self.model)
+
+        result = self._memory_get(key)
+        if result is not None:
+            self.stats['memory_hits'] += 1
+            return result
+
+        if self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                created_at, result = entry
+                # 메모리에도 올리되 만료 시각은 처음 저장한 때 기준
+                self._memory_set(key, result, created_at)
+                self.stats['shared_hits'] += 1
+                return result
+
+        self.stats['misses'] += 1
+        return None
+
+    def set(self, keywords, result):
+        key = make_key(keywords, self.model)
+        created_at = time.time()
+        self._memory_set(key, result, created_at)
+        if self.shared is not None:
+            self.shared.set(key, (created_at, result), self.ttl)
+        return result
+
+    def info(self):
+        """hit/miss 카운터와 메모리 항목 수"""
+        total = self.stats['memory_hits'] + self.stats['shared_hits'] + self.stats['misses']
+        hits = self.stats['memory_hits'] + self.stats['shared_hits']
+        return {**self.stats, 'hit_rate': hits / total if total else 0.0, 'memory_entries': len(self._memory)}
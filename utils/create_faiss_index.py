@@ -1,6 +1,10 @@
+import sys
+
 from utils.faiss_helper import build_index
 
 if __name__ == "__main__":
     json_path = "data/nate_dream_interpretation_final.json"
-    build_index(json_path)
+    # 인덱스 스펙 (예: python -m utils.create_faiss_index "HNSW,M=32,efSearch=64")
+    spec = sys.argv[1] if len(sys.argv) > 1 else "Flat"
+    build_index(json_path, spec)
     print("FAISS 인덱스 생성 완료 ✅")
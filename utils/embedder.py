@@ -2,14 +2,17 @@ import os
 import openai
 from dotenv import load_dotenv
 
+from utils.embedding_cache import get_embedding_cache
+
 load_dotenv()
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
-def embed_text(texts):
+def embed_text(texts, model="text-embedding-3-small"):
     """
     텍스트 리스트를 받아 OpenAI 임베딩을 수행한 후 벡터 리스트 반환
+    이미 임베딩한 텍스트는 캐시에서 꺼내고, 캐시에 없는 텍스트만 API로 요청
     """
     if not isinstance(texts, list):
         raise ValueError("입력은 리스트 형태여야 합니다.")
@@ -20,19 +23,25 @@ def embed_text(texts):
     if not cleaned:
         raise ValueError("임베딩할 텍스트가 없습니다.")
 
-    print(f"🚀 임베딩 요청: {len(cleaned)}개")
+    # 캐시 조회 -> 없는 것만 모아서 요청
+    cache = get_embedding_cache()
+    vectors = [cache.get(text, model) for text in cleaned]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+
+    print(f"🚀 임베딩 요청: {len(missing)}개 (캐시 적중 {len(cleaned) - len(missing)}개)")
 
     # 배치 처리 (OpenAI 제한 회피)
-    vectors = []
     batch_size = 100  # 적당한 크기 (조정 가능)
-    for i in range(0, len(cleaned), batch_size):
-        batch = cleaned[i:i + batch_size]
+    for i in range(0, len(missing), batch_size):
+        batch_idx = missing[i:i + batch_size]
+        batch = [cleaned[j] for j in batch_idx]
         print(f"✅ Batch {i // batch_size + 1} completed. ({len(batch)} items)")
 
         response = openai.embeddings.create(
             input=batch,
-            model="text-embedding-3-small"
+            model=model
         )
-        vectors.extend([d.embedding for d in response.data])
+        for j, d in zip(batch_idx, response.data):
+            vectors[j] = cache.set(cleaned[j], model, d.embedding)
 
-    return vectors
+    return [v.tolist() for v in vectors]
@@ -0,0 +1,219 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 캐시 DB 기본 경로 (프로젝트 루트의 vectorDB 폴더)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, 'vectorDB', 'embedding_cache.sqlite3')
+
+
+def normalize_text(text):
+    """공백/줄바꿈 차이만 있는 텍스트가 같은 키를 갖도록 정규화"""
+    return " ".join(text.split())
+
+
+def make_key(text, model):
+    """정규화된 텍스트 + 모델명으로 content-addressed 키 생성"""
+    payload = f"{model}\x00{normalize_text(text)}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    임베딩 벡터 2단 캐시
+    - 1단: 프로세스 내부 LRU (OrderedDict)
+    - 2단: SQLite 파일 (WAL 모드) -> 같은 서버의 모든 WSGI/ASGI 워커가 공유
+    - 디스크 hit 의 accessed_at 갱신은 조회마다 쓰지 않고 모아 두었다가 한 트랜잭션으로 반영
+      (touch_batch 개가 쌓이거나 evict 직전)
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=100_000, memory_entries=2_000, touch_batch=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.touch_batch = touch_batch
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._inserts_since_evict = 0
+        self._touched = {}  # 아직 디스크에 반영하지 않은 key -> 마지막 사용 시각
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if self.path:
+            # 'embeddings.sqlite3' 처럼 파일 이름만 주면 dirname 이 '' 이므로 절대 경로로 바꿔서 폴더 생성
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._init_db()
+
+    # --- SQLite 연결 (스레드마다 별도 커넥션) ---
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key         TEXT PRIMARY KEY,
+                model       TEXT NOT NULL,
+                dim         INTEGER NOT NULL,
+                vector      BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+        )
+
+    # --- 1단: 메모리 LRU ---
+    def _memory_get(self, key):
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+            return vector
+
+    def _memory_set(self, key, vector):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    # --- accessed_at 갱신 모아서 쓰기 ---
+    def _touch(self, key):
+        with self._lock:
+            self._touched[key] = time.time()
+            full = len(self._touched) >= self.touch_batch
+        if full:
+            self.flush_touches()
+
+    def flush_touches(self):
+        """모아 둔 accessed_at 갱신을 한 트랜잭션으로 디스크에 반영"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched or not self.path:
+            return 0
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "UPDATE embeddings SET accessed_at = ? WHERE key = ? AND accessed_at < ?",
+                [(accessed_at, key, accessed_at) for key, accessed_at in touched.items()],
+            )
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return len(touched)
+
+    # --- 조회/저장 ---
+    def get(self, text, model):
+        """캐시에 있으면 float32 벡터, 없으면 None"""
+        key = make_key(text, model)
+
+        vector = self._memory_get(key)
+        if vector is not None:
+            self._count('memory_hits')
+            return vector
+
+        if self.path:
+            row = self._connect().execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                vector = np.frombuffer(row[0], dtype='float32')
+                self._memory_set(key, vector)
+                self._touch(key)
+                self._count('disk_hits')
+                return vector
+
+        self._count('misses')
+        return None
+
+    def set(self, text, model, vector):
+        """벡터를 두 단계 캐시에 모두 저장하고 float32 배열로 반환"""
+        key = make_key(text, model)
+        vector = np.asarray(vector, dtype='float32')
+        self._memory_set(key, vector)
+
+        if self.path:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, vector.shape[0], vector.tobytes(), time.time()),
+            )
+            with self._lock:
+                self._inserts_since_evict += 1
+                due = self._inserts_since_evict >= 100
+            # 매 삽입마다 COUNT(*) 하지 않도록 일정 횟수마다 정리
+            if due:
+                self.evict()
+        return vector
+
+    def evict(self):
+        """디스크 캐시가 max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            self._inserts_since_evict = 0
+        if not self.path:
+            return 0
+        self.flush_touches()  # 최근 사용한 항목이 지워지지 않도록 먼저 반영
+        conn = self._connect()
+        count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+            (overflow,),
+        )
+        self._count('evictions', overflow)
+        return overflow
+
+    def info(self):
+        """hit/miss 카운터와 현재 캐시 크기"""
+        with self._lock:
+            stats = dict(self.stats)
+            memory_entries = len(self._memory)
+        total = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        hits = stats['memory_hits'] + stats['disk_hits']
+        disk_entries = 0
+        if self.path:
+            disk_entries = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            **stats,
+            'hit_rate': hits / total if total else 0.0,
+            'memory_entries': memory_entries,
+            'disk_entries': disk_entries,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """환경변수 설정을 읽어 프로세스당 하나의 EmbeddingCache를 돌려줌"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = os.getenv('EMBEDDING_CACHE_PATH', DEFAULT_CACHE_PATH)
+                _cache = EmbeddingCache(
+                    path=path if path.lower() not in ('', 'off', 'none') else None,
+                    max_entries=int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', 100_000)),
+                    memory_entries=int(os.getenv('EMBEDDING_CACHE_MEMORY_ENTRIES', 2_000)),
+                )
+    return _cache
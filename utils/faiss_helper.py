@@ -8,8 +8,134 @@ from utils.embedder import embed_text
 INDEX_PATH = "vectorDB/dream.index"
 META_PATH = "vectorDB/dream_meta.json"
 
+# 인덱스 종류별 기본 파라미터
+# - Flat: 전체 벡터와 정확히 비교 (수천 건까지는 충분)
+# - IVFFlat: nlist 개 군집 중 nprobe 개만 탐색
+# - HNSW: 그래프 탐색, M(이웃 수) / efConstruction(구축 시 탐색 폭) / efSearch(검색 시 탐색 폭)
+# - IVFPQ: IVF + Product Quantization 으로 벡터를 m 개 조각 x nbits 로 압축 (m 은 차원의 약수)
+INDEX_DEFAULTS = {
+    "Flat": {},
+    "IVFFlat": {"nlist": 1024, "nprobe": 16},
+    "HNSW": {"M": 32, "efConstruction": 200, "efSearch": 64},
+    "IVFPQ": {"nlist": 1024, "m": 64, "nbits": 8, "nprobe": 16},
+}
+
+
+def parse_index_spec(spec="Flat"):
+    """
+    인덱스 스펙을 {"type": ..., 파라미터...} dict 로 변환
+    문자열 예: "Flat", "IVFFlat,nlist=1024,nprobe=16", "HNSW,M=32,efSearch=64", "IVFPQ,nlist=1024,m=64,nbits=8"
+    """
+    if isinstance(spec, dict):
+        params = dict(spec)
+        index_type = params.pop("type", "Flat")
+    else:
+        index_type, *options = [part.strip() for part in spec.split(",") if part.strip()]
+        params = {}
+        for option in options:
+            key, value = option.split("=", 1)
+            params[key.strip()] = int(value)
+
+    if index_type not in INDEX_DEFAULTS:
+        raise ValueError(f"지원하지 않는 인덱스 종류입니다: {index_type} (가능: {', '.join(INDEX_DEFAULTS)})")
+    unknown = set(params) - set(INDEX_DEFAULTS[index_type])
+    if unknown:
+        raise ValueError(f"{index_type} 인덱스에 없는 파라미터입니다: {', '.join(sorted(unknown))}")
+    return {"type": index_type, **INDEX_DEFAULTS[index_type], **params}
+
+
+def create_index(dim, spec, n_train):
+    """스펙대로 (아직 학습/추가 전인) L2 인덱스 생성"""
+    index_type = spec["type"]
+    if index_type == "Flat":
+        return faiss.IndexFlatL2(dim)
+    if index_type == "HNSW":
+        index = faiss.IndexHNSWFlat(dim, spec["M"])
+        index.hnsw.efConstruction = spec["efConstruction"]
+        return index
+
+    # IVF 계열: 군집당 학습 벡터가 39개 이상 되도록 nlist 를 줄임 (Faiss 권장치)
+    nlist = max(1, min(spec["nlist"], n_train // 39))
+    if nlist != spec["nlist"]:
+        print(f"⚠️ 학습 벡터 {n_train}개로는 nlist={spec['nlist']} 이 너무 커서 {nlist} 로 줄입니다.")
+        spec["nlist"] = nlist
+        spec["nprobe"] = min(spec["nprobe"], nlist)
+
+    quantizer = faiss.IndexFlatL2(dim)
+    if index_type == "IVFFlat":
+        return faiss.IndexIVFFlat(quantizer, dim, nlist)
+    if dim % spec["m"]:
+        raise ValueError(f"IVFPQ 의 m({spec['m']})은 벡터 차원({dim})의 약수여야 합니다.")
+    return faiss.IndexIVFPQ(quantizer, dim, nlist, spec["m"], spec["nbits"])
+
+
+def train_index(vectors, spec):
+    """float32 벡터 배열로 스펙대로 인덱스를 만들고 (IVF 계열은 학습 후) 벡터를 추가"""
+    index = create_index(vectors.shape[1], spec, len(vectors))
+    if not index.is_trained:
+        print(f"🏋️ {spec['type']} 인덱스 학습 중... ({len(vectors)}개)")
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def index_params_path(index_path):
+    """인덱스 파라미터는 인덱스 파일 옆에 <인덱스 파일명>.json 으로 저장"""
+    return f"{index_path}.json"
+
+
+def save_index_params(index, spec, index_path=INDEX_PATH):
+    params = {**spec, "dim": index.d, "ntotal": index.ntotal, "metric": "l2"}
+    with open(index_params_path(index_path), 'w', encoding='utf-8') as f:
+        json.dump(params, f, ensure_ascii=False, indent=2)
+    return params
+
+
+def load_index_params(index_path=INDEX_PATH):
+    """저장된 인덱스 파라미터 (파라미터 파일이 없던 예전 인덱스는 Flat)"""
+    path = index_params_path(index_path)
+    if not os.path.exists(path):
+        return {"type": "Flat"}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_index(index_path=INDEX_PATH, mmap=False, params=None):
+    """
+    인덱스 읽기
+    mmap=True 이면 벡터를 프로세스 메모리로 복사하지 않고 파일을 mmap 으로 열어
+    같은 서버의 여러 워커가 OS 페이지 캐시 한 벌을 공유함 (읽기 전용)
+    - IVF 계열: inverted list 를 디스크에서 mmap (IO_FLAG_MMAP)
+    - Flat/HNSW: 벡터 코드를 제자리 mmap (IO_FLAG_MMAP_IFC, HNSW 그래프 자체는 메모리에 올라감)
+    """
+    if not mmap:
+        return faiss.read_index(index_path)
+
+    params = params or load_index_params(index_path)
+    if params.get("type", "Flat").startswith("IVF"):
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+    elif hasattr(faiss, "IO_FLAG_MMAP_IFC"):
+        flags = faiss.IO_FLAG_MMAP_IFC
+    else:
+        print("⚠️ 설치된 Faiss 가 Flat 인덱스 mmap 을 지원하지 않아 메모리로 읽습니다.")
+        flags = 0
+    return faiss.read_index(index_path, flags)
+
+
+def make_search_params(index, nprobe=None, ef_search=None):
+    """
+    검색 시점 파라미터 (recall 과 지연 시간의 trade-off)
+    인덱스 객체를 바꾸지 않고 검색 호출마다 넘기므로 여러 스레드에서 동시에 써도 안전
+    해당 없는 인덱스(Flat)면 None
+    """
+    if nprobe is not None and faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(nprobe=int(nprobe))
+    if ef_search is not None and isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    return None
 
-def build_index(json_path):
+
+def build_index(json_path, spec="Flat", index_path=INDEX_PATH, meta_path=META_PATH):
     with open(json_path, 'r', encoding='utf-8') as f:
         raw_data = json.load(f)
 
@@ -33,43 +159,61 @@ def build_index(json_path):
 
     vectors = embed_text(texts)
 
-    # FAISS 인덱스 구성
-    dim = len(vectors[0])
-    index = faiss.IndexFlatL2(dim)
-    index.add(np.array(vectors).astype('float32'))
+    # FAISS 인덱스 구성 (IVF 계열은 전체 벡터로 군집/양자화 학습 후 추가)
+    spec = parse_index_spec(spec)
+    index = train_index(np.array(vectors).astype('float32'), spec)
 
-    faiss.write_index(index, INDEX_PATH)
+    faiss.write_index(index, index_path)
+    params = save_index_params(index, spec, index_path)
 
-    with open(META_PATH, 'w', encoding='utf-8') as f:
+    with open(meta_path, 'w', encoding='utf-8') as f:
         json.dump(metas, f, ensure_ascii=False, indent=2)
 
-    print(f"✅ 인덱스와 메타데이터 저장 완료!")
+    print(f"✅ 인덱스와 메타데이터 저장 완료! ({params})")
+
 
+def apply_search_defaults(index, params):
+    """저장된 nprobe/efSearch 를 인덱스 기본값으로 (검색마다 값을 넘기지 않으면 이 값으로 검색)"""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and params.get("nprobe"):
+        ivf.nprobe = params["nprobe"]
+    if isinstance(index, faiss.IndexHNSW) and params.get("efSearch"):
+        index.hnsw.efSearch = params["efSearch"]
+    return index
 
-def load_faiss_index():
-    # FAISS 인덱스 및 메타데이터 불러오기
-    if not os.path.exists(INDEX_PATH) or not os.path.exists(META_PATH):
+
+def load_faiss_index(index_path=INDEX_PATH, meta_path=META_PATH, mmap=False):
+    """
+    FAISS 인덱스 및 메타데이터 불러오기
+    인덱스 옆에 저장된 파라미터의 nprobe/efSearch 를 검색 기본값으로 설정 (파라미터는 load_index_params 로)
+    """
+    if not os.path.exists(index_path) or not os.path.exists(meta_path):
         raise FileNotFoundError("FAISS 인덱스 또는 메타데이터 파일이 존재하지 않습니다.")
 
-    index = faiss.read_index(INDEX_PATH)
+    params = load_index_params(index_path)
+    index = apply_search_defaults(read_index(index_path, mmap=mmap, params=params), params)
 
-    with open(META_PATH, "r", encoding="utf-8") as f:
+    with open(meta_path, "r", encoding="utf-8") as f:
         metadata = json.load(f)
 
     return index, metadata
 
 
-def search_similar_dreams(query, index, metadata, top_k=5):
+def search_similar_dreams(query, index, metadata, top_k=5, nprobe=None, ef_search=None):
     # 쿼리 임베딩
     query_vector = np.array(embed_text([query])).astype("float32")
 
-    # 유사도 검색
-    distances, indices = index.search(query_vector, top_k)
+    # 유사도 검색 (nprobe/ef_search 로 정확도와 속도 조절)
+    params = make_search_params(index, nprobe, ef_search)
+    if params is None:
+        distances, indices = index.search(query_vector, top_k)
+    else:
+        distances, indices = index.search(query_vector, top_k, params=params)
 
     # 결과 구성
     results = []
     for dist, idx in zip(distances[0], indices[0]):
-        if idx < len(metadata):
+        if 0 <= idx < len(metadata):
             result = metadata[idx].copy()
             result["score"] = float(dist)
             results.append(result)
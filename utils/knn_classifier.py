@@ -0,0 +1,63 @@
+from collections import defaultdict
+
+
+def clean_label(value):
+    return (value or '').strip().strip('"').strip()
+
+
+def neighbor_weight(score, metric="l2"):
+    """
+    검색 점수를 투표 가중치로 변환
+    - l2: IndexFlatL2 의 제곱 거리 → 가까울수록 큰 가중치 (역거리)
+    - ip: 내적(코사인 유사도) → 음수는 0 으로
+    """
+    if metric == "ip":
+        return max(score, 0.0)
+    return 1.0 / (score + 1e-6)
+
+
+def classify_neighbors(neighbors, metric="l2"):
+    """
+    Faiss 이웃 꿈들의 대분류/소분류로 거리 가중 투표
+    - 대분류를 먼저 정하고, 소분류는 그 대분류에 속한 이웃들끼리만 투표
+    - confidence: 이긴 대분류의 가중치 비율 x 이긴 소분류의 가중치 비율 (0~1)
+    이웃이 없으면 None
+    """
+    main_votes = defaultdict(float)
+    sub_votes = defaultdict(lambda: defaultdict(float))
+    for item in neighbors:
+        main_cat = clean_label(item.get('대분류'))
+        if not main_cat:
+            continue
+        weight = neighbor_weight(item.get('score', 0.0), metric)
+        main_votes[main_cat] += weight
+        sub_votes[main_cat][clean_label(item.get('소분류'))] += weight
+
+    total = sum(main_votes.values())
+    if not main_votes or total <= 0:
+        return None
+
+    main_cat = max(main_votes, key=main_votes.get)
+    sub_cat = max(sub_votes[main_cat], key=sub_votes[main_cat].get)
+    main_share = main_votes[main_cat] / total
+    sub_share = sub_votes[main_cat][sub_cat] / main_votes[main_cat]
+    return {
+        '대분류': main_cat,
+        '소분류': sub_cat,
+        'confidence': main_share * sub_share,
+    }
+
+
+def format_classification(result):
+    """LLM 의 [분류시작] 섹션과 같은 형식의 문자열"""
+    return f"대분류: {result['대분류']}\n소분류: {result['소분류']}"
+
+
+def parse_classification(text):
+    """'대분류: X\n소분류: Y' 형식의 문자열을 (대분류, 소분류) 로"""
+    labels = {}
+    for line in text.splitlines():
+        if ':' in line:
+            key, value = line.split(':', 1)
+            labels[key.strip().strip('*-').strip()] = clean_label(value)
+    return labels.get('대분류', ''), labels.get('소분류', '')
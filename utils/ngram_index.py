@@ -0,0 +1,157 @@
+import re
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text):
+    """소문자 + 한글/영문/숫자 토큰"""
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def ngrams(text, query=False):
+    """
+    형태소 분석기 없이 한국어를 검색하기 위한 글자 n-gram
+    - 토큰마다 2-gram, 3-gram (조사/어미가 붙어도 앞부분 n-gram 이 겹침)
+    - 문서 쪽은 토큰의 첫 글자도 색인 → 한 글자 명사에 조사가 붙은 경우(돈을, 뱀이)도 한 글자 질의(돈, 뱀)로 찾음
+    - 질의 쪽은 한 글자 토큰일 때만 그 글자를 사용 (긴 질의에 한 글자 n-gram 잡음이 섞이지 않도록)
+    """
+    grams = []
+    for token in tokenize(text):
+        if len(token) == 1 or not query:
+            grams.append(token[0])
+        for n in (2, 3):
+            grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+def find_highlights(text, query):
+    """text 안에서 질의 토큰이 나타나는 [시작, 끝) 위치 목록 (겹치면 합침)"""
+    lowered = (text or '').lower()
+    spans = []
+    for token in set(tokenize(query)):
+        start = lowered.find(token)
+        while start != -1:
+            spans.append([start, start + len(token)])
+            start = lowered.find(token, start + 1)
+
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class NgramIndex:
+    """
+    문서(필드별 텍스트)에 대한 글자 n-gram 역색인
+    - n-gram 마다 (문서 id 배열, BM25 가중치 배열)을 CSR 형태의 numpy 배열로 보관
+      → 질의 시에는 질의 n-gram 의 posting 을 이어 붙여 np.bincount 한 번으로 점수 합산
+    - 가중치는 필드별 BM25 점수에 필드 가중치를 곱해 만들 때 미리 계산
+    - save()/load() 로 .npz 파일 하나에 저장
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, vocab, offsets, doc_ids, weights, doc_count, version=''):
+        self.vocab = vocab
+        self.gram_rows = {gram: row for row, gram in enumerate(vocab)}
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.doc_count = doc_count
+        self.version = version
+
+    @classmethod
+    def build(cls, documents, field_weights, version=''):
+        """documents: [{필드명: 텍스트, ...}, ...] (리스트 순서가 문서 id)"""
+        doc_count = len(documents)
+        postings = defaultdict(lambda: defaultdict(float))
+
+        for field, field_weight in field_weights.items():
+            field_grams = [Counter(ngrams(document.get(field, ''))) for document in documents]
+            lengths = [sum(counts.values()) for counts in field_grams]
+            avg_length = (sum(lengths) / doc_count if doc_count else 0) or 1.0
+
+            doc_freq = Counter()
+            for counts in field_grams:
+                doc_freq.update(counts.keys())
+
+            idf = {
+                gram: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for gram, df in doc_freq.items()
+            }
+            for doc_id, counts in enumerate(field_grams):
+                norm = cls.K1 * (1 - cls.B + cls.B * lengths[doc_id] / avg_length)
+                for gram, tf in counts.items():
+                    postings[gram][doc_id] += field_weight * idf[gram] * tf * (cls.K1 + 1) / (tf + norm)
+
+        vocab = sorted(postings)
+        offsets = np.zeros(len(vocab) + 1, dtype='int64')
+        doc_ids, weights = [], []
+        for row, gram in enumerate(vocab):
+            docs = postings[gram]
+            doc_ids.extend(docs.keys())
+            weights.extend(docs.values())
+            offsets[row + 1] = len(doc_ids)
+        return cls(
+            vocab,
+            offsets,
+            np.array(doc_ids, dtype='int32'),
+            np.array(weights, dtype='float32'),
+            doc_count,
+            version,
+        )
+
+    def scores(self, query):
+        """문서 id 별 점수 배열 (0 이면 일치하지 않음), 질의 n-gram 이 하나도 없으면 None"""
+        rows = [self.gram_rows[gram] for gram in set(ngrams(query, query=True)) if gram in self.gram_rows]
+        if not rows:
+            return None
+
+        doc_ids = np.concatenate([self.doc_ids[self.offsets[row]:self.offsets[row + 1]] for row in rows])
+        weights = np.concatenate([self.weights[self.offsets[row]:self.offsets[row + 1]] for row in rows])
+        return np.bincount(doc_ids, weights=weights, minlength=self.doc_count)
+
+    @staticmethod
+    def top(scores, limit):
+        """점수 배열에서 점수 순 상위 limit 개 (문서 id, 점수) 목록"""
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(scores[matched], -limit)[-limit:]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in matched]
+
+    def search(self, query, limit=100):
+        """점수 순 (문서 id, 점수) 목록, 질의 n-gram 이 하나도 없으면 빈 목록"""
+        scores = self.scores(query)
+        return [] if scores is None else self.top(scores, limit)
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            vocab=np.array(self.vocab),
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            weights=self.weights.astype('float16'),  # 순위용 가중치라 float16 정밀도로 충분
+            meta=np.array([str(self.doc_count), self.version]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            doc_count, version = data['meta']
+            return cls(
+                data['vocab'].tolist(),
+                data['offsets'],
+                data['doc_ids'],
+                data['weights'].astype('float32'),
+                int(doc_count),
+                str(version),
+            )
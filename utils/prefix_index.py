@@ -0,0 +1,52 @@
+import heapq
+from bisect import bisect_left
+
+
+def normalize(text):
+    """소문자 + 연속 공백을 하나로"""
+    return " ".join((text or '').lower().split())
+
+
+class PrefixIndex:
+    """
+    자동완성용 접두어 색인 (정렬된 배열 + bisect)
+    - 접두어로 시작하는 용어들은 정렬된 키 배열에서 연속 구간 → bisect 두 번으로 찾음
+    - 구간이 넓은 짧은 접두어(PRECOMPUTED_LENGTH 글자 이하)는 빈도 상위 목록을 미리 계산
+    """
+
+    PRECOMPUTED_LENGTH = 2
+    MAX_LIMIT = 20
+
+    def __init__(self, counts):
+        """counts: {용어: 빈도}"""
+        rows = sorted((normalize(term), -count, term) for term, count in counts.items() if normalize(term))
+        self.keys = [key for key, _, _ in rows]
+        self.terms = [term for _, _, term in rows]
+        self.counts = [-count for _, count, _ in rows]
+
+        by_prefix = {}
+        for row, key in enumerate(self.keys):
+            for n in range(1, min(len(key), self.PRECOMPUTED_LENGTH) + 1):
+                by_prefix.setdefault(key[:n], []).append(row)
+        self.top = {
+            prefix: heapq.nlargest(self.MAX_LIMIT, rows, key=self.counts.__getitem__)
+            for prefix, rows in by_prefix.items()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def complete(self, prefix, limit=10):
+        """prefix 로 시작하는 용어를 빈도 순으로 [(용어, 빈도), ...]"""
+        prefix = normalize(prefix)
+        limit = min(limit, self.MAX_LIMIT)
+        if not prefix:
+            return []
+
+        if len(prefix) <= self.PRECOMPUTED_LENGTH:
+            rows = self.top.get(prefix, [])[:limit]
+        else:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + '\U0010ffff', lo)
+            rows = heapq.nlargest(limit, range(lo, hi), key=self.counts.__getitem__)
+        return [(self.terms[row], self.counts[row]) for row in rows]
@@ -0,0 +1,71 @@
+_encodings = {}
+
+
+def get_encoding(model="gpt-4o"):
+    """
+    모델에 맞는 tiktoken 인코딩 (모델별로 한 번만 로드)
+    인코딩 파일을 받을 수 없는 환경이면 None → 글자 수로 토큰 수를 어림잡음
+    """
+    if model not in _encodings:
+        try:
+            import tiktoken  # import 가 무거우므로 처음 토큰을 셀 때 불러옴
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            print(f"⚠️ tiktoken 인코딩 로딩 실패 ({e}). 글자 수 기준으로 토큰 수를 추정합니다.")
+            _encodings[model] = None
+    return _encodings[model]
+
+
+def count_tokens(text, model="gpt-4o"):
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text)  # 한국어는 대략 글자당 1토큰 이하이므로 넉넉한 추정치
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text, max_tokens, model="gpt-4o"):
+    """max_tokens 를 넘는 텍스트는 잘라서 말줄임표를 붙임"""
+    encoding = get_encoding(model)
+    tokens = list(text) if encoding is None else encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    kept = tokens[:max(max_tokens - 1, 0)]
+    return ("".join(kept) if encoding is None else encoding.decode(kept)) + "…"
+
+
+def candidate_categories(retrieved_items):
+    """검색된 이웃 꿈들이 속한 대분류/소분류만 분류 후보로 사용 (등장 순서 유지)"""
+    main_cats, sub_cats = [], []
+    for item in retrieved_items:
+        main_cat = item.get('대분류', '').strip().strip('"')
+        sub_cat = item.get('소분류', '').strip().strip('"')
+        if main_cat and main_cat not in main_cats:
+            main_cats.append(main_cat)
+        if sub_cat and sub_cat not in sub_cats:
+            sub_cats.append(sub_cat)
+    return {"대분류": main_cats, "소분류": sub_cats}
+
+
+def fit_references(retrieved_items, budget, per_item_max=400, model="gpt-4o"):
+    """
+    참고 해몽들을 토큰 예산 안에 맞춤
+    - 검색 순위(= 점수 순)대로 넣고, 각 해몽은 per_item_max 토큰으로 자름
+    - 예산을 넘기면 순위가 낮은 것부터 버림
+    (참고 문자열 리스트, 사용한 토큰 수)를 반환
+    """
+    references = []
+    used = 0
+    for item in retrieved_items:
+        clean_dream = item.get('꿈', '').strip()
+        clean_interp = truncate_tokens(item.get('해몽', '').strip(), per_item_max, model)
+        text = f"{len(references) + 1}. 꿈: {clean_dream}\n   해몽: {clean_interp}"
+
+        tokens = count_tokens(text + "\n\n", model)
+        if used + tokens > budget:
+            break
+        references.append(text)
+        used += tokens
+    return references, used
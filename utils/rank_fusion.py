@@ -0,0 +1,20 @@
+from collections import defaultdict
+
+
+def reciprocal_rank_fusion(rankings, weights=None, k=60):
+    """
+    여러 검색 결과 순위를 Reciprocal Rank Fusion 으로 합침
+    - rankings: {이름: [문서 id, ...] (좋은 순)}
+    - weights: {이름: 가중치} (없으면 1.0)
+    - 문서 점수 = Σ 가중치 / (k + 순위), 순위는 1부터
+    점수 순 (문서 id, 점수) 목록을 반환 (점수가 같으면 먼저 나온 순위 목록의 순서)
+    """
+    weights = weights or {}
+    scores = defaultdict(float)
+    for name, doc_ids in rankings.items():
+        weight = weights.get(name, 1.0)
+        if not weight:
+            continue
+        for rank, doc_id in enumerate(doc_ids, 1):
+            scores[doc_id] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,101 @@
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    질의 임베딩이 충분히 가까우면 이전 해몽 결과를 재사용하는 캐시
+    - 벡터는 L2 정규화 후 내적(IndexFlatIP) -> 점수가 곧 코사인 유사도
+    - metric='l2'이면 threshold를 (정규화 벡터 간) 최대 L2 거리로 보고 코사인 값으로 환산
+    - TTL이 지나거나 capacity를 넘으면 오래된 항목부터 제거
+    """
+
+    def __init__(self, dim=None, threshold=0.95, metric='cosine', ttl=60 * 60 * 24, capacity=5_000):
+        if metric not in ('cosine', 'l2'):
+            raise ValueError(f"지원하지 않는 metric 입니다: {metric}")
+        self.dim = dim
+        # 단위 벡터에서 ||a - b||^2 = 2 - 2cos(a, b)
+        self.threshold = threshold if metric == 'cosine' else 1 - (threshold ** 2) / 2
+        self.ttl = ttl
+        self.capacity = capacity
+
+        self._index = None  # 첫 저장 때 생성 (faiss 는 import 가 무거우므로 그때 불러옴)
+        self._entries = OrderedDict()  # id -> (저장 시각, 결과 dict), 저장 순서 유지
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype='float32').reshape(1, -1).copy()
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def _ensure_index(self, dim):
+        """Faiss 인덱스가 없으면 만듦 (faiss 는 여기서 처음 import)"""
+        if self._index is None:
+            import faiss
+            self.dim = dim
+            self._index = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+        return self._index
+
+    def _remove(self, ids):
+        if not ids or self._index is None:
+            return
+        self._index.remove_ids(np.array(ids, dtype='int64'))
+        for _id in ids:
+            self._entries.pop(_id, None)
+        self.stats['evictions'] += len(ids)
+
+    def _expire(self):
+        """TTL 지난 항목 제거 (저장 순서대로라 앞에서부터만 보면 됨)"""
+        now = time.time()
+        expired = []
+        for _id, (created_at, _) in self._entries.items():
+            if now - created_at < self.ttl:
+                break
+            expired.append(_id)
+        self._remove(expired)
+
+    def lookup(self, vector):
+        """임계값 이상으로 가까운 결과가 있으면 (결과 dict, 유사도), 없으면 (None, 유사도)"""
+        query = self._normalize(vector)
+        with self._lock:
+            self._expire()
+            if self._index is None or self._index.ntotal == 0:
+                self.stats['misses'] += 1
+                return None, 0.0
+
+            scores, ids = self._index.search(query, 1)
+            score, _id = float(scores[0][0]), int(ids[0][0])
+            if _id != -1 and score >= self.threshold:
+                self.stats['hits'] += 1
+                return dict(self._entries[_id][1]), score
+
+        self.stats['misses'] += 1
+        return None, score
+
+    def store(self, vector, result):
+        """질의 벡터와 파싱된 결과를 저장"""
+        query = self._normalize(vector)
+        with self._lock:
+            self._expire()
+            overflow = len(self._entries) + 1 - self.capacity
+            if overflow > 0:
+                self._remove(list(self._entries)[:overflow])
+
+            index = self._ensure_index(self.dim or query.shape[1])
+
+            _id = self._next_id
+            self._next_id += 1
+            index.add_with_ids(query, np.array([_id], dtype='int64'))
+            self._entries[_id] = (time.time(), dict(result))
+
+    def info(self):
+        return {**self.stats, 'entries': len(self._entries), 'threshold': self.threshold}
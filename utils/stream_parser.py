@@ -0,0 +1,61 @@
+class SectionStreamParser:
+    """
+    LLM 스트리밍 토큰을 구분자([해몽시작] 등) 기준으로 섹션별로 나눠주는 파서
+    - 구분자가 토큰 경계에서 잘려 들어와도 인식할 수 있도록,
+      구분자의 앞부분일 수 있는 꼬리 문자열은 다음 청크가 올 때까지 보류
+    - 첫 구분자 이전의 텍스트는 버림
+    """
+
+    def __init__(self, markers):
+        # markers: {"[해몽시작]": "interpretation", ...}
+        self.markers = markers
+        self.section = None
+        self.text = ""  # 지금까지 들어온 전체 원본 텍스트
+        self._buffer = ""
+
+    def _held_back(self, text):
+        """text 끝부분 중 구분자의 접두사가 될 수 있는 가장 긴 길이"""
+        longest = 0
+        for marker in self.markers:
+            for size in range(min(len(marker) - 1, len(text)), 0, -1):
+                if marker.startswith(text[-size:]):
+                    longest = max(longest, size)
+                    break
+        return longest
+
+    def feed(self, chunk):
+        """청크를 넣으면 (섹션명, 추가된 텍스트) 이벤트 리스트를 반환"""
+        self.text += chunk
+        self._buffer += chunk
+        events = []
+
+        while True:
+            # 버퍼에서 가장 먼저 나오는 구분자 찾기
+            found = None
+            for marker in self.markers:
+                pos = self._buffer.find(marker)
+                if pos != -1 and (found is None or pos < found[0]):
+                    found = (pos, marker)
+            if found is None:
+                break
+
+            pos, marker = found
+            if pos and self.section is not None:
+                events.append((self.section, self._buffer[:pos]))
+            self.section = self.markers[marker]
+            events.append((self.section, ""))  # 새 섹션 시작 알림
+            self._buffer = self._buffer[pos + len(marker):]
+
+        hold = self._held_back(self._buffer)
+        ready, self._buffer = self._buffer[:len(self._buffer) - hold], self._buffer[len(self._buffer) - hold:]
+        if ready and self.section is not None:
+            events.append((self.section, ready))
+        return events
+
+    def close(self):
+        """스트림 종료 시 보류 중인 텍스트를 내보냄"""
+        events = []
+        if self._buffer and self.section is not None:
+            events.append((self.section, self._buffer))
+        self._buffer = ""
+        return events